@@ -0,0 +1,35 @@
+"""crear tabla ca_mantenimiento_checkpoint
+
+Revision ID: 5e9c1a7b4d02
+Revises: d81b5f0e3a27
+Create Date: 2026-10-16 20:12:44.851306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9c1a7b4d02'
+down_revision: Union[str, Sequence[str], None] = 'd81b5f0e3a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ca_mantenimiento_checkpoint',
+    sa.Column('tarea', sa.String(length=50), nullable=False),
+    sa.Column('ultimo_id', sa.Integer(), nullable=False),
+    sa.Column('fecha_limite', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('procesados', sa.Integer(), nullable=False),
+    sa.Column('actualizado', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('tarea')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('ca_mantenimiento_checkpoint')
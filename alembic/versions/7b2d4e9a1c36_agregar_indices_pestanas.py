@@ -0,0 +1,42 @@
+"""agregar índices compuestos y parciales para las consultas de pestañas
+
+Revision ID: 7b2d4e9a1c36
+Revises: e3a91f4c7b28
+Create Date: 2026-10-16 16:02:47.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2d4e9a1c36'
+down_revision: Union[str, Sequence[str], None] = 'e3a91f4c7b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Debe coincidir con db_models.ESTADOS_ABIERTOS (el WHERE del índice parcial y el de la consulta)
+SOLO_ABIERTAS = sa.text("estado_ca_texto IN ('Publicada', 'Publicada - Segundo llamado')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Candidatas: filtro por estado abierto + ORDER BY puntuacion_final DESC, ca_id (keyset)
+    op.create_index('ix_ca_licitacion_abiertas_puntaje', 'ca_licitacion',
+                    [sa.text('puntuacion_final DESC'), 'ca_id'], unique=False,
+                    postgresql_where=SOLO_ABIERTAS)
+    # Rango de fechas para el barrido de listado
+    op.create_index('ix_ca_licitacion_abiertas_publicacion', 'ca_licitacion',
+                    ['fecha_publicacion'], unique=False, postgresql_where=SOLO_ABIERTAS)
+    # Seguimiento/Ofertadas (ORDER BY fecha_cierre, ca_id), cierre de vencidas y limpieza
+    op.create_index('ix_ca_licitacion_fecha_cierre', 'ca_licitacion',
+                    ['fecha_cierre', 'ca_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ca_licitacion_fecha_cierre', table_name='ca_licitacion')
+    op.drop_index('ix_ca_licitacion_abiertas_publicacion', table_name='ca_licitacion')
+    op.drop_index('ix_ca_licitacion_abiertas_puntaje', table_name='ca_licitacion')
@@ -0,0 +1,68 @@
+"""agregar estado_codigo (smallint) y reescribir índices parciales sobre él
+
+Revision ID: a4f8c2d6e913
+Revises: 7b2d4e9a1c36
+Create Date: 2026-10-16 17:40:12.604381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f8c2d6e913'
+down_revision: Union[str, Sequence[str], None] = '7b2d4e9a1c36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mismo orden que db_models._PALABRAS_ESTADO (EstadoCa)
+SQL_BACKFILL = """
+UPDATE ca_licitacion SET estado_codigo = CASE
+    WHEN estado_ca_texto IS NULL OR trim(estado_ca_texto) = '' THEN NULL
+    WHEN lower(estado_ca_texto) LIKE '%segundo%' THEN 2
+    WHEN lower(estado_ca_texto) LIKE '%publicada%' THEN 1
+    WHEN lower(estado_ca_texto) LIKE '%cerrada%' THEN 3
+    WHEN lower(estado_ca_texto) LIKE '%adjudicada%' THEN 4
+    WHEN lower(estado_ca_texto) LIKE '%desierta%' THEN 5
+    WHEN lower(estado_ca_texto) LIKE '%cancelada%' OR lower(estado_ca_texto) LIKE '%revocada%' THEN 6
+    ELSE 0
+END
+"""
+
+SOLO_ABIERTAS_TEXTO = sa.text("estado_ca_texto IN ('Publicada', 'Publicada - Segundo llamado')")
+SOLO_ABIERTAS_CODIGO = sa.text("estado_codigo IN (1, 2)")
+
+
+def _crear_indices_parciales(condicion) -> None:
+    op.create_index('ix_ca_licitacion_abiertas_puntaje', 'ca_licitacion',
+                    [sa.text('puntuacion_final DESC'), 'ca_id'], unique=False,
+                    postgresql_where=condicion)
+    op.create_index('ix_ca_licitacion_abiertas_publicacion', 'ca_licitacion',
+                    ['fecha_publicacion'], unique=False, postgresql_where=condicion)
+
+
+def _borrar_indices_parciales() -> None:
+    op.drop_index('ix_ca_licitacion_abiertas_publicacion', table_name='ca_licitacion')
+    op.drop_index('ix_ca_licitacion_abiertas_puntaje', table_name='ca_licitacion')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('ca_licitacion', sa.Column('estado_codigo', sa.SmallInteger(), nullable=True))
+    op.execute(SQL_BACKFILL)
+    op.create_index(op.f('ix_ca_licitacion_estado_codigo'), 'ca_licitacion', ['estado_codigo'], unique=False)
+    _borrar_indices_parciales()
+    _crear_indices_parciales(SOLO_ABIERTAS_CODIGO)
+    # La tabla de paso del COPY se recrea con la nueva columna 'estado_codigo' en la próxima carga
+    op.execute('DROP TABLE IF EXISTS ca_licitacion_staging')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _borrar_indices_parciales()
+    _crear_indices_parciales(SOLO_ABIERTAS_TEXTO)
+    op.drop_index(op.f('ix_ca_licitacion_estado_codigo'), table_name='ca_licitacion')
+    op.drop_column('ca_licitacion', 'estado_codigo')
+    op.execute('DROP TABLE IF EXISTS ca_licitacion_staging')
@@ -0,0 +1,31 @@
+"""agregar huellas de puntaje a licitaciones
+
+Revision ID: c5e05104ce24
+Revises: d25755bd55d3
+Create Date: 2026-10-16 11:02:47.915230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e05104ce24'
+down_revision: Union[str, Sequence[str], None] = 'd25755bd55d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Sin huellas, el primer recálculo puntúa todas las filas y las sella
+    op.add_column('ca_licitacion', sa.Column('huella_reglas', sa.String(length=32), nullable=True))
+    op.add_column('ca_licitacion', sa.Column('huella_entrada', sa.String(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('ca_licitacion', 'huella_entrada')
+    op.drop_column('ca_licitacion', 'huella_reglas')
@@ -0,0 +1,92 @@
+"""agregar columnas de texto normalizado a licitaciones
+
+Revision ID: d25755bd55d3
+Revises: dc789a2b107e
+Create Date: 2026-10-16 10:12:31.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.utils.normalizacion import normalizar_texto, normalizar_productos
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd25755bd55d3'
+down_revision: Union[str, Sequence[str], None] = 'dc789a2b107e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TAMANO_LOTE_RELLENO = 1000
+
+ca_licitacion = sa.table(
+    'ca_licitacion',
+    sa.column('ca_id', sa.Integer),
+    sa.column('nombre', sa.String),
+    sa.column('descripcion', sa.String),
+    sa.column('productos_solicitados', sa.JSON),
+    sa.column('nombre_norm', sa.Text),
+    sa.column('descripcion_norm', sa.Text),
+    sa.column('productos_norm', sa.Text),
+)
+
+
+def _rellenar_textos_normalizados(conexion) -> None:
+    """Calcula las columnas *_norm de las filas existentes, por lotes de ca_id ascendente."""
+    sentencia_update = (
+        sa.update(ca_licitacion)
+        .where(ca_licitacion.c.ca_id == sa.bindparam('b_ca_id'))
+        .values(
+            nombre_norm=sa.bindparam('b_nombre_norm'),
+            descripcion_norm=sa.bindparam('b_descripcion_norm'),
+            productos_norm=sa.bindparam('b_productos_norm'),
+        )
+    )
+    ultimo_id = 0
+    while True:
+        filas = conexion.execute(
+            sa.select(
+                ca_licitacion.c.ca_id,
+                ca_licitacion.c.nombre,
+                ca_licitacion.c.descripcion,
+                ca_licitacion.c.productos_solicitados,
+            )
+            .where(ca_licitacion.c.ca_id > ultimo_id)
+            .order_by(ca_licitacion.c.ca_id)
+            .limit(TAMANO_LOTE_RELLENO)
+        ).all()
+        if not filas:
+            break
+
+        conexion.execute(sentencia_update, [
+            {
+                'b_ca_id': fila.ca_id,
+                'b_nombre_norm': normalizar_texto(fila.nombre),
+                # Sin ficha (Fase 2 pendiente) queda NULL, igual que en la ingesta
+                'b_descripcion_norm': normalizar_texto(fila.descripcion) if fila.descripcion is not None else None,
+                'b_productos_norm': normalizar_productos(fila.productos_solicitados) if fila.productos_solicitados is not None else None,
+            }
+            for fila in filas
+        ])
+        ultimo_id = filas[-1].ca_id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('ca_licitacion', sa.Column('nombre_norm', sa.Text(), nullable=True))
+    op.add_column('ca_licitacion', sa.Column('descripcion_norm', sa.Text(), nullable=True))
+    op.add_column('ca_licitacion', sa.Column('productos_norm', sa.Text(), nullable=True))
+
+    _rellenar_textos_normalizados(op.get_bind())
+
+    # La tabla de paso del COPY se recrea con la nueva columna 'nombre_norm' en la próxima carga
+    op.execute('DROP TABLE IF EXISTS ca_licitacion_staging')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('ca_licitacion', 'productos_norm')
+    op.drop_column('ca_licitacion', 'descripcion_norm')
+    op.drop_column('ca_licitacion', 'nombre_norm')
@@ -0,0 +1,55 @@
+"""crear tabla de archivo ca_licitacion_historico
+
+Revision ID: d81b5f0e3a27
+Revises: a4f8c2d6e913
+Create Date: 2026-10-16 18:55:31.270948
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81b5f0e3a27'
+down_revision: Union[str, Sequence[str], None] = 'a4f8c2d6e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('ca_licitacion_historico',
+    sa.Column('ca_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('codigo_ca', sa.String(length=50), nullable=False),
+    sa.Column('nombre', sa.String(length=1000), nullable=True),
+    sa.Column('descripcion', sa.String(), nullable=True),
+    sa.Column('monto_clp', sa.Float(), nullable=True),
+    sa.Column('fecha_publicacion', sa.Date(), nullable=True),
+    sa.Column('fecha_cierre', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('fecha_cierre_segundo_llamado', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('plazo_entrega', sa.Integer(), nullable=True),
+    sa.Column('estado_ca_texto', sa.String(length=255), nullable=True),
+    sa.Column('estado_codigo', sa.SmallInteger(), nullable=True),
+    sa.Column('estado_convocatoria', sa.Integer(), nullable=True),
+    sa.Column('proveedores_cotizando', sa.Integer(), nullable=True),
+    sa.Column('direccion_entrega', sa.String(length=1000), nullable=True),
+    sa.Column('productos_solicitados', sa.JSON(), nullable=True),
+    sa.Column('puntuacion_final', sa.Integer(), nullable=False),
+    sa.Column('puntaje_detalle', sa.JSON(), nullable=True),
+    sa.Column('organismo_id', sa.Integer(), nullable=True),
+    sa.Column('fecha_archivado', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('ca_id')
+    )
+    op.create_index(op.f('ix_ca_licitacion_historico_codigo_ca'), 'ca_licitacion_historico', ['codigo_ca'], unique=False)
+    op.create_index(op.f('ix_ca_licitacion_historico_fecha_publicacion'), 'ca_licitacion_historico', ['fecha_publicacion'], unique=False)
+    op.create_index(op.f('ix_ca_licitacion_historico_organismo_id'), 'ca_licitacion_historico', ['organismo_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_ca_licitacion_historico_organismo_id'), table_name='ca_licitacion_historico')
+    op.drop_index(op.f('ix_ca_licitacion_historico_fecha_publicacion'), table_name='ca_licitacion_historico')
+    op.drop_index(op.f('ix_ca_licitacion_historico_codigo_ca'), table_name='ca_licitacion_historico')
+    op.drop_table('ca_licitacion_historico')
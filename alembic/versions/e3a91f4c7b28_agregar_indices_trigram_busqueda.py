@@ -0,0 +1,36 @@
+"""agregar índices trigram para la búsqueda de la GUI
+
+Revision ID: e3a91f4c7b28
+Revises: c5e05104ce24
+Create Date: 2026-10-16 14:21:09.530417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a91f4c7b28'
+down_revision: Union[str, Sequence[str], None] = 'c5e05104ce24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GIN + gin_trgm_ops permite usar índice en ILIKE '%texto%' (búsqueda de las pestañas)
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index('ix_ca_licitacion_nombre_trgm', 'ca_licitacion', ['nombre'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'nombre': 'gin_trgm_ops'})
+    op.create_index('ix_ca_licitacion_codigo_ca_trgm', 'ca_licitacion', ['codigo_ca'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'codigo_ca': 'gin_trgm_ops'})
+    op.create_index('ix_ca_organismo_nombre_trgm', 'ca_organismo', ['nombre'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'nombre': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ca_organismo_nombre_trgm', table_name='ca_organismo', postgresql_using='gin')
+    op.drop_index('ix_ca_licitacion_codigo_ca_trgm', table_name='ca_licitacion', postgresql_using='gin')
+    op.drop_index('ix_ca_licitacion_nombre_trgm', table_name='ca_licitacion', postgresql_using='gin')
@@ -22,6 +22,36 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     print(f"ADVERTENCIA CRÍTICA: DATABASE_URL no encontrada en {ruta_env}")
 
+# Pool de conexiones (PostgreSQL): la GUI ejecuta varias tareas de DbService a la vez (QThreadPool)
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '10'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+# Segundos que un hilo espera por una conexión libre antes de fallar
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+# Segundos de vida de una conexión: se renueva antes de que el servidor o un firewall la corte
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+# Ping antes de cada checkout (un viaje extra al servidor); DB_POOL_RECYCLE ya cubre el caso habitual
+_db_pool_pre_ping_env = os.getenv('DB_POOL_PRE_PING', 'False').lower()
+DB_POOL_PRE_PING = _db_pool_pre_ping_env == 'true'
+# statement_timeout por conexión en milisegundos (0 = sin límite)
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '0'))
+
+# Carga masiva (Upsert): filas por lote; cada lote se envía como executemany y se confirma aparte
+TAMANO_LOTE_UPSERT = int(os.getenv('TAMANO_LOTE_UPSERT', '1000'))
+# Motor de ingesta del listado: 'upsert' (executemany) o 'copy' (COPY a tabla staging, solo PostgreSQL)
+MOTOR_INGESTA = os.getenv('MOTOR_INGESTA', 'upsert').lower()
+# Recálculo de puntajes en streaming: filas por partición del cursor y por UPDATE masivo
+TAMANO_LOTE_RECALCULO = int(os.getenv('TAMANO_LOTE_RECALCULO', '2000'))
+# Procesos para puntuar en recálculos grandes (1 = en el mismo proceso)
+PROCESOS_PUNTAJE = int(os.getenv('PROCESOS_PUNTAJE', '1'))
+# Recálculos grandes con el motor por columnas (pandas) en vez de fila a fila
+_puntaje_vectorizado_env = os.getenv('PUNTAJE_VECTORIZADO', 'False').lower()
+PUNTAJE_VECTORIZADO = _puntaje_vectorizado_env == 'true'
+# Pestañas de la GUI: filas por página (paginación por keyset; se piden más al hacer scroll)
+TAMANO_PAGINA_TABLAS = int(os.getenv('TAMANO_PAGINA_TABLAS', '500'))
+# Mantenimiento (cerrar vencidas / archivar antiguas): filas por lote, cada lote en su propia transacción
+# (TAMANO_LOTE_ARCHIVO es el nombre anterior de la clave y se sigue leyendo si la nueva no está)
+TAMANO_LOTE_MANTENIMIENTO = int(os.getenv('TAMANO_LOTE_MANTENIMIENTO', os.getenv('TAMANO_LOTE_ARCHIVO', '1000')))
+
 # --- URLs Externas ---
 URL_BASE_WEB = "https://buscador.mercadopublico.cl"
 URL_BASE_API = "https://api.buscador.mercadopublico.cl"
@@ -31,6 +61,21 @@ TIMEOUT_PETICIONES = 30
 RETARDO_PAGINAS = 1    
 MAX_REINTENTOS = 3            
 
+# Concurrencia de Fase 2 (Detalle): hilos simultáneos y peticiones/segundo por host
+FASE2_MAX_HILOS = int(os.getenv('FASE2_MAX_HILOS', '8'))
+FASE2_PETICIONES_POR_SEGUNDO = float(os.getenv('FASE2_PETICIONES_POR_SEGUNDO', '10'))
+# Escritura de Fase 2 en BD: filas acumuladas por cada UPDATE masivo + commit
+FASE2_TAMANO_COMMIT = int(os.getenv('FASE2_TAMANO_COMMIT', '50'))
+
+# Listado paralelo (Fase 1): tras la página 1, el resto se descarga con N hilos
+_listado_paralelo_env = os.getenv('LISTADO_PARALELO', 'False').lower()
+LISTADO_PARALELO = _listado_paralelo_env == 'true'
+LISTADO_MAX_HILOS = int(os.getenv('LISTADO_MAX_HILOS', '4'))
+LISTADO_PETICIONES_POR_SEGUNDO = float(os.getenv('LISTADO_PETICIONES_POR_SEGUNDO', '4'))
+LISTADO_MAX_PAGINAS = 600  # Límite de seguridad
+# Pipeline en streaming: cada N páginas se guarda (upsert) y puntúa un micro-lote
+LISTADO_PAGINAS_POR_LOTE = int(os.getenv('LISTADO_PAGINAS_POR_LOTE', '10'))
+
 # Configuración Headless (Navegador oculto)
 _headless_env = os.getenv('HEADLESS', 'True').lower()
 MODO_HEADLESS = _headless_env == 'true'
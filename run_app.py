@@ -5,6 +5,7 @@ Punto de Entrada de la Aplicación (Modo Producción).
 import sys
 import os
 import subprocess
+import multiprocessing
 from pathlib import Path
 
 # run_app.py
@@ -127,4 +128,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos de puntuación en el ejecutable (PyInstaller)
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -10,11 +10,47 @@ import datetime
 import enum  
 from typing import Optional, List, Dict, Any
 
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship, validates
 from sqlalchemy import (
-    String, Integer, Float, Boolean, DateTime, JSON, ForeignKey, Enum, Text
+    func, String, Integer, SmallInteger, Float, Boolean, DateTime, JSON, ForeignKey, Enum, Text, Index
 )
 
+from src.utils.normalizacion import normalizar_texto, normalizar_productos
+
+class EstadoCa(enum.IntEnum):
+    """Código numérico del estado (columna 'estado_codigo'), derivado de estado_ca_texto al guardar."""
+    OTRO = 0
+    PUBLICADA = 1
+    SEGUNDO_LLAMADO = 2
+    CERRADA = 3
+    ADJUDICADA = 4
+    DESIERTA = 5
+    CANCELADA = 6
+
+# Estados en que una licitación sigue abierta a ofertas
+ESTADOS_ABIERTOS = (EstadoCa.PUBLICADA, EstadoCa.SEGUNDO_LLAMADO)
+
+# Se evalúan en orden: "Publicada - Segundo llamado" es SEGUNDO_LLAMADO
+_PALABRAS_ESTADO = (
+    ("segundo", EstadoCa.SEGUNDO_LLAMADO),
+    ("publicada", EstadoCa.PUBLICADA),
+    ("cerrada", EstadoCa.CERRADA),
+    ("adjudicada", EstadoCa.ADJUDICADA),
+    ("desierta", EstadoCa.DESIERTA),
+    ("cancelada", EstadoCa.CANCELADA),
+    ("revocada", EstadoCa.CANCELADA),
+)
+
+def codigo_estado(estado_texto: Optional[str]) -> Optional[int]:
+    """Traduce el texto de estado de la API a EstadoCa (None si no hay estado)."""
+    texto = normalizar_texto(estado_texto)
+    if not texto:
+        return None
+    for palabra, codigo in _PALABRAS_ESTADO:
+        if palabra in texto:
+            return int(codigo)
+    return int(EstadoCa.OTRO)
+
 class Base(DeclarativeBase):
     """Clase base para todos los modelos, define el mapeo de tipos JSON."""
     type_annotation_map = {
@@ -38,6 +74,10 @@ class CaSector(Base):
 class CaOrganismo(Base):
     """Representa una entidad pública que publica licitaciones."""
     __tablename__ = "ca_organismo"
+    # Búsqueda ILIKE '%texto%' de la GUI (pg_trgm)
+    __table_args__ = (
+        Index("ix_ca_organismo_nombre_trgm", "nombre", postgresql_using="gin", postgresql_ops={"nombre": "gin_trgm_ops"}),
+    )
     
     organismo_id: Mapped[int] = mapped_column(Integer, primary_key=True)
     nombre: Mapped[str] = mapped_column(String(1000), unique=True, index=True)
@@ -56,6 +96,11 @@ class CaLicitacion(Base):
     Contiene datos extraídos (Fase 1 y Fase 2) y datos calculados (Puntajes).
     """
     __tablename__ = "ca_licitacion"
+    # Búsqueda ILIKE '%texto%' de la GUI (pg_trgm)
+    __table_args__ = (
+        Index("ix_ca_licitacion_nombre_trgm", "nombre", postgresql_using="gin", postgresql_ops={"nombre": "gin_trgm_ops"}),
+        Index("ix_ca_licitacion_codigo_ca_trgm", "codigo_ca", postgresql_using="gin", postgresql_ops={"codigo_ca": "gin_trgm_ops"}),
+    )
     
     ca_id: Mapped[int] = mapped_column(Integer, primary_key=True)
     codigo_ca: Mapped[str] = mapped_column(String(50), unique=True, index=True)
@@ -73,6 +118,7 @@ class CaLicitacion(Base):
     
     # Estados
     estado_ca_texto: Mapped[Optional[str]] = mapped_column(String(255))
+    estado_codigo: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True, index=True)
     estado_convocatoria: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     proveedores_cotizando: Mapped[Optional[int]] = mapped_column(Integer)
     
@@ -80,9 +126,18 @@ class CaLicitacion(Base):
     direccion_entrega: Mapped[Optional[str]] = mapped_column(String(1000))
     productos_solicitados: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(JSON, nullable=True)
     
+    # Textos normalizados (ver src.utils.normalizacion): se calculan una vez al guardar
+    # y el motor de puntajes los lee directamente en cada recálculo.
+    nombre_norm: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    descripcion_norm: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    productos_norm: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
     # Motor de Puntuación
     puntuacion_final: Mapped[int] = mapped_column(Integer, default=0, index=True)
     puntaje_detalle: Mapped[Optional[List[str]]] = mapped_column(JSON, nullable=True)
+    # Huellas con que se calculó el puntaje: si ambas siguen vigentes, el recálculo omite la fila
+    huella_reglas: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    huella_entrada: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
     
     # Claves Foráneas y Relaciones
     organismo_id: Mapped[Optional[int]] = mapped_column(ForeignKey("ca_organismo.organismo_id"))
@@ -91,6 +146,74 @@ class CaLicitacion(Base):
     # Relación 1 a 1 con Seguimiento 
     seguimiento: Mapped["CaSeguimiento"] = relationship(back_populates="licitacion", cascade="all, delete-orphan", lazy="joined")
 
+    @validates("nombre", "descripcion", "productos_solicitados")
+    def _sincronizar_texto_normalizado(self, campo: str, valor: Any) -> Any:
+        """Mantiene las columnas *_norm al día cuando la fila se escribe vía ORM."""
+        if campo == "nombre":
+            self.nombre_norm = normalizar_texto(valor)
+        elif campo == "descripcion":
+            self.descripcion_norm = normalizar_texto(valor)
+        else:
+            self.productos_norm = normalizar_productos(valor)
+        return valor
+
+    @validates("estado_ca_texto")
+    def _sincronizar_estado_codigo(self, campo: str, valor: Any) -> Any:
+        """Mantiene estado_codigo al día cuando el estado se escribe vía ORM."""
+        self.estado_codigo = codigo_estado(valor)
+        return valor
+
+# Índices de las consultas de pestañas y mantenimiento.
+# Los parciales solo cubren licitaciones abiertas (Candidatas y barrido de listado).
+Index(
+    "ix_ca_licitacion_abiertas_puntaje",
+    CaLicitacion.puntuacion_final.desc(), CaLicitacion.ca_id,
+    postgresql_where=CaLicitacion.estado_codigo.in_(ESTADOS_ABIERTOS),
+    sqlite_where=CaLicitacion.estado_codigo.in_(ESTADOS_ABIERTOS),
+)
+Index(
+    "ix_ca_licitacion_abiertas_publicacion",
+    CaLicitacion.fecha_publicacion,
+    postgresql_where=CaLicitacion.estado_codigo.in_(ESTADOS_ABIERTOS),
+    sqlite_where=CaLicitacion.estado_codigo.in_(ESTADOS_ABIERTOS),
+)
+# Seguimiento/Ofertadas (orden por cierre) y limpieza por fecha de cierre
+Index("ix_ca_licitacion_fecha_cierre", CaLicitacion.fecha_cierre, CaLicitacion.ca_id)
+
+class CaLicitacionHistorico(Base):
+    """
+    Archivo (frío) de licitaciones retiradas de ca_licitacion por la limpieza.
+    Conserva los datos de negocio para análisis; la tabla principal queda solo
+    con el conjunto activo que consultan las pestañas.
+    """
+    __tablename__ = "ca_licitacion_historico"
+
+    ca_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    codigo_ca: Mapped[str] = mapped_column(String(50), index=True)
+    nombre: Mapped[Optional[str]] = mapped_column(String(1000))
+    descripcion: Mapped[Optional[str]] = mapped_column(String)
+    monto_clp: Mapped[Optional[float]] = mapped_column(Float)
+    fecha_publicacion: Mapped[Optional[datetime.date]] = mapped_column(index=True)
+    fecha_cierre: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(timezone=True))
+    fecha_cierre_segundo_llamado: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    plazo_entrega: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    estado_ca_texto: Mapped[Optional[str]] = mapped_column(String(255))
+    estado_codigo: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    estado_convocatoria: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    proveedores_cotizando: Mapped[Optional[int]] = mapped_column(Integer)
+    direccion_entrega: Mapped[Optional[str]] = mapped_column(String(1000))
+    productos_solicitados: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(JSON, nullable=True)
+    puntuacion_final: Mapped[int] = mapped_column(Integer, default=0)
+    puntaje_detalle: Mapped[Optional[List[str]]] = mapped_column(JSON, nullable=True)
+    # Sin FK: el archivo no debe impedir cambios en los organismos
+    organismo_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, index=True)
+    fecha_archivado: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+# Columnas que la limpieza copia de ca_licitacion al archivo (INSERT ... SELECT)
+COLUMNAS_HISTORICO = tuple(
+    c.name for c in CaLicitacionHistorico.__table__.columns if c.name != "fecha_archivado"
+)
+
 class CaSeguimiento(Base):
     """
     Tabla de Estado del Usuario. Separa la lógica de negocio (Favoritos/Ofertadas)
@@ -145,4 +268,20 @@ class CaOrganismoRegla(Base):
     tipo: Mapped[TipoReglaOrganismo] = mapped_column(Enum(TipoReglaOrganismo, name='tipo_regla_organismo_enum', native_enum=False), nullable=False, index=True)
     puntos: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     
-    organismo: Mapped["CaOrganismo"] = relationship(lazy="joined")
\ No newline at end of file
+    organismo: Mapped["CaOrganismo"] = relationship(lazy="joined")
+
+# --- Tablas de Mantenimiento ---
+
+class CaMantenimientoCheckpoint(Base):
+    """
+    Avance de una tarea de mantenimiento por lotes (ver ServicioMantenimiento).
+    Se escribe en la misma transacción que cada lote: si la aplicación se cierra a
+    mitad de camino, la próxima ejecución retoma desde 'ultimo_id' con la misma fecha límite.
+    """
+    __tablename__ = "ca_mantenimiento_checkpoint"
+
+    tarea: Mapped[str] = mapped_column(String(50), primary_key=True)
+    ultimo_id: Mapped[int] = mapped_column(Integer, default=0)
+    fecha_limite: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True))
+    procesados: Mapped[int] = mapped_column(Integer, default=0)
+    actualizado: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
\ No newline at end of file
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+Proyecciones de lectura (DTO) para las vistas de listado.
+
+Las pestañas de la GUI solo muestran un puñado de columnas; estas clases
+reciben únicamente esos valores, sin hidratar entidades ORM ni cargar
+campos pesados (descripción, productos solicitados).
+"""
+
+import datetime
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass(slots=True)
+class LicitacionResumen:
+    """Fila de las pestañas Candidatas / Seguimiento / Ofertadas."""
+    ca_id: int
+    codigo_ca: str
+    nombre: Optional[str]
+    puntuacion_final: int
+    puntaje_detalle: Optional[List[str]]
+    estado_ca_texto: Optional[str]
+    estado_convocatoria: Optional[int]
+    fecha_publicacion: Optional[datetime.date]
+    fecha_cierre: Optional[datetime.datetime]
+    fecha_cierre_segundo_llamado: Optional[datetime.datetime]
+    monto_clp: Optional[float]
+    organismo_nombre: Optional[str]
+    notas: Optional[str]
@@ -6,26 +6,92 @@ Este módulo actúa como la única puerta de enlace para todas las operaciones
 de persistencia de datos, encapsulando la lógica de SQLAlchemy.
 """
 
-from typing import List, Dict, Tuple, Optional, Union, Set
+import csv
+import io
+from typing import Callable, Iterable, Iterator, List, Dict, Tuple, Optional, Union, Set
 from datetime import datetime, timedelta
 from sqlalchemy.orm import sessionmaker, Session, joinedload
-from sqlalchemy import select, delete, or_, update, func, bindparam
+from sqlalchemy import select, delete, exists, or_, and_, update, func, bindparam, literal_column, text, case
 from sqlalchemy.dialects.postgresql import insert
 
 from .db_models import (
     CaLicitacion,
+    CaLicitacionHistorico,
+    CaMantenimientoCheckpoint,
     CaSeguimiento,
     CaOrganismo,
     CaSector,
     CaPalabraClave,
     CaOrganismoRegla,
-    TipoReglaOrganismo
+    TipoReglaOrganismo,
+    EstadoCa,
+    ESTADOS_ABIERTOS,
+    COLUMNAS_HISTORICO,
+    codigo_estado
 )
+from .db_proyecciones import LicitacionResumen
 from src.utils.logger import configurar_logger
+from src.utils.normalizacion import normalizar_texto, normalizar_productos
+from config.config import TAMANO_LOTE_UPSERT, FASE2_TAMANO_COMMIT, TAMANO_LOTE_RECALCULO, TAMANO_LOTE_MANTENIMIENTO
 
 
 logger = configurar_logger(__name__)
 
+# --- Ingesta vía COPY (PostgreSQL) ---
+# Tabla de paso UNLOGGED: no escribe WAL y se vacía (TRUNCATE) en cada carga.
+TABLA_STAGING = "ca_licitacion_staging"
+COLUMNAS_STAGING = (
+    "orden", "codigo_ca", "nombre", "nombre_norm", "monto_clp", "fecha_publicacion", "fecha_cierre",
+    "proveedores_cotizando", "estado_ca_texto", "estado_codigo", "estado_convocatoria", "organismo_nombre",
+)
+
+SQL_CREAR_STAGING = f"""
+CREATE UNLOGGED TABLE IF NOT EXISTS {TABLA_STAGING} (
+    orden integer NOT NULL,
+    codigo_ca varchar(50) NOT NULL,
+    nombre varchar(1000),
+    nombre_norm text,
+    monto_clp double precision,
+    fecha_publicacion date,
+    fecha_cierre timestamp with time zone,
+    proveedores_cotizando integer,
+    estado_ca_texto varchar(255),
+    estado_codigo smallint,
+    estado_convocatoria integer,
+    organismo_nombre varchar(1000) NOT NULL
+)
+"""
+
+SQL_CREAR_ORGANISMOS_STAGING = f"""
+INSERT INTO ca_organismo (nombre, sector_id, es_nuevo)
+SELECT DISTINCT s.organismo_nombre, :sector_id, true
+FROM {TABLA_STAGING} s
+WHERE NOT EXISTS (SELECT 1 FROM ca_organismo o WHERE o.nombre = s.organismo_nombre)
+ON CONFLICT (nombre) DO NOTHING
+"""
+
+# DISTINCT ON conserva la primera aparición de cada código (igual que el Upsert por lotes)
+SQL_FUSIONAR_STAGING = f"""
+INSERT INTO ca_licitacion (
+    codigo_ca, nombre, nombre_norm, monto_clp, fecha_publicacion, fecha_cierre, proveedores_cotizando,
+    estado_ca_texto, estado_codigo, estado_convocatoria, organismo_id, puntuacion_final
+)
+SELECT DISTINCT ON (s.codigo_ca)
+    s.codigo_ca, s.nombre, s.nombre_norm, s.monto_clp, s.fecha_publicacion, s.fecha_cierre, s.proveedores_cotizando,
+    s.estado_ca_texto, s.estado_codigo, s.estado_convocatoria, o.organismo_id, 0
+FROM {TABLA_STAGING} s
+LEFT JOIN ca_organismo o ON o.nombre = s.organismo_nombre
+ORDER BY s.codigo_ca, s.orden
+ON CONFLICT (codigo_ca) DO UPDATE SET
+    proveedores_cotizando = EXCLUDED.proveedores_cotizando,
+    estado_ca_texto = EXCLUDED.estado_ca_texto,
+    estado_codigo = EXCLUDED.estado_codigo,
+    fecha_cierre = EXCLUDED.fecha_cierre,
+    estado_convocatoria = EXCLUDED.estado_convocatoria,
+    monto_clp = EXCLUDED.monto_clp
+RETURNING (xmax = 0)
+"""
+
 class DbService:
     """
     Clase responsable de todas las transacciones con la base de datos.
@@ -34,10 +100,60 @@ class DbService:
     
     def __init__(self, session_factory: sessionmaker[Session]):
         self.session_factory = session_factory
+        self._suscriptores_cambios: List[Callable[[List[int]], None]] = []
         logger.info("DbService inicializado correctamente.")
 
+    # --- FEED DE CAMBIOS ---
+
+    def suscribir_cambios(self, callback: Callable[[List[int]], None]) -> Callable[[], None]:
+        """
+        Registra un callback que recibe los ca_id modificados por acciones de usuario
+        (seguimiento, ofertada, ocultar, notas), justo después del commit.
+        El callback corre en el hilo que hizo el cambio. Retorna la función para desuscribirse.
+        """
+        self._suscriptores_cambios.append(callback)
+
+        def desuscribir():
+            if callback in self._suscriptores_cambios:
+                self._suscriptores_cambios.remove(callback)
+        return desuscribir
+
+    def publicar_cambios(self, ca_ids: Iterable[int]):
+        """Publica en el feed ca_id acumulados por procesos en lote (ver parámetro 'cambios')."""
+        self._notificar_cambios(sorted(set(ca_ids)))
+
+    def _notificar_cambios(self, ca_ids: Iterable[int]):
+        ca_ids = list(ca_ids)
+        if not ca_ids:
+            return
+        for callback in list(self._suscriptores_cambios):
+            try:
+                callback(ca_ids)
+            except Exception as e:
+                logger.error(f"Error notificando cambios {ca_ids}: {e}")
+
     # --- MÉTODOS INTERNOS / AUXILIARES ---
 
+    def _condicion_estado_abierto(self):
+        """
+        estado_codigo IN (estados abiertos), con los valores escritos en el SQL: así el planificador
+        puede elegir los índices parciales sobre licitaciones abiertas también con sentencias preparadas.
+        """
+        return CaLicitacion.estado_codigo.in_(bindparam("estados_abiertos", [int(e) for e in ESTADOS_ABIERTOS], expanding=True, literal_execute=True))
+
+    def _sin_seguimiento(self, *condiciones):
+        """Anti-join (NOT EXISTS) contra ca_seguimiento: la licitación no tiene una marca que cumpla 'condiciones'."""
+        return ~exists().where(CaSeguimiento.ca_id == CaLicitacion.ca_id, or_(*condiciones)).correlate_except(CaSeguimiento)
+
+    def _obtener_sector_por_defecto(self, session: Session) -> CaSector:
+        """Obtiene o crea un sector por defecto ("General") para los organismos nuevos."""
+        sector_default = session.scalars(select(CaSector).limit(1)).first()
+        if not sector_default:
+            sector_default = CaSector(nombre="General")
+            session.add(sector_default)
+            session.flush()
+        return sector_default
+
     def _preparar_mapa_organismos(self, session: Session, nombres_organismos: Set[str]) -> Dict[str, int]:
         """
         Verifica la existencia de organismos en la BD y crea los faltantes en lote.
@@ -55,12 +171,7 @@ class DbService:
         # 2. Identificar y crear faltantes
         faltantes = nombres_norm - set(existentes.keys())
         if faltantes:
-            # Obtener o crear un sector por defecto ("General")
-            sector_default = session.scalars(select(CaSector).limit(1)).first()
-            if not sector_default:
-                sector_default = CaSector(nombre="General")
-                session.add(sector_default)
-                session.flush()
+            sector_default = self._obtener_sector_por_defecto(session)
             
             # Inserción masiva de nuevos organismos
             nuevos_orgs = [{"nombre": nombre, "sector_id": sector_default.sector_id, "es_nuevo": True} for nombre in faltantes]
@@ -97,15 +208,41 @@ class DbService:
 
     # --- INGESTIÓN DE DATOS (ETL) ---
 
-    def insertar_o_actualizar_masivo(self, compras: List[Dict]):
+    def _sentencia_upsert_licitaciones(self):
+        """
+        Sentencia genérica de Upsert (PostgreSQL) para usar con executemany.
+        Si el código existe, actualiza SOLO los campos dinámicos.
+        RETURNING (xmax = 0) indica si la fila fue insertada (True) o actualizada (False).
+        """
+        stmt = insert(CaLicitacion)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['codigo_ca'],
+            set_={
+                "proveedores_cotizando": stmt.excluded.proveedores_cotizando,
+                "estado_ca_texto": stmt.excluded.estado_ca_texto, 
+                "estado_codigo": stmt.excluded.estado_codigo,
+                "fecha_cierre": stmt.excluded.fecha_cierre,       
+                "estado_convocatoria": stmt.excluded.estado_convocatoria,
+                "monto_clp": stmt.excluded.monto_clp
+            }
+        )
+        return stmt.returning(literal_column("(xmax = 0)").label("insertado"))
+
+    def insertar_o_actualizar_masivo(self, compras: List[Dict], tamano_lote: Optional[int] = None) -> Dict[str, int]:
         """
         Realiza un 'Bulk Upsert' (Inserción o Actualización Masiva) de licitaciones.
         Utiliza características específicas de PostgreSQL para alto rendimiento.
+        
+        Los registros se envían en lotes de 'tamano_lote' filas (por defecto TAMANO_LOTE_UPSERT)
+        reutilizando una única sentencia parametrizada (executemany), y cada lote se confirma
+        por separado. Retorna los totales {'insertados': n, 'actualizados': m}.
         """
+        totales = {"insertados": 0, "actualizados": 0}
         if not compras: 
-            return
+            return totales
         
-        logger.info(f"Iniciando carga masiva (Upsert) de {len(compras)} registros...")
+        tamano = max(int(tamano_lote or TAMANO_LOTE_UPSERT), 1)
+        logger.info(f"Iniciando carga masiva (Upsert) de {len(compras)} registros en lotes de {tamano}...")
         
         with self.session_factory() as session:
             try:
@@ -137,91 +274,218 @@ class DbService:
                         "fecha_cierre": item.get("fecha_cierre"),
                         "proveedores_cotizando": item.get("cantidad_provedores_cotizando"),
                         "estado_ca_texto": item.get("estado"),
+                        "estado_codigo": codigo_estado(item.get("estado")),
                         "estado_convocatoria": item.get("estado_convocatoria"),
                         "organismo_id": mapa_orgs.get(org_nombre),
+                        "nombre_norm": normalizar_texto(item.get("nombre")),
                     }
                     data_to_upsert.append(record)
                 
-                if data_to_upsert:
-                    # 3. Ejecutar Upsert (PostgreSQL)
-                    # Si el código existe, actualiza SOLO los campos dinámicos
-                    stmt = insert(CaLicitacion).values(data_to_upsert)
-                    stmt = stmt.on_conflict_do_update(
-                        index_elements=['codigo_ca'],
-                        set_={
-                            "proveedores_cotizando": stmt.excluded.proveedores_cotizando,
-                            "estado_ca_texto": stmt.excluded.estado_ca_texto, 
-                            "fecha_cierre": stmt.excluded.fecha_cierre,       
-                            "estado_convocatoria": stmt.excluded.estado_convocatoria,
-                            "monto_clp": stmt.excluded.monto_clp
-                        }
-                    )
-                    session.execute(stmt)
+                # 3. Ejecutar Upsert por lotes (executemany)
+                stmt = self._sentencia_upsert_licitaciones()
+                for numero, inicio in enumerate(range(0, len(data_to_upsert), tamano), start=1):
+                    lote = data_to_upsert[inicio:inicio + tamano]
+                    marcas = session.connection().execute(stmt, lote).scalars().all()
                     session.commit()
-                    logger.info("Carga Masiva completada exitosamente.")
+                    
+                    insertados = sum(1 for marca in marcas if marca)
+                    totales["insertados"] += insertados
+                    totales["actualizados"] += len(lote) - insertados
+                    logger.info(f"Lote {numero}: {insertados} insertados, {len(lote) - insertados} actualizados.")
+                
+                session.commit()
+                logger.info(f"Carga Masiva completada: {totales['insertados']} insertados, {totales['actualizados']} actualizados.")
+                return totales
             except Exception as e:
                 logger.error(f"Error en Carga Masiva: {e}", exc_info=True)
                 session.rollback()
                 raise e
 
-    def actualizar_fase_2_detalle(self, codigo_ca: str, datos_fase_2: Dict, puntuacion_total: int, detalle_completo: List[str]):
-        """Actualiza una licitación individual con los datos profundos obtenidos en Fase 2."""
+    def _serializar_para_copy(self, compras: List[Dict]) -> io.StringIO:
+        """Convierte los registros del listado a CSV en memoria, en el orden de COLUMNAS_STAGING."""
+        buffer = io.StringIO()
+        escritor = csv.writer(buffer)
+        for orden, item in enumerate(compras):
+            codigo = item.get("codigo", item.get("id"))
+            if not codigo:
+                continue
+            org_raw = item.get("organismo")
+            escritor.writerow([
+                orden,
+                codigo,
+                item.get("nombre"),
+                normalizar_texto(item.get("nombre")),
+                item.get("monto_disponible_CLP"),
+                item.get("fecha_publicacion"),
+                item.get("fecha_cierre"),
+                item.get("cantidad_provedores_cotizando"),
+                item.get("estado"),
+                codigo_estado(item.get("estado")),
+                item.get("estado_convocatoria"),
+                (org_raw if org_raw else "No Especificado").strip(),
+            ])
+        buffer.seek(0)
+        return buffer
+
+    def insertar_o_actualizar_masivo_copy(self, compras: List[Dict]) -> Dict[str, int]:
+        """
+        Motor de ingesta alternativo (solo PostgreSQL) para barridos grandes.
+        1. COPY de los registros a la tabla UNLOGGED 'ca_licitacion_staging'.
+        2. Creación de organismos faltantes con un INSERT ... SELECT (sin mapa en Python).
+        3. Fusión en 'ca_licitacion' con un único INSERT ... SELECT ... ON CONFLICT.
+        Todo ocurre en una transacción; retorna {'insertados': n, 'actualizados': m}.
+        """
+        totales = {"insertados": 0, "actualizados": 0}
+        if not compras:
+            return totales
+        
+        logger.info(f"Iniciando carga masiva (COPY) de {len(compras)} registros...")
+        
         with self.session_factory() as session:
             try:
-                stmt = select(CaLicitacion).where(CaLicitacion.codigo_ca == codigo_ca)
-                licitacion = session.scalars(stmt).first()
-                if not licitacion: 
-                    return
+                conexion = session.connection()
+                conexion.execute(text(SQL_CREAR_STAGING))
+                # TRUNCATE toma un bloqueo exclusivo hasta el commit: serializa cargas concurrentes
+                conexion.execute(text(f"TRUNCATE {TABLA_STAGING}"))
                 
-                licitacion.descripcion = datos_fase_2.get("descripcion")
-                licitacion.productos_solicitados = datos_fase_2.get("productos_solicitados")
-                licitacion.direccion_entrega = datos_fase_2.get("direccion_entrega")
-                licitacion.puntuacion_final = puntuacion_total
-                licitacion.plazo_entrega = datos_fase_2.get("plazo_entrega")
-                licitacion.puntaje_detalle = detalle_completo 
-                licitacion.fecha_cierre_segundo_llamado = datos_fase_2.get("fecha_cierre_p2")
+                # 1. COPY (psycopg2) sobre la misma conexión de la sesión
+                cursor = conexion.connection.cursor()
+                try:
+                    cursor.copy_expert(
+                        f"COPY {TABLA_STAGING} ({', '.join(COLUMNAS_STAGING)}) FROM STDIN WITH (FORMAT csv)",
+                        self._serializar_para_copy(compras)
+                    )
+                finally:
+                    cursor.close()
                 
-                if datos_fase_2.get("estado"):
-                    licitacion.estado_ca_texto = datos_fase_2.get("estado")
-                if datos_fase_2.get("estado_convocatoria") is not None:
-                    licitacion.estado_convocatoria = datos_fase_2.get("estado_convocatoria")
+                # 2. Organismos faltantes (set-based)
+                sector_default = self._obtener_sector_por_defecto(session)
+                conexion.execute(text(SQL_CREAR_ORGANISMOS_STAGING), {"sector_id": sector_default.sector_id})
                 
+                # 3. Fusión en la tabla maestra
+                marcas = conexion.execute(text(SQL_FUSIONAR_STAGING)).scalars().all()
                 session.commit()
-            except Exception as e: 
-                logger.error(f"[Fase 2] Error actualizando {codigo_ca}: {e}")
+                
+                totales["insertados"] = sum(1 for marca in marcas if marca)
+                totales["actualizados"] = len(marcas) - totales["insertados"]
+                logger.info(f"Carga Masiva (COPY) completada: {totales['insertados']} insertados, {totales['actualizados']} actualizados.")
+                return totales
+            except Exception as e:
+                logger.error(f"Error en Carga Masiva (COPY): {e}", exc_info=True)
+                session.rollback()
+                raise e
+
+    def actualizar_fase_2_detalle(self, codigo_ca: str, datos_fase_2: Dict, puntuacion_total: int, detalle_completo: List[str]):
+        """Actualiza una licitación individual con los datos profundos obtenidos en Fase 2."""
+        self.actualizar_fase_2_detalle_en_lote([(codigo_ca, datos_fase_2, puntuacion_total, detalle_completo)])
+
+    def actualizar_fase_2_detalle_en_lote(self, lista_detalles: List[Tuple[str, Dict, int, List[str]]], tamano_commit: Optional[int] = None):
+        """
+        Aplica masivamente los datos de Fase 2 con un UPDATE parametrizado (executemany),
+        confirmando cada 'tamano_commit' filas (por defecto FASE2_TAMANO_COMMIT).
+        El estado y la convocatoria solo se sobrescriben si la ficha los trae (COALESCE).
+        Junto al detalle se guardan la descripción y los productos ya normalizados.
+        
+        Args:
+            lista_detalles: Lista de tuplas (codigo_ca, datos_fase_2, puntuacion_total, detalle_completo)
+        """
+        if not lista_detalles:
+            return
+
+        tamano = max(int(tamano_commit or FASE2_TAMANO_COMMIT), 1)
+
+        # 1. Parámetros con prefijo 'b_' (igual que actualizar_puntajes_en_lote)
+        datos_para_update = [
+            {
+                "b_codigo": codigo_ca,
+                "b_descripcion": datos.get("descripcion"),
+                "b_productos": datos.get("productos_solicitados"),
+                "b_descripcion_norm": normalizar_texto(datos.get("descripcion")),
+                "b_productos_norm": normalizar_productos(datos.get("productos_solicitados")),
+                "b_direccion": datos.get("direccion_entrega"),
+                "b_plazo": datos.get("plazo_entrega"),
+                "b_cierre_p2": datos.get("fecha_cierre_p2"),
+                "b_estado": datos.get("estado") or None,
+                "b_estado_codigo": codigo_estado(datos.get("estado")),
+                "b_convocatoria": datos.get("estado_convocatoria"),
+                "b_puntuacion": puntuacion_total,
+                "b_detalle": detalle_completo,
+            }
+            for codigo_ca, datos, puntuacion_total, detalle_completo in lista_detalles
+        ]
+
+        # 2. Sentencia genérica
+        stmt = (
+            update(CaLicitacion)
+            .where(CaLicitacion.codigo_ca == bindparam("b_codigo"))
+            .values(
+                descripcion=bindparam("b_descripcion"),
+                productos_solicitados=bindparam("b_productos"),
+                descripcion_norm=bindparam("b_descripcion_norm"),
+                productos_norm=bindparam("b_productos_norm"),
+                direccion_entrega=bindparam("b_direccion"),
+                plazo_entrega=bindparam("b_plazo"),
+                fecha_cierre_segundo_llamado=bindparam("b_cierre_p2"),
+                estado_ca_texto=func.coalesce(bindparam("b_estado", type_=CaLicitacion.estado_ca_texto.type), CaLicitacion.estado_ca_texto),
+                estado_codigo=func.coalesce(bindparam("b_estado_codigo", type_=CaLicitacion.estado_codigo.type), CaLicitacion.estado_codigo),
+                estado_convocatoria=func.coalesce(bindparam("b_convocatoria", type_=CaLicitacion.estado_convocatoria.type), CaLicitacion.estado_convocatoria),
+                puntuacion_final=bindparam("b_puntuacion"),
+                puntaje_detalle=bindparam("b_detalle"),
+            )
+        )
+
+        # 3. Ejecución por bloques, un commit por bloque
+        with self.session_factory() as session:
+            try:
+                for inicio in range(0, len(datos_para_update), tamano):
+                    session.connection().execute(stmt, datos_para_update[inicio:inicio + tamano])
+                    session.commit()
+                logger.info(f"[Fase 2] Actualizados {len(datos_para_update)} detalles en BD.")
+            except Exception as e:
                 session.rollback()
+                logger.error(f"[Fase 2] Error en actualización masiva de detalles: {e}")
                 raise
 
-    def actualizar_puntajes_en_lote(self, lista_actualizaciones: List[Tuple[int, int, List[str]]]):
+    def actualizar_puntajes_en_lote(self, lista_actualizaciones: List[Tuple], huella_reglas: Optional[str] = None):
         """
         Actualiza masivamente el puntaje y detalle de las licitaciones.
         Utiliza SQLAlchemy Core 2.0 para máxima eficiencia (una sola query SQL).
+        Si las tuplas traen la huella de entrada, se guarda junto a 'huella_reglas'
+        (ver MotorPuntajes.puntuar_particion).
         
         Args:
-            lista_actualizaciones: Lista de tuplas (ca_id, nuevo_puntaje, detalle_lista)
+            lista_actualizaciones: Lista de tuplas (ca_id, nuevo_puntaje, detalle_lista[, huella_entrada])
         """
         if not lista_actualizaciones:
             return
+        con_huellas = len(lista_actualizaciones[0]) > 3
 
         # 1. Preparamos los datos en formato de diccionario para bindparam
         # Usamos prefijos 'b_' para diferenciar los parámetros de las columnas
-        datos_para_update = [
-            {
+        datos_para_update = []
+        for ca_id, puntaje, detalle, *huella_entrada in lista_actualizaciones:
+            datos = {
                 "b_ca_id": ca_id,
                 "b_puntuacion": puntaje,
                 "b_detalle": detalle  # SQLAlchemy serializará esto a JSON automáticamente
             }
-            for ca_id, puntaje, detalle in lista_actualizaciones
-        ]
+            if con_huellas:
+                datos["b_huella_entrada"] = huella_entrada[0]
+                datos["b_huella_reglas"] = huella_reglas
+            datos_para_update.append(datos)
 
         # 2. Definimos la sentencia SQL genérica
+        valores = {
+            "puntuacion_final": bindparam("b_puntuacion"),
+            "puntaje_detalle": bindparam("b_detalle"),
+        }
+        if con_huellas:
+            valores["huella_entrada"] = bindparam("b_huella_entrada")
+            valores["huella_reglas"] = bindparam("b_huella_reglas")
         stmt = (
             update(CaLicitacion)
             .where(CaLicitacion.ca_id == bindparam("b_ca_id"))
-            .values(
-                puntuacion_final=bindparam("b_puntuacion"),
-                puntaje_detalle=bindparam("b_detalle")
-            )
+            .values(**valores)
         )
 
         # 3. Ejecutamos la transacción
@@ -252,89 +516,293 @@ class DbService:
         Se usa para el 'Barrido de Listado'.
         """
         with self.session_factory() as session:
-            subq = select(CaSeguimiento.ca_id).where(or_(CaSeguimiento.es_favorito == True, CaSeguimiento.es_ofertada == True, CaSeguimiento.es_oculta == True))
-            
             stmt = select(
                 func.min(CaLicitacion.fecha_publicacion),
                 func.max(CaLicitacion.fecha_publicacion)
             ).filter(
-                CaLicitacion.ca_id.notin_(subq),
-                or_(
-                    CaLicitacion.estado_ca_texto.ilike('%Publicada%'),
-                    CaLicitacion.estado_ca_texto.ilike('%Segundo%')
-                )
+                self._condicion_estado_abierto(),
+                self._sin_seguimiento(CaSeguimiento.es_favorito == True, CaSeguimiento.es_ofertada == True, CaSeguimiento.es_oculta == True)
             )
             return session.execute(stmt).first()
 
-    def limpiar_registros_antiguos(self, dias_retencion: int = 30) -> int:
-        """Elimina licitaciones antiguas no gestionadas para mantener la BD ligera."""
+    def limpiar_registros_antiguos(self, dias_retencion: int = 30, tamano_lote: Optional[int] = None) -> int:
+        """
+        Mueve a ca_licitacion_historico las licitaciones antiguas no gestionadas, para mantener
+        ligera la tabla que consultan las pestañas sin perder el historial.
+        Recorre todos los lotes de una vez (sin checkpoint); la versión reanudable es
+        ServicioMantenimiento. Retorna la cantidad de registros archivados.
+        """
         fecha_limite = datetime.now() - timedelta(days=dias_retencion)
-        registros_eliminados = 0
+        try:
+            registros_archivados = self._recorrer_lotes(self.archivar_antiguas_lote, fecha_limite, tamano_lote)
+        except Exception as e:
+            logger.error(f"Error limpieza: {e}")
+            return 0
+        if registros_archivados > 0:
+            logger.info(f"Limpieza automática: {registros_archivados} registros archivados.")
+        return registros_archivados
+
+    def cerrar_licitaciones_vencidas_localmente(self, tamano_lote: Optional[int] = None) -> int:
+        """Fuerza el estado 'Cerrada' en licitaciones cuya fecha de cierre ya pasó (por lotes, sin checkpoint)."""
+        try:
+            registros_afectados = self._recorrer_lotes(self.cerrar_vencidas_lote, datetime.now(), tamano_lote)
+        except Exception as e:
+            logger.error(f"Error cerrando vencidas: {e}")
+            return 0
+        if registros_afectados > 0:
+            logger.info(f"Mantenimiento Local: Se cerraron {registros_afectados} licitaciones vencidas.")
+        return registros_afectados
+
+    # --- MANTENIMIENTO POR LOTES ---
+
+    def cerrar_vencidas_lote(self, fecha_limite: datetime, ultimo_id: int = 0, tamano_lote: Optional[int] = None,
+                             tarea: Optional[str] = None, procesados: int = 0,
+                             cambios: Optional[Set[int]] = None) -> Tuple[Optional[int], int]:
+        """Un lote de 'cerrar vencidas': licitaciones abiertas con fecha_cierre < fecha_limite pasan a 'Cerrada'."""
+        def cerrar(session: Session, ca_ids: List[int]) -> int:
+            return session.execute(
+                update(CaLicitacion)
+                .where(CaLicitacion.ca_id.in_(ca_ids))
+                .values(estado_ca_texto='Cerrada', estado_codigo=EstadoCa.CERRADA)
+            ).rowcount
+
+        seleccion = [CaLicitacion.fecha_cierre < fecha_limite, self._condicion_estado_abierto()]
+        return self._procesar_lote_mantenimiento(seleccion, cerrar, fecha_limite, ultimo_id, tamano_lote, tarea, procesados, cambios)
+
+    def archivar_antiguas_lote(self, fecha_limite: datetime, ultimo_id: int = 0, tamano_lote: Optional[int] = None,
+                               tarea: Optional[str] = None, procesados: int = 0,
+                               cambios: Optional[Set[int]] = None) -> Tuple[Optional[int], int]:
+        """Un lote de archivado: cerradas antes de fecha_limite y no favoritas pasan a ca_licitacion_historico."""
+        seleccion = [
+            CaLicitacion.fecha_cierre < fecha_limite,
+            CaLicitacion.estado_codigo.notin_([int(e) for e in ESTADOS_ABIERTOS]),
+            self._sin_seguimiento(CaSeguimiento.es_favorito == True),
+        ]
+        return self._procesar_lote_mantenimiento(seleccion, self._archivar_lote, fecha_limite, ultimo_id, tamano_lote, tarea, procesados, cambios)
+
+    def obtener_checkpoint_mantenimiento(self, tarea: str) -> Optional[Tuple[int, datetime, int]]:
+        """Retorna (ultimo_id, fecha_limite, procesados) de una tarea interrumpida, o None."""
+        with self.session_factory() as session:
+            checkpoint = session.get(CaMantenimientoCheckpoint, tarea)
+            if not checkpoint:
+                return None
+            return checkpoint.ultimo_id, checkpoint.fecha_limite, checkpoint.procesados
+
+    def borrar_checkpoint_mantenimiento(self, tarea: str) -> None:
+        """Marca la tarea como terminada: la próxima ejecución parte desde cero."""
+        with self.session_factory() as session:
+            session.execute(delete(CaMantenimientoCheckpoint).where(CaMantenimientoCheckpoint.tarea == tarea))
+            session.commit()
+
+    def _procesar_lote_mantenimiento(self, seleccion: list, accion: Callable[[Session, List[int]], int],
+                                     fecha_limite: datetime, ultimo_id: int, tamano_lote: Optional[int],
+                                     tarea: Optional[str], procesados: int,
+                                     cambios: Optional[Set[int]] = None) -> Tuple[Optional[int], int]:
+        """
+        Ejecuta un lote keyset en una transacción corta: toma hasta 'tamano_lote' ca_id > ultimo_id
+        que cumplen 'seleccion' y les aplica 'accion'. Si hay 'tarea', el checkpoint se guarda en la
+        misma transacción (el lote y su avance se confirman juntos).
+        Con 'cambios' los ca_id del lote se acumulan ahí en vez de publicarse en el feed; quien
+        recorre los lotes los publica una sola vez al terminar (publicar_cambios).
+        Retorna (último ca_id del lote, filas afectadas), o (None, 0) si no quedan filas.
+        """
+        tamano = max(int(tamano_lote or TAMANO_LOTE_MANTENIMIENTO), 1)
         with self.session_factory() as session:
             try:
-                subq = select(CaSeguimiento.ca_id).where(CaSeguimiento.es_favorito == True)
-                stmt = delete(CaLicitacion).where(
-                    CaLicitacion.fecha_cierre < fecha_limite, 
-                    CaLicitacion.estado_ca_texto.notin_(['Publicada', 'Publicada - Segundo llamado']),
-                    CaLicitacion.ca_id.notin_(subq)
-                )
-                result = session.execute(stmt)
-                registros_eliminados = result.rowcount
+                ca_ids = session.scalars(
+                    select(CaLicitacion.ca_id)
+                    .where(*seleccion, CaLicitacion.ca_id > ultimo_id)
+                    .order_by(CaLicitacion.ca_id)
+                    .limit(tamano)
+                ).all()
+                if not ca_ids:
+                    return None, 0
+                afectados = accion(session, ca_ids)
+                if tarea:
+                    session.merge(CaMantenimientoCheckpoint(
+                        tarea=tarea, ultimo_id=ca_ids[-1], fecha_limite=fecha_limite, procesados=procesados + afectados
+                    ))
                 session.commit()
-                if registros_eliminados > 0:
-                    logger.info(f"Limpieza automática: {registros_eliminados} registros eliminados.")
-            except Exception as e:
-                logger.error(f"Error limpieza: {e}")
+            except Exception:
                 session.rollback()
-        return registros_eliminados
-    
-    def cerrar_licitaciones_vencidas_localmente(self) -> int:
-        """Fuerza el estado 'Cerrada' en licitaciones cuya fecha de cierre ya pasó."""
-        ahora = datetime.now()
-        registros_afectados = 0
+                raise
+        if cambios is None:
+            self._notificar_cambios(list(ca_ids))
+        else:
+            cambios.update(ca_ids)
+        return ca_ids[-1], afectados
+
+    def _recorrer_lotes(self, procesar_lote: Callable[..., Tuple[Optional[int], int]], fecha_limite: datetime,
+                        tamano_lote: Optional[int]) -> int:
+        """
+        Aplica 'procesar_lote' hasta agotar las filas; retorna el total de filas afectadas.
+        Los ca_id tocados se publican en el feed una sola vez, al final (o tras un fallo).
+        """
+        total, ultimo_id = 0, 0
+        cambios: Set[int] = set()
+        try:
+            while True:
+                ultimo_id, afectados = procesar_lote(fecha_limite, ultimo_id, tamano_lote, cambios=cambios)
+                if ultimo_id is None:
+                    return total
+                total += afectados
+        finally:
+            self.publicar_cambios(cambios)
+
+    def _archivar_lote(self, session: Session, ca_ids: List[int]) -> int:
+        """
+        Copia las filas al archivo y las borra de ca_licitacion. El seguimiento (notas, ocultas) se
+        borra explícitamente: SQLite no aplica el ON DELETE CASCADE sin PRAGMA foreign_keys.
+        """
+        columnas = [CaLicitacion.__table__.c[nombre] for nombre in COLUMNAS_HISTORICO]
+        session.execute(
+            CaLicitacionHistorico.__table__.insert().from_select(
+                list(COLUMNAS_HISTORICO), select(*columnas).where(CaLicitacion.ca_id.in_(ca_ids))
+            )
+        )
+        session.execute(delete(CaSeguimiento).where(CaSeguimiento.ca_id.in_(ca_ids)))
+        return session.execute(delete(CaLicitacion).where(CaLicitacion.ca_id.in_(ca_ids))).rowcount
+
+    def _patron_like(self, termino: str) -> str:
+        """Patrón LIKE (con escape '\\') que busca 'termino' literal en cualquier posición."""
+        for caracter in "\\%_":
+            termino = termino.replace(caracter, "\\" + caracter)
+        return f"%{termino}%"
+
+    def _patron_like_normalizado(self, termino: str) -> str:
+        """Patrón LIKE (con escape '\\') que busca 'termino' normalizado dentro de las columnas *_norm."""
+        return self._patron_like(normalizar_texto(termino))
+
+    def _filtro_afectados_por_reglas(self, terminos: Optional[List[str]], organismo_ids: Optional[List[int]]):
+        """
+        Condición SQL para las licitaciones que un cambio de reglas puede afectar:
+        las que mencionan alguno de los 'terminos' (título, descripción o productos)
+        o pertenecen a alguno de los 'organismo_ids'. Retorna None si no hay nada que filtrar.
+        """
+        condiciones = []
+        for termino in sorted(set(terminos or [])):
+            if not normalizar_texto(termino):
+                continue
+            patron = self._patron_like_normalizado(termino)
+            condiciones.extend([
+                CaLicitacion.nombre_norm.like(patron, escape="\\"),
+                CaLicitacion.descripcion_norm.like(patron, escape="\\"),
+                CaLicitacion.productos_norm.like(patron, escape="\\"),
+            ])
+        if organismo_ids:
+            condiciones.append(CaLicitacion.organismo_id.in_(sorted(set(organismo_ids))))
+        return or_(*condiciones) if condiciones else None
+
+    def _consulta_recalculo_puntajes(
+        self,
+        codigos: Optional[List[str]] = None,
+        terminos: Optional[List[str]] = None,
+        organismo_ids: Optional[List[int]] = None,
+    ):
+        """
+        Construye la consulta ligera usada para recalcular puntajes.
+        Si se entregan 'codigos', se limita a esas licitaciones (micro-lotes de la Fase 1).
+        Con 'terminos' / 'organismo_ids' se limita a las afectadas por un cambio de reglas.
+        Retorna None si el filtro de reglas no puede calzar con ninguna fila.
         
+        Los textos se leen ya normalizados (*_norm); la descripción y los productos crudos
+        solo viajan si su forma normalizada aún no fue calculada.
+        """
+        stmt = select(
+            CaLicitacion.ca_id, 
+            CaLicitacion.codigo_ca, 
+            CaLicitacion.nombre,
+            CaLicitacion.nombre_norm,
+            CaLicitacion.estado_ca_texto, 
+            CaLicitacion.descripcion_norm,
+            CaLicitacion.productos_norm,
+            case((CaLicitacion.descripcion_norm.is_(None), CaLicitacion.descripcion)).label("descripcion"),
+            case((CaLicitacion.productos_norm.is_(None), CaLicitacion.productos_solicitados)).label("productos_solicitados"),
+            CaLicitacion.puntuacion_final, 
+            CaLicitacion.huella_reglas,
+            CaLicitacion.huella_entrada,
+            CaLicitacion.organismo_id,
+            CaOrganismo.nombre.label("organismo_nombre")
+        ).outerjoin(CaOrganismo, CaLicitacion.organismo_id == CaOrganismo.organismo_id)
+
+        if codigos is not None:
+            stmt = stmt.where(CaLicitacion.codigo_ca.in_(codigos))
+        if terminos is not None or organismo_ids is not None:
+            filtro_reglas = self._filtro_afectados_por_reglas(terminos, organismo_ids)
+            if filtro_reglas is None:
+                return None
+            stmt = stmt.where(filtro_reglas)
+        return stmt
+
+    def _fila_recalculo_a_diccionario(self, r) -> Dict:
+        return {
+            "ca_id": r.ca_id, 
+            "codigo_ca": r.codigo_ca, 
+            "nombre": r.nombre,
+            "nombre_norm": r.nombre_norm,
+            "estado_ca_texto": r.estado_ca_texto, 
+            "organismo_id": r.organismo_id,
+            "organismo_nombre": r.organismo_nombre or "",
+            "descripcion": r.descripcion, 
+            "descripcion_norm": r.descripcion_norm,
+            "productos_solicitados": r.productos_solicitados,
+            "productos_norm": r.productos_norm,
+            "puntuacion_final_actual": r.puntuacion_final or 0,
+            "huella_reglas": r.huella_reglas,
+            "huella_entrada": r.huella_entrada,
+        }
+
+    def obtener_datos_para_recalculo_puntajes(
+        self,
+        codigos: Optional[List[str]] = None,
+        terminos: Optional[List[str]] = None,
+        organismo_ids: Optional[List[int]] = None,
+    ) -> List[Dict]:
+        """Obtiene (en memoria) los datos ligeros para recalcular puntajes. Ver '_consulta_recalculo_puntajes'."""
+        return [fila for particion in self.iterar_datos_para_recalculo_puntajes(codigos=codigos, terminos=terminos, organismo_ids=organismo_ids) for fila in particion]
+
+    def iterar_datos_para_recalculo_puntajes(
+        self,
+        tamano_particion: Optional[int] = None,
+        codigos: Optional[List[str]] = None,
+        terminos: Optional[List[str]] = None,
+        organismo_ids: Optional[List[int]] = None,
+    ) -> Iterator[List[Dict]]:
+        """
+        Versión en streaming: usa un cursor del lado del servidor (stream_results + yield_per)
+        y entrega particiones de 'tamano_particion' filas (por defecto TAMANO_LOTE_RECALCULO),
+        de modo que la memoria no crece con el tamaño de 'ca_licitacion'.
+        """
+        stmt = self._consulta_recalculo_puntajes(codigos, terminos, organismo_ids)
+        if stmt is None:
+            return
+        tamano = max(int(tamano_particion or TAMANO_LOTE_RECALCULO), 1)
+
         with self.session_factory() as session:
-            try:
-                stmt = update(CaLicitacion).where(
-                    CaLicitacion.fecha_cierre < ahora,
-                    CaLicitacion.estado_ca_texto.in_(['Publicada', 'Publicada - Segundo llamado'])
-                ).values(estado_ca_texto='Cerrada')
-                
-                result = session.execute(stmt)
-                registros_afectados = result.rowcount
-                session.commit()
-                
-                if registros_afectados > 0:
-                    logger.info(f"Mantenimiento Local: Se cerraron {registros_afectados} licitaciones vencidas.")
-            except Exception as e:
-                logger.error(f"Error cerrando vencidas: {e}")
-                session.rollback()
-        return registros_afectados
+            resultado = session.execute(stmt.execution_options(stream_results=True, yield_per=tamano))
+            for particion in resultado.partitions():
+                yield [self._fila_recalculo_a_diccionario(r) for r in particion]
 
-    def obtener_datos_para_recalculo_puntajes(self) -> List[Dict]:
-        """Obtiene datos ligeros de todas las licitaciones para recalcular puntajes."""
+    def contar_datos_para_recalculo_puntajes(
+        self,
+        codigos: Optional[List[str]] = None,
+        terminos: Optional[List[str]] = None,
+        organismo_ids: Optional[List[int]] = None,
+    ) -> int:
+        """Cantidad de filas que entregaría 'iterar_datos_para_recalculo_puntajes' (para el progreso)."""
+        stmt = self._consulta_recalculo_puntajes(codigos, terminos, organismo_ids)
+        if stmt is None:
+            return 0
         with self.session_factory() as session:
-            stmt = select(
-                CaLicitacion.ca_id, 
-                CaLicitacion.codigo_ca, 
-                CaLicitacion.nombre,
-                CaLicitacion.estado_ca_texto, 
-                CaLicitacion.descripcion, 
-                CaLicitacion.productos_solicitados,
-                CaLicitacion.puntuacion_final, 
-                CaOrganismo.nombre.label("organismo_nombre")
-            ).outerjoin(CaOrganismo, CaLicitacion.organismo_id == CaOrganismo.organismo_id)
-            rows = session.execute(stmt).all()
-            return [{
-                "ca_id": r.ca_id, 
-                "codigo_ca": r.codigo_ca, 
-                "nombre": r.nombre,
-                "estado_ca_texto": r.estado_ca_texto, 
-                "organismo_nombre": r.organismo_nombre or "",
-                "descripcion": r.descripcion, 
-                "productos_solicitados": r.productos_solicitados,
-                "puntuacion_final_actual": r.puntuacion_final or 0 
-            } for r in rows]
+            return session.execute(select(func.count()).select_from(stmt.subquery())).scalar() or 0
+
+    def obtener_ids_por_codigo(self, codigos: List[str]) -> Dict[str, int]:
+        """Retorna {codigo_ca: ca_id} para los códigos que existen en BD."""
+        if not codigos:
+            return {}
+        with self.session_factory() as session:
+            stmt = select(CaLicitacion.codigo_ca, CaLicitacion.ca_id).where(CaLicitacion.codigo_ca.in_(codigos))
+            return {codigo: ca_id for codigo, ca_id in session.execute(stmt).all()}
 
     def obtener_candidatas_para_fase_2(self, umbral_minimo: int = 10) -> List[CaLicitacion]:
         """Devuelve licitaciones con buen puntaje que aun no tienen descripción (falta Fase 2)."""
@@ -345,32 +813,71 @@ class DbService:
             ).order_by(CaLicitacion.fecha_cierre.asc())
             return session.scalars(stmt).all()
 
+    def _condiciones_candidatas(self, umbral_minimo: int) -> list:
+        """Filtros de la pestaña 'Candidatas': excluye seguimiento/ofertadas/ocultas y aplica estados."""
+        return [
+            self._condicion_estado_abierto(),
+            CaLicitacion.puntuacion_final >= umbral_minimo, 
+            self._sin_seguimiento(
+                CaSeguimiento.es_favorito == True, 
+                CaSeguimiento.es_ofertada == True, 
+                CaSeguimiento.es_oculta == True
+            )
+        ]
+
+    def _condiciones_seguimiento(self) -> list:
+        return [CaSeguimiento.es_favorito == True, CaSeguimiento.es_ofertada == False]
+
+    def _condiciones_ofertadas(self) -> list:
+        return [CaSeguimiento.es_ofertada == True]
+
+    def _condiciones_filtro(self, filtros: Optional[Dict] = None, texto: str = "") -> list:
+        """
+        Traduce los filtros de la GUI (InterfazTabla.estado_filtro) y la búsqueda a predicados SQL.
+        La búsqueda usa ILIKE sobre nombre, código y organismo (índices trigram en PostgreSQL).
+        """
+        condiciones = []
+        texto = (texto or "").strip()
+        if texto:
+            patron = self._patron_like(texto)
+            condiciones.append(or_(
+                CaLicitacion.nombre.ilike(patron, escape="\\"),
+                CaLicitacion.codigo_ca.ilike(patron, escape="\\"),
+                CaOrganismo.nombre.ilike(patron, escape="\\"),
+            ))
+        if not filtros:
+            return condiciones
+
+        if not filtros.get("show_zeros", True):
+            condiciones.append(CaLicitacion.puntuacion_final != 0)
+        if filtros.get("selected_states"):
+            condiciones.append(CaLicitacion.estado_codigo.in_({codigo_estado(e) for e in filtros["selected_states"]}))
+        if filtros.get("2do_llamado"):
+            condiciones.append(CaLicitacion.estado_convocatoria == 2)
+        if (filtros.get("monto") or 0) > 0:
+            condiciones.append(CaLicitacion.monto_clp >= filtros["monto"])
+        if filtros.get("pub_from"):
+            condiciones.append(CaLicitacion.fecha_publicacion >= filtros["pub_from"])
+        if filtros.get("pub_to"):
+            condiciones.append(CaLicitacion.fecha_publicacion <= filtros["pub_to"])
+        # Las fechas de cierre se comparan por día completo, igual que el filtro de la tabla
+        if filtros.get("close_from"):
+            condiciones.append(CaLicitacion.fecha_cierre >= datetime.combine(filtros["close_from"], datetime.min.time()))
+        if filtros.get("close_to"):
+            condiciones.append(CaLicitacion.fecha_cierre < datetime.combine(filtros["close_to"] + timedelta(days=1), datetime.min.time()))
+        return condiciones
+
     def obtener_candidatas_filtradas(self, umbral_minimo: int = 5) -> List[CaLicitacion]:
         """
         Retorna licitaciones para la pestaña 'Candidatas'.
         Excluye las que ya están en seguimiento/ofertadas y aplica filtros de estado.
         """
         with self.session_factory() as session:
-            # 1. Subquery de exclusión 
-            subq = select(CaSeguimiento.ca_id).where(
-                or_(
-                    CaSeguimiento.es_favorito == True, 
-                    CaSeguimiento.es_ofertada == True, 
-                    CaSeguimiento.es_oculta == True
-                )
-            )
-            
-            # 2. Query Principal
             stmt = select(CaLicitacion).options(
                 joinedload(CaLicitacion.seguimiento), 
                 joinedload(CaLicitacion.organismo).joinedload(CaOrganismo.sector)
             ).filter(
-                CaLicitacion.puntuacion_final >= umbral_minimo, 
-                CaLicitacion.ca_id.notin_(subq),
-                or_(
-                    CaLicitacion.estado_ca_texto == 'Publicada',
-                    CaLicitacion.estado_ca_texto == 'Publicada - Segundo llamado'
-                )
+                *self._condiciones_candidatas(umbral_minimo)
             ).order_by(CaLicitacion.puntuacion_final.desc())
             
             return session.scalars(stmt).all()
@@ -382,8 +889,7 @@ class DbService:
                 joinedload(CaLicitacion.seguimiento), 
                 joinedload(CaLicitacion.organismo).joinedload(CaOrganismo.sector)
             ).join(CaSeguimiento, CaLicitacion.ca_id == CaSeguimiento.ca_id).filter(
-                CaSeguimiento.es_favorito == True, 
-                CaSeguimiento.es_ofertada == False
+                *self._condiciones_seguimiento()
             ).order_by(CaLicitacion.fecha_cierre.asc())
             return session.scalars(stmt).all()
 
@@ -394,10 +900,141 @@ class DbService:
                 joinedload(CaLicitacion.seguimiento), 
                 joinedload(CaLicitacion.organismo).joinedload(CaOrganismo.sector)
             ).join(CaSeguimiento, CaLicitacion.ca_id == CaSeguimiento.ca_id).filter(
-                CaSeguimiento.es_ofertada == True
+                *self._condiciones_ofertadas()
             ).order_by(CaLicitacion.fecha_cierre.asc())
             return session.scalars(stmt).all()
 
+    # --- PROYECCIONES PARA LAS PESTAÑAS (GUI) ---
+
+    def _sentencia_resumenes(
+        self,
+        condiciones: list,
+        orden: list,
+        ca_ids: Optional[Iterable[int]] = None,
+        limite: Optional[int] = None,
+        despues: Optional[object] = None,
+    ):
+        """
+        SELECT de solo las columnas visibles en las tablas (en el orden de LicitacionResumen).
+        'despues' es la condición de keyset que deja fuera las páginas ya entregadas.
+        """
+        stmt = select(
+            CaLicitacion.ca_id,
+            CaLicitacion.codigo_ca,
+            CaLicitacion.nombre,
+            CaLicitacion.puntuacion_final,
+            CaLicitacion.puntaje_detalle,
+            CaLicitacion.estado_ca_texto,
+            CaLicitacion.estado_convocatoria,
+            CaLicitacion.fecha_publicacion,
+            CaLicitacion.fecha_cierre,
+            CaLicitacion.fecha_cierre_segundo_llamado,
+            CaLicitacion.monto_clp,
+            CaOrganismo.nombre,
+            CaSeguimiento.notas,
+        ).outerjoin(
+            CaOrganismo, CaLicitacion.organismo_id == CaOrganismo.organismo_id
+        ).outerjoin(
+            CaSeguimiento, CaLicitacion.ca_id == CaSeguimiento.ca_id
+        ).where(*condiciones).order_by(*orden)
+        if ca_ids is not None:
+            stmt = stmt.where(CaLicitacion.ca_id.in_(list(ca_ids)))
+        if despues is not None:
+            stmt = stmt.where(despues)
+        if limite:
+            stmt = stmt.limit(limite)
+        return stmt
+
+    def _obtener_resumenes(self, *args, **kwargs) -> List[LicitacionResumen]:
+        """
+        Ejecuta _sentencia_resumenes y entrega LicitacionResumen.
+        Los campos pesados se cargan aparte (obtener_licitacion_por_id) al abrir el detalle.
+        """
+        with self.session_factory() as session:
+            return [LicitacionResumen(*fila) for fila in session.execute(self._sentencia_resumenes(*args, **kwargs))]
+
+    def _despues_por_puntaje(self, ultima: LicitacionResumen):
+        """Keyset de (puntuacion_final DESC, ca_id ASC)."""
+        return or_(
+            CaLicitacion.puntuacion_final < ultima.puntuacion_final,
+            and_(CaLicitacion.puntuacion_final == ultima.puntuacion_final, CaLicitacion.ca_id > ultima.ca_id),
+        )
+
+    def _despues_por_cierre(self, ultima: LicitacionResumen):
+        """Keyset de (fecha_cierre ASC NULLS LAST, ca_id ASC)."""
+        if ultima.fecha_cierre is None:
+            return and_(CaLicitacion.fecha_cierre.is_(None), CaLicitacion.ca_id > ultima.ca_id)
+        return or_(
+            CaLicitacion.fecha_cierre > ultima.fecha_cierre,
+            and_(CaLicitacion.fecha_cierre == ultima.fecha_cierre, CaLicitacion.ca_id > ultima.ca_id),
+            CaLicitacion.fecha_cierre.is_(None),
+        )
+
+    def obtener_resumen_candidatas(
+        self,
+        umbral_minimo: int = 5,
+        ca_ids: Optional[Iterable[int]] = None,
+        limite: Optional[int] = None,
+        despues_de: Optional[LicitacionResumen] = None,
+        filtros: Optional[Dict] = None,
+        texto: str = "",
+    ) -> List[LicitacionResumen]:
+        """
+        Proyección de la pestaña 'Candidatas' (mismos filtros que obtener_candidatas_filtradas).
+        Con 'limite' entrega una página; la siguiente se pide pasando la última fila en 'despues_de'.
+        'filtros' y 'texto' aplican en SQL los filtros y la búsqueda de la tabla (ver _condiciones_filtro).
+        """
+        return self._obtener_resumenes(
+            self._condiciones_candidatas(umbral_minimo) + self._condiciones_filtro(filtros, texto),
+            [CaLicitacion.puntuacion_final.desc(), CaLicitacion.ca_id.asc()],
+            ca_ids, limite,
+            self._despues_por_puntaje(despues_de) if despues_de else None,
+        )
+
+    def obtener_resumen_seguimiento(
+        self,
+        ca_ids: Optional[Iterable[int]] = None,
+        limite: Optional[int] = None,
+        despues_de: Optional[LicitacionResumen] = None,
+        filtros: Optional[Dict] = None,
+        texto: str = "",
+    ) -> List[LicitacionResumen]:
+        """Proyección de la pestaña 'Seguimiento' (paginable igual que las candidatas)."""
+        return self._obtener_resumenes(
+            self._condiciones_seguimiento() + self._condiciones_filtro(filtros, texto),
+            [CaLicitacion.fecha_cierre.asc().nulls_last(), CaLicitacion.ca_id.asc()],
+            ca_ids, limite,
+            self._despues_por_cierre(despues_de) if despues_de else None,
+        )
+
+    def obtener_resumen_ofertadas(
+        self,
+        ca_ids: Optional[Iterable[int]] = None,
+        limite: Optional[int] = None,
+        despues_de: Optional[LicitacionResumen] = None,
+        filtros: Optional[Dict] = None,
+        texto: str = "",
+    ) -> List[LicitacionResumen]:
+        """Proyección de la pestaña 'Ofertadas' (paginable igual que las candidatas)."""
+        return self._obtener_resumenes(
+            self._condiciones_ofertadas() + self._condiciones_filtro(filtros, texto),
+            [CaLicitacion.fecha_cierre.asc().nulls_last(), CaLicitacion.ca_id.asc()],
+            ca_ids, limite,
+            self._despues_por_cierre(despues_de) if despues_de else None,
+        )
+
+    def obtener_pestanas_por_ids(self, ca_ids: Iterable[int], umbral_minimo: int = 5) -> Dict[str, List[LicitacionResumen]]:
+        """
+        Evalúa las tres pestañas solo para 'ca_ids', con los mismos filtros de la carga completa.
+        Una licitación ausente de una lista ya no pertenece a esa pestaña.
+        """
+        ca_ids = list(ca_ids)
+        return {
+            "candidatas": self.obtener_resumen_candidatas(umbral_minimo=umbral_minimo, ca_ids=ca_ids),
+            "seguimiento": self.obtener_resumen_seguimiento(ca_ids=ca_ids),
+            "ofertadas": self.obtener_resumen_ofertadas(ca_ids=ca_ids),
+        }
+
     # --- ACCIONES DEL USUARIO ---
 
     def gestionar_favorito(self, ca_id: int, es_favorito: bool): 
@@ -429,6 +1066,8 @@ class DbService:
             except Exception as e: 
                 logger.error(f"Error actualizando seguimiento {ca_id}: {e}")
                 session.rollback()
+                return
+        self._notificar_cambios([ca_id])
 
     def ocultar_licitacion(self, ca_id: int, ocultar: bool = True):
         with self.session_factory() as session:
@@ -446,6 +1085,8 @@ class DbService:
             except Exception as e: 
                 logger.error(f"Error ocultando licitación {ca_id}: {e}")
                 session.rollback()
+                return
+        self._notificar_cambios([ca_id])
 
     def guardar_nota_usuario(self, ca_id: int, nota: str):
         with self.session_factory() as session:
@@ -460,6 +1101,8 @@ class DbService:
             except Exception as e: 
                 logger.error(f"Error guardando nota {ca_id}: {e}")
                 session.rollback()
+                return
+        self._notificar_cambios([ca_id])
 
     def marcar_organismos_como_vistos(self):
         """
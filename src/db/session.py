@@ -2,25 +2,107 @@
 """
 Configuración de la Sesión de Base de Datos (SQLAlchemy).
 
-Este módulo establece la conexión con la base de datos PostgreSQL y 
+Este módulo establece la conexión con la base de datos PostgreSQL y
 configura la fábrica de sesiones para el manejo de transacciones.
 """
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session
-from config.config import DATABASE_URL
+from sqlalchemy.pool import QueuePool
+from config.config import (
+    DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING, DB_STATEMENT_TIMEOUT_MS
+)
 from src.utils.logger import configurar_logger
 
 logger = configurar_logger(__name__)
 
+
+class PoolMedido(QueuePool):
+    """
+    QueuePool que además mide cuánto esperan los hilos por una conexión
+    (la espera incluye abrir una conexión nueva cuando el pool crece).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._bloqueo_metricas = threading.Lock()
+        self._checkouts = 0
+        self._espera_total = 0.0
+        self._espera_maxima = 0.0
+        self._agotado = 0
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            with self._bloqueo_metricas:
+                self._agotado += 1
+            logger.warning(f"Pool de conexiones agotado ({self.checkedout()} en uso); considere subir DB_POOL_SIZE/DB_MAX_OVERFLOW.")
+            raise
+        finally:
+            espera = time.perf_counter() - inicio
+            with self._bloqueo_metricas:
+                self._checkouts += 1
+                self._espera_total += espera
+                self._espera_maxima = max(self._espera_maxima, espera)
+
+    def metricas(self) -> Dict[str, Any]:
+        """Estado actual del pool y esperas acumuladas desde su creación."""
+        with self._bloqueo_metricas:
+            checkouts, espera_total, espera_maxima, agotado = (
+                self._checkouts, self._espera_total, self._espera_maxima, self._agotado
+            )
+        return {
+            "tamano": self.size(),
+            "en_uso": self.checkedout(),
+            "libres": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "checkouts": checkouts,
+            "espera_promedio_ms": round(espera_total / checkouts * 1000, 3) if checkouts else 0.0,
+            "espera_maxima_ms": round(espera_maxima * 1000, 3),
+            "agotado": agotado,
+        }
+
+
+def opciones_engine(url: str) -> Dict[str, Any]:
+    """
+    Argumentos de create_engine según el motor. SQLite (pruebas) conserva su pool
+    por defecto; PostgreSQL usa PoolMedido con los parámetros del .env.
+    """
+    opciones: Dict[str, Any] = {"echo": False}
+    url_bd = make_url(url)
+    if url_bd.get_backend_name() == "sqlite":
+        return opciones
+
+    opciones.update(
+        poolclass=PoolMedido,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    if DB_STATEMENT_TIMEOUT_MS > 0 and url_bd.get_backend_name() == "postgresql":
+        opciones["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return opciones
+
+
+def obtener_metricas_pool() -> Dict[str, Any]:
+    """Métricas del pool del engine principal ({} si no es un PoolMedido, p. ej. SQLite)."""
+    if isinstance(engine.pool, PoolMedido):
+        return engine.pool.metricas()
+    return {}
+
+
 # --- Creación del Motor de Base de Datos (Engine) ---
 try:
-    engine = create_engine(
-        DATABASE_URL,
-        # 'pool_pre_ping': Verifica la conexión antes de usarla, 
-        # recuperándose automáticamente de desconexiones del servidor.
-        pool_pre_ping=True,  
-        echo=False
-    )
+    engine = create_engine(DATABASE_URL, **opciones_engine(DATABASE_URL))
     logger.info("Motor SQLAlchemy (Engine) inicializado correctamente.")
 except Exception as e:
     logger.critical(f"Error crítico al inicializar el motor de base de datos: {e}")
@@ -5,7 +5,7 @@ import datetime
 from typing import List
 
 from PySide6.QtCore import QThreadPool, QTimer, Qt, Slot, QTime, QDate
-from PySide6.QtGui import QStandardItemModel, QIcon, QFont
+from PySide6.QtGui import QIcon, QFont
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QTableView, QFrame, QSystemTrayIcon, QMenu, QStyle, QFileDialog,
@@ -26,23 +26,27 @@ from src.utils.logger import configurar_logger
 from src.utils.settings_manager import GestorConfiguracion
 
 # Servicios Backend
-from src.db.session import SessionLocal
+from src.db.session import SessionLocal, obtener_metricas_pool
 from src.db.db_service import DbService
 from src.logic.etl_service import ServicioEtl
 from src.logic.excel_service import ServicioExcel
+from src.logic.mantenimiento_service import ServicioMantenimiento
 from src.logic.score_engine import MotorPuntajes
 from src.scraper.scraper_service import ServicioScraper
-from src.gui.gui_models import ModeloProxyLicitacion
+from src.gui.gui_models import ModeloProxyLicitacion, ModeloLicitaciones
 
 # Mixins
 from .mixins.threading_mixin import MixinHilos
 from .mixins.main_slots_mixin import MixinSlotsPrincipales
 from .mixins.data_loader_mixin import MixinCargaDatos
 from .mixins.context_menu_mixin import MixinMenuContextual
-from .mixins.table_manager_mixin import MixinGestorTabla, COLUMN_HEADERS
+from .mixins.table_manager_mixin import MixinGestorTabla
 
 logger = configurar_logger(__name__)
 
+# Pausa de tecleo antes de re-filtrar las tablas
+DEBOUNCE_BUSQUEDA_MS = 250
+
 # --- Clases Auxiliares de UI ---
 
 class CheckableComboBox(QComboBox):
@@ -107,6 +111,8 @@ class ClickableContainer(QWidget):
 class InterfazTabla(QWidget):
     from PySide6.QtCore import Signal
     filtrosCambios = Signal()
+    # Se emite cuando el usuario deja de escribir en la barra de búsqueda
+    busquedaCambiada = Signal()
 
     def __init__(self, object_name, parent=None):
         super().__init__(parent=parent)
@@ -131,6 +137,12 @@ class InterfazTabla(QWidget):
         self.barraBusqueda.setPlaceholderText("Buscar por Código, Nombre u Organismo...")
         self.barraBusqueda.setClearButtonEnabled(True)
 
+        self.temporizadorBusqueda = QTimer(self)
+        self.temporizadorBusqueda.setSingleShot(True)
+        self.temporizadorBusqueda.setInterval(DEBOUNCE_BUSQUEDA_MS)
+        self.temporizadorBusqueda.timeout.connect(self.busquedaCambiada.emit)
+        self.barraBusqueda.textChanged.connect(lambda _: self.temporizadorBusqueda.start())
+
         self.botonImportar = ToolButton(FIF.ADD, self)
         self.botonImportar.setToolTip("Agregar manual (Importar códigos)")
         
@@ -248,6 +260,7 @@ class MainWindow(FluentWindow, MixinHilos, MixinSlotsPrincipales, MixinCargaDato
         self.thread_pool = QThreadPool.globalInstance()
         self.trabajadores_activos = []
         self.tarea_en_ejecucion = False
+        self.recalculo_pendiente = {"terminos": set(), "organismo_ids": set()}
         self.ultimo_error = None
         self.log_tareas_ejecutadas = set()
         
@@ -259,6 +272,7 @@ class MainWindow(FluentWindow, MixinHilos, MixinSlotsPrincipales, MixinCargaDato
             self.servicio_excel = ServicioExcel(self.db_service)
             self.motor_puntajes = MotorPuntajes(self.db_service)
             self.servicio_etl = ServicioEtl(self.db_service, self.servicio_scraper, self.motor_puntajes)
+            self.servicio_mantenimiento = ServicioMantenimiento(self.db_service)
         except Exception as e:
             logger.critical(f"Error fatal iniciando servicios: {e}")
             sys.exit(1)
@@ -279,7 +293,7 @@ class MainWindow(FluentWindow, MixinHilos, MixinSlotsPrincipales, MixinCargaDato
 
         # 1. Tab Candidatas
         self.interfazCandidatas = InterfazTabla("tab_unified", self)
-        self.modelo_tab1 = QStandardItemModel(0, len(COLUMN_HEADERS))
+        self.modelo_tab1 = ModeloLicitaciones(self)
         self.proxy_tab1 = ModeloProxyLicitacion(self)
         self.proxy_tab1.setSourceModel(self.modelo_tab1)
         self.tabla_unificada = self.crear_tabla_view(self.modelo_tab1, "tab_unified")
@@ -288,7 +302,7 @@ class MainWindow(FluentWindow, MixinHilos, MixinSlotsPrincipales, MixinCargaDato
         
         # 2. Tab Seguimiento
         self.interfazSeguimiento = InterfazTabla("tab_seguimiento", self)
-        self.modelo_tab3 = QStandardItemModel(0, len(COLUMN_HEADERS))
+        self.modelo_tab3 = ModeloLicitaciones(self)
         self.proxy_tab3 = ModeloProxyLicitacion(self)
         self.proxy_tab3.setSourceModel(self.modelo_tab3)
         self.tabla_seguimiento = self.crear_tabla_view(self.modelo_tab3, "tab_seguimiento")
@@ -297,7 +311,7 @@ class MainWindow(FluentWindow, MixinHilos, MixinSlotsPrincipales, MixinCargaDato
         
         # 3. Tab Ofertadas
         self.interfazOfertadas = InterfazTabla("tab_ofertadas", self)
-        self.modelo_tab4 = QStandardItemModel(0, len(COLUMN_HEADERS))
+        self.modelo_tab4 = ModeloLicitaciones(self)
         self.proxy_tab4 = ModeloProxyLicitacion(self)
         self.proxy_tab4.setSourceModel(self.modelo_tab4)
         self.tabla_ofertadas = self.crear_tabla_view(self.modelo_tab4, "tab_ofertadas")
@@ -309,6 +323,7 @@ class MainWindow(FluentWindow, MixinHilos, MixinSlotsPrincipales, MixinCargaDato
         self.interfazHerramientas.senal_iniciar_scraping.connect(self.on_start_full_scraping)
         self.interfazHerramientas.senal_iniciar_exportacion.connect(self.on_start_export_dispatch)
         self.interfazHerramientas.senal_iniciar_recalculo.connect(lambda: self.on_run_recalculate_thread(silent=True))
+        self.interfazHerramientas.senal_iniciar_recalculo_incremental.connect(self.on_run_incremental_recalculate_thread)
         self.interfazHerramientas.senal_configuracion_cambiada.connect(self.on_settings_changed)
         self.interfazHerramientas.senal_config_autopiloto_cambiada.connect(lambda: self.settings_manager.cargar_configuracion())
         
@@ -317,6 +332,7 @@ class MainWindow(FluentWindow, MixinHilos, MixinSlotsPrincipales, MixinCargaDato
         self.initNavigation()
         self._configurar_bandeja()
         self._conectar_senales_tablas()
+        self.conectar_feed_cambios()
         
         # Arranque automático
         self.timer_programador.start(30000)
@@ -365,20 +381,20 @@ class MainWindow(FluentWindow, MixinHilos, MixinSlotsPrincipales, MixinCargaDato
     def _conectar_senales_tablas(self):
         
         ui = self.interfazCandidatas
-        ui.barraBusqueda.textChanged.connect(lambda: self.actualizar_filtro_proxy(self.proxy_tab1, ui))
-        ui.filtrosCambios.connect(lambda: self.actualizar_filtro_proxy(self.proxy_tab1, ui))
+        ui.busquedaCambiada.connect(lambda: self.on_filtros_cambiados(self.proxy_tab1, ui, "candidatas", self.modelo_tab1))
+        ui.filtrosCambios.connect(lambda: self.on_filtros_cambiados(self.proxy_tab1, ui, "candidatas", self.modelo_tab1))
         ui.botonImportar.clicked.connect(lambda: self.abrir_importacion_manual("candidatas"))
         self.tabla_unificada.customContextMenuRequested.connect(self.mostrar_menu_contextual)
         
         ui3 = self.interfazSeguimiento
-        ui3.barraBusqueda.textChanged.connect(lambda: self.actualizar_filtro_proxy(self.proxy_tab3, ui3))
-        ui3.filtrosCambios.connect(lambda: self.actualizar_filtro_proxy(self.proxy_tab3, ui3))
+        ui3.busquedaCambiada.connect(lambda: self.on_filtros_cambiados(self.proxy_tab3, ui3, "seguimiento", self.modelo_tab3))
+        ui3.filtrosCambios.connect(lambda: self.on_filtros_cambiados(self.proxy_tab3, ui3, "seguimiento", self.modelo_tab3))
         ui3.botonImportar.clicked.connect(lambda: self.abrir_importacion_manual("seguimiento"))
         self.tabla_seguimiento.customContextMenuRequested.connect(self.mostrar_menu_contextual)
         
         ui4 = self.interfazOfertadas
-        ui4.barraBusqueda.textChanged.connect(lambda: self.actualizar_filtro_proxy(self.proxy_tab4, ui4))
-        ui4.filtrosCambios.connect(lambda: self.actualizar_filtro_proxy(self.proxy_tab4, ui4))
+        ui4.busquedaCambiada.connect(lambda: self.on_filtros_cambiados(self.proxy_tab4, ui4, "ofertadas", self.modelo_tab4))
+        ui4.filtrosCambios.connect(lambda: self.on_filtros_cambiados(self.proxy_tab4, ui4, "ofertadas", self.modelo_tab4))
         ui4.botonImportar.clicked.connect(lambda: self.abrir_importacion_manual("ofertadas"))
         self.tabla_ofertadas.customContextMenuRequested.connect(self.mostrar_menu_contextual)
 
@@ -393,6 +409,11 @@ class MainWindow(FluentWindow, MixinHilos, MixinSlotsPrincipales, MixinCargaDato
             ui_obj.estado_filtro["close_from"], ui_obj.estado_filtro["close_to"]
         )
 
+    def on_filtros_cambiados(self, proxy_model, ui_obj, nombre_pestana, modelo):
+        # El servidor aplica los filtros a las páginas; el proxy los mantiene para las filas parchadas
+        self.actualizar_filtro_proxy(proxy_model, ui_obj)
+        self.recargar_pestana_filtrada(nombre_pestana, modelo)
+
     def poblar_tab_unificada(self, data):
         super().poblar_tab_unificada(data)
         self.actualizar_filtro_proxy(self.proxy_tab1, self.interfazCandidatas)
@@ -412,6 +433,23 @@ class MainWindow(FluentWindow, MixinHilos, MixinSlotsPrincipales, MixinCargaDato
     def _iniciar_tarea_recalculo(self, silent): 
         self.start_task(task=self.servicio_etl.ejecutar_recalculo_total, on_finished=lambda: self.on_recalculate_finished_custom(silent))
         
+    @Slot(dict)
+    def on_run_incremental_recalculate_thread(self, cambios: dict):
+        # Se acumula con lo pendiente: si hay una tarea en curso, corre al terminar
+        self.recalculo_pendiente["terminos"].update(cambios.get("terminos", []))
+        self.recalculo_pendiente["organismo_ids"].update(cambios.get("organismo_ids", []))
+        if self.tarea_en_ejecucion:
+            InfoBar.warning("Ocupado", "Los puntajes afectados se recalcularán al terminar la tarea en curso.", parent=self)
+            return
+        self._iniciar_recalculo_pendiente()
+
+    def _iniciar_recalculo_pendiente(self):
+        if self.tarea_en_ejecucion: return
+        if not (self.recalculo_pendiente["terminos"] or self.recalculo_pendiente["organismo_ids"]): return
+        cambios = {clave: sorted(valores) for clave, valores in self.recalculo_pendiente.items()}
+        self.recalculo_pendiente = {"terminos": set(), "organismo_ids": set()}
+        self.start_task(task=self.servicio_etl.ejecutar_recalculo_incremental, on_finished=lambda: self.on_recalculate_finished_custom(True), task_kwargs=cambios)
+
     def on_recalculate_finished_custom(self, silent): self.set_ui_busy(False); self.on_load_data_thread(); InfoBar.success("Proceso Completado", "Puntajes actualizados.", parent=self)
     
     @Slot(list)
@@ -476,19 +514,35 @@ class MainWindow(FluentWindow, MixinHilos, MixinSlotsPrincipales, MixinCargaDato
 
     @Slot()
     def iniciar_limpieza_silenciosa(self): 
-        self.start_task(task=self.servicio_etl.ejecutar_limpieza_automatica, on_result=lambda: None)
+        # Lotes cortos en segundo plano: la UI sigue disponible mientras corre
+        self.start_task(
+            task=self.servicio_mantenimiento.ejecutar,
+            on_progress=self.on_progreso_mantenimiento,
+            on_finished=lambda: self.on_progreso_mantenimiento("Listo"),
+            marcar_ocupado=False,
+        )
         
     def set_ui_busy(self, busy: bool):
         self.tarea_en_ejecucion = busy
         if busy: self.barra_progreso.show(); self.lbl_estado_progreso.setText("Iniciando..."); self.setCursor(Qt.WaitCursor)
         else: self.barra_progreso.hide(); self.lbl_estado_progreso.setText("Listo"); self.barra_progreso.setValue(0); self.setCursor(Qt.ArrowCursor)
+        # Un recálculo incremental que llegó durante la tarea se lanza al liberarse la UI
+        if not busy: QTimer.singleShot(0, self._iniciar_recalculo_pendiente)
     @Slot(str)
     def on_progress_update(self, message: str): self.lbl_estado_progreso.setText(message)
+    @Slot(str)
+    def on_progreso_mantenimiento(self, message: str):
+        # No pisa el progreso de una tarea principal en curso
+        if not self.tarea_en_ejecucion: self.lbl_estado_progreso.setText(message)
     def _configurar_bandeja(self):
         self.tray_icon = QSystemTrayIcon(QIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_ComputerIcon)), self)
         menu = QMenu(); menu.addAction("Restaurar").triggered.connect(self.showNormal); menu.addAction("Salir").triggered.connect(self.forzar_salida)
         self.tray_icon.setContextMenu(menu); self.tray_icon.show(); self.tray_icon.activated.connect(lambda r: self.showNormal() if r == QSystemTrayIcon.DoubleClick else None)
-    def forzar_salida(self): self.forzar_cierre = True; self.close(); QApplication.instance().quit()
+    def forzar_salida(self):
+        self.forzar_cierre = True; self.servicio_mantenimiento.detener()
+        metricas_pool = obtener_metricas_pool()
+        if metricas_pool: logger.info(f"Pool de conexiones al salir: {metricas_pool}")
+        self.close(); QApplication.instance().quit()
     def closeEvent(self, event):
         if self.forzar_cierre: event.accept()
         else: event.ignore(); self.hide(); InfoBar.info("Minimizado", "La aplicación sigue en la bandeja.", parent=self)
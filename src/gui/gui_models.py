@@ -1,10 +1,221 @@
 # -*- coding: utf-8 -*-
 from datetime import date, datetime
-from PySide6.QtCore import QSortFilterProxyModel, Qt, QModelIndex
+from PySide6.QtCore import QSortFilterProxyModel, QAbstractTableModel, Qt, QModelIndex
+from PySide6.QtGui import QBrush, QColor
+
+from src.db.db_proyecciones import LicitacionResumen
+
+# Definición global de encabezados
+COLUMN_HEADERS = [
+    "Score", "Código", "Nombre", "Organismo", "Estado", 
+    "Fecha Pub.", "Fecha Cierre", "Cierre 2°", "Monto", "Nota"
+]
+
+# Fondos de la columna Score según tramo de puntaje
+BRUSH_SCORE_ALTO = QBrush(QColor("#dff6dd"))
+BRUSH_SCORE_MEDIO = QBrush(QColor("#e6f7ff"))
+BRUSH_SCORE_CERO = QBrush(QColor("#ffffff"))
+BRUSH_SCORE_NEGATIVO = QBrush(QColor("#ffe6e6"))
+
+
+class FilaLicitacion:
+    """
+    Registro compacto de una fila de las pestañas de licitaciones (a partir de un LicitacionResumen).
+    Guarda solo los valores crudos; los textos visibles se calculan en ModeloLicitaciones.data().
+    Las claves de filtrado (texto en minúsculas, monto y fechas como date) se calculan una vez al cargar.
+    """
+    __slots__ = (
+        "ca_id", "puntaje", "detalle", "codigo", "nombre", "organismo",
+        "estado", "estado_convocatoria", "fecha_pub", "fecha_cierre",
+        "fecha_cierre_2", "monto", "nota",
+        "clave_busqueda", "monto_valor", "dia_pub", "dia_cierre",
+    )
+
+    def __init__(self, data: LicitacionResumen):
+        self.ca_id = data.ca_id
+        self.puntaje = data.puntuacion_final or 0
+        detalle = data.puntaje_detalle
+        self.detalle = detalle if detalle and isinstance(detalle, list) else None
+        self.codigo = data.codigo_ca or ''
+        self.nombre = data.nombre or 'Sin Nombre'
+        self.organismo = data.organismo_nombre or 'N/A'
+        self.estado = data.estado_ca_texto or 'N/A'
+        self.estado_convocatoria = data.estado_convocatoria
+        self.fecha_pub = data.fecha_publicacion
+        self.fecha_cierre = data.fecha_cierre
+        self.fecha_cierre_2 = data.fecha_cierre_segundo_llamado
+        self.monto = data.monto_clp
+        self.nota = data.notas or ""
+
+        self.clave_busqueda = f"{self.nombre}\n{self.codigo}\n{self.organismo}".lower()
+        self.monto_valor = float(self.monto) if self.monto is not None else 0
+        self.dia_pub = _como_fecha(self.fecha_pub)
+        self.dia_cierre = _como_fecha(self.fecha_cierre)
+
+
+def _como_fecha(valor):
+    return valor.date() if isinstance(valor, datetime) else valor
+
+
+class ModeloLicitaciones(QAbstractTableModel):
+    """
+    Modelo virtual de las pestañas de licitaciones (Candidatas, Seguimiento, Ofertadas).
+    Expone los mismos roles que antes entregaban los QStandardItem:
+    UserRole+1 en Score = ca_id, UserRole = valor crudo de la columna, UserRole+2 en Estado = texto.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._filas = []
+        # Se incrementa con cada cambio de filas; el proxy lo usa para invalidar su índice
+        self.version = 0
+
+        # Paginación por keyset: 'solicitar_pagina(ultima)' pide (en segundo plano) las filas
+        # posteriores a la última recibida; la respuesta vuelve por agregar_pagina()
+        self._solicitar_pagina = None
+        self._tamano_pagina = 0
+        self._ultima_recibida = None
+        self._hay_mas = False
+        self._pidiendo_pagina = False
+
+    @property
+    def filas(self):
+        return self._filas
+
+    def rowCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(self._filas)
+    def columnCount(self, parent=QModelIndex()): return 0 if parent.isValid() else len(COLUMN_HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(COLUMN_HEADERS):
+            return COLUMN_HEADERS[section]
+        return None
+
+    def establecer_datos(self, lista_datos, solicitar_pagina=None, tamano_pagina=0):
+        """
+        Reemplaza el conjunto completo (lista de LicitacionResumen) con un único reset del modelo.
+        Con 'solicitar_pagina' la lista es la primera página y el resto se pide desde fetchMore().
+        """
+        self.beginResetModel()
+        self._filas = [FilaLicitacion(data) for data in lista_datos]
+        self.version += 1
+        self._solicitar_pagina = solicitar_pagina
+        self._tamano_pagina = tamano_pagina
+        self._ultima_recibida = None
+        self._registrar_pagina(lista_datos)
+        self.endResetModel()
+
+    def parchar(self, ca_ids, lista_datos):
+        """Quita las filas de 'ca_ids' y agrega las de 'lista_datos' (las que siguen en la pestaña)."""
+        ca_ids = set(ca_ids)
+        for fila in reversed([i for i, f in enumerate(self._filas) if f.ca_id in ca_ids]):
+            self.beginRemoveRows(QModelIndex(), fila, fila)
+            del self._filas[fila]
+            self.version += 1
+            self.endRemoveRows()
+
+        self._agregar_filas(lista_datos)
+
+    def _agregar_filas(self, lista_datos):
+        nuevas = [FilaLicitacion(data) for data in lista_datos]
+        if nuevas:
+            inicio = len(self._filas)
+            self.beginInsertRows(QModelIndex(), inicio, inicio + len(nuevas) - 1)
+            self._filas.extend(nuevas)
+            self.version += 1
+            self.endInsertRows()
+
+    # --- PAGINACIÓN ---
+
+    def _registrar_pagina(self, pagina):
+        if pagina:
+            self._ultima_recibida = pagina[-1]
+        self._hay_mas = self._solicitar_pagina is not None and self._tamano_pagina > 0 and len(pagina) >= self._tamano_pagina
+        self._pidiendo_pagina = False
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._hay_mas and not self._pidiendo_pagina
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent): return
+        self._pidiendo_pagina = True
+        self._solicitar_pagina(self._ultima_recibida)
+
+    def agregar_pagina(self, despues_de, pagina):
+        """
+        Recibe la página pedida tras 'despues_de'. Se descarta si el modelo se recargó entretanto;
+        las filas que ya llegaron por un refresco parcial no se duplican.
+        """
+        if not self._pidiendo_pagina or despues_de is not self._ultima_recibida:
+            return
+        presentes = {f.ca_id for f in self._filas}
+        self._agregar_filas([data for data in pagina if data.ca_id not in presentes])
+        self._registrar_pagina(pagina)
+
+    def cancelar_solicitud_pagina(self):
+        """Libera la solicitud en curso (p. ej. si la consulta falló) para poder reintentar."""
+        self._pidiendo_pagina = False
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid(): return None
+
+        fila = self._filas[index.row()]
+        col = index.column()
+
+        if role == Qt.DisplayRole:
+            if col == 0: return fila.puntaje
+            if col == 1: return fila.codigo
+            if col == 2: return fila.nombre
+            if col == 3: return fila.organismo
+            if col == 4: return fila.estado
+            if col == 5: return fila.fecha_pub.strftime("%d-%m") if fila.fecha_pub else ""
+            if col == 6: return fila.fecha_cierre.strftime("%d-%m %H:%M") if fila.fecha_cierre else ""
+            if col == 7: return fila.fecha_cierre_2.strftime("%d-%m %H:%M") if fila.fecha_cierre_2 else "-"
+            if col == 8:
+                if fila.monto is None: return "N/A"
+                return f"${int(float(fila.monto)):,}".replace(",", ".")
+            if col == 9: return "📝" if fila.nota.strip() else ""
+
+        elif role == Qt.UserRole:
+            if col == 1: return fila.codigo
+            if col == 2: return fila.nombre
+            if col == 3: return fila.organismo
+            if col == 4: return fila.estado_convocatoria
+            if col == 5: return fila.fecha_pub
+            if col == 6: return fila.fecha_cierre
+            if col == 7: return fila.fecha_cierre_2
+            if col == 8: return fila.monto_valor
+            if col == 9: return fila.nota
+
+        elif role == Qt.UserRole + 1:
+            if col == 0: return fila.ca_id
+
+        elif role == Qt.UserRole + 2:
+            if col == 4: return fila.estado
+
+        elif role == Qt.ToolTipRole:
+            if col == 0: return "\n".join(str(d) for d in fila.detalle) if fila.detalle else None
+            if col in (1, 2, 3): return self.data(index, Qt.DisplayRole)
+            if col == 9: return f"Nota: {fila.nota}" if fila.nota else None
+
+        elif role == Qt.BackgroundRole:
+            if col == 0:
+                score = fila.puntaje
+                if score >= 500: return BRUSH_SCORE_ALTO
+                if score >= 10: return BRUSH_SCORE_MEDIO
+                if score == 0: return BRUSH_SCORE_CERO
+                if score < 0: return BRUSH_SCORE_NEGATIVO
+
+        elif role == Qt.TextAlignmentRole:
+            if col == 9: return int(Qt.AlignCenter)
+
+        return None
+
 
 class ModeloProxyLicitacion(QSortFilterProxyModel):
     """
     Modelo Intermediario (Proxy) para filtrado y ordenamiento avanzado.
+    Evalúa los filtros una vez por cambio (de filtros o de datos) sobre las claves precalculadas
+    de FilaLicitacion y guarda el resultado en un mapa de filas aceptadas.
     """
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -20,15 +231,9 @@ class ModeloProxyLicitacion(QSortFilterProxyModel):
         self.fecha_cierre_desde = None
         self.fecha_cierre_hasta = None
 
-        # --- ÍNDICES DE COLUMNAS ACTUALIZADOS ---
-        self.IDX_SCORE = 0
-        self.IDX_CODIGO = 1 # NUEVO
-        self.IDX_NOMBRE = 2
-        self.IDX_ORGANISMO = 3
-        self.IDX_ESTADO = 4
-        self.IDX_PUB = 5
-        self.IDX_CIERRE = 6
-        self.IDX_MONTO = 8
+        # Mapa de aceptación: un byte por fila del modelo fuente, válido para 'version_aceptadas'
+        self.aceptadas = bytearray()
+        self.version_aceptadas = None
 
     def establecer_parametros_filtro(self, texto, min_monto, mostrar_ceros, solo_2do, estados, p_desde, p_hasta, c_desde, c_hasta):
         self.texto_filtro = texto.lower()
@@ -41,72 +246,44 @@ class ModeloProxyLicitacion(QSortFilterProxyModel):
         self.fecha_cierre_desde = c_desde
         self.fecha_cierre_hasta = c_hasta
         
+        self.version_aceptadas = None
         self.invalidateFilter() 
 
     def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
         model = self.sourceModel()
         if not model: return True
 
+        if self.version_aceptadas != model.version:
+            self.aceptadas = bytearray(self.fila_aceptada(fila) for fila in model.filas)
+            self.version_aceptadas = model.version
+        return bool(self.aceptadas[source_row])
+
+    def fila_aceptada(self, fila: FilaLicitacion) -> bool:
         # 1. Filtro de Puntaje Cero
-        if not self.mostrar_ceros:
-            idx_score = model.index(source_row, self.IDX_SCORE, source_parent)
-            try:
-                val_score = int(model.data(idx_score, Qt.DisplayRole) or 0)
-                if val_score == 0: return False
-            except: pass
+        if not self.mostrar_ceros and not fila.puntaje: return False
 
         # 2. Filtro de Texto (Búsqueda en Código, Nombre y Organismo)
-        if self.texto_filtro:
-            idx_nombre = model.index(source_row, self.IDX_NOMBRE, source_parent)
-            idx_codigo = model.index(source_row, self.IDX_CODIGO, source_parent)
-            idx_org = model.index(source_row, self.IDX_ORGANISMO, source_parent)
-            
-            txt_nom = str(model.data(idx_nombre, Qt.UserRole) or "").lower()
-            txt_cod = str(model.data(idx_codigo, Qt.UserRole) or "").lower()
-            txt_org = str(model.data(idx_org, Qt.UserRole) or "").lower()
-            
-            if (self.texto_filtro not in txt_nom and 
-                self.texto_filtro not in txt_cod and 
-                self.texto_filtro not in txt_org):
-                return False
+        if self.texto_filtro and self.texto_filtro not in fila.clave_busqueda: return False
 
         # 3. Filtro de Estados
-        idx_estado = model.index(source_row, self.IDX_ESTADO, source_parent)
-        if self.estados_seleccionados:
-            estado_fila = model.data(idx_estado, Qt.UserRole + 2)
-            if estado_fila not in self.estados_seleccionados: return False
+        if self.estados_seleccionados and fila.estado not in self.estados_seleccionados: return False
 
         # 4. Filtro Segundo Llamado
-        if self.solo_segundo_llamado:
-            estado_id = int(model.data(idx_estado, Qt.UserRole) or 0)
-            if estado_id != 2: return False
+        if self.solo_segundo_llamado and (fila.estado_convocatoria or 0) != 2: return False
 
         # 5. Filtro de Monto
-        if self.monto_minimo > 0:
-            idx_monto = model.index(source_row, self.IDX_MONTO, source_parent)
-            try:
-                val_monto = float(model.data(idx_monto, Qt.UserRole) or 0)
-                if val_monto < self.monto_minimo: return False
-            except: return False
+        if self.monto_minimo > 0 and fila.monto_valor < self.monto_minimo: return False
 
         # 6. Filtro Fecha Publicación
         if self.fecha_pub_desde or self.fecha_pub_hasta:
-            idx_pub = model.index(source_row, self.IDX_PUB, source_parent)
-            fecha_fila = model.data(idx_pub, Qt.UserRole) 
-            if not fecha_fila: return False
-            if isinstance(fecha_fila, datetime): fecha_fila = fecha_fila.date()
-            
-            if self.fecha_pub_desde and fecha_fila < self.fecha_pub_desde: return False
-            if self.fecha_pub_hasta and fecha_fila > self.fecha_pub_hasta: return False
+            if not fila.dia_pub: return False
+            if self.fecha_pub_desde and fila.dia_pub < self.fecha_pub_desde: return False
+            if self.fecha_pub_hasta and fila.dia_pub > self.fecha_pub_hasta: return False
 
         # 7. Filtro Fecha Cierre
         if self.fecha_cierre_desde or self.fecha_cierre_hasta:
-            idx_cierre = model.index(source_row, self.IDX_CIERRE, source_parent)
-            fecha_fila_dt = model.data(idx_cierre, Qt.UserRole)
-            if not fecha_fila_dt: return False
-            fecha_solo_date = fecha_fila_dt.date() if isinstance(fecha_fila_dt, datetime) else fecha_fila_dt
-
-            if self.fecha_cierre_desde and fecha_solo_date < self.fecha_cierre_desde: return False
-            if self.fecha_cierre_hasta and fecha_solo_date > self.fecha_cierre_hasta: return False
+            if not fila.dia_cierre: return False
+            if self.fecha_cierre_desde and fila.dia_cierre < self.fecha_cierre_desde: return False
+            if self.fecha_cierre_hasta and fila.dia_cierre > self.fecha_cierre_hasta: return False
 
-        return True
\ No newline at end of file
+        return True
@@ -17,6 +17,7 @@ from qfluentwidgets import (
 from sqlalchemy import update
 from src.utils.logger import configurar_logger
 from src.db.db_models import TipoReglaOrganismo, CaPalabraClave
+from config.config import LISTADO_PARALELO
 
 logger = configurar_logger(__name__)
 
@@ -236,6 +237,7 @@ class WidgetHerramientas(QWidget):
     senal_iniciar_scraping = Signal(dict)
     senal_iniciar_exportacion = Signal(list)
     senal_iniciar_recalculo = Signal()
+    senal_iniciar_recalculo_incremental = Signal(dict)
     senal_configuracion_cambiada = Signal()
     senal_config_autopiloto_cambiada = Signal()
 
@@ -244,6 +246,8 @@ class WidgetHerramientas(QWidget):
         self.setObjectName("widget_herramientas")
         self.db_service = db_service
         self.settings_manager = settings_manager
+        # Delta de reglas editadas desde el último recálculo (para el recálculo incremental)
+        self.cambios_reglas = {"terminos": set(), "organismo_ids": set()}
         
         layout = QVBoxLayout(self); layout.setContentsMargins(20,20,20,20); layout.setSpacing(15)
         layout.addWidget(TitleLabel("Herramientas", self))
@@ -271,12 +275,13 @@ class WidgetHerramientas(QWidget):
         v2 = QVBoxLayout(); v2.addWidget(BodyLabel("Hasta", w)); self.dTo = CalendarPicker(w); self.dTo.setDate(QDate.currentDate()); v2.addWidget(self.dTo)
         hD.addLayout(v1); hD.addSpacing(20); hD.addLayout(v2); hD.addStretch(); l.addLayout(hD)
         hP = QHBoxLayout(); hP.addWidget(BodyLabel("Máx Páginas:", w)); self.sPages = SpinBox(); self.sPages.setValue(0); hP.addWidget(self.sPages); hP.addStretch(); l.addLayout(hP)
+        self.chkParalelo = CheckBox("Descarga paralela de páginas", w); self.chkParalelo.setChecked(LISTADO_PARALELO); l.addWidget(self.chkParalelo)
         btn = PrimaryPushButton("Iniciar Scraping", w); btn.clicked.connect(self._ejecutar_scraping); l.addWidget(btn); l.addStretch()
         return w
     def _ejecutar_scraping(self):
         try: d_from = self.dFrom.date.toPython(); d_to = self.dTo.date.toPython()
         except: d_from = self.dFrom.getDate().toPython(); d_to = self.dTo.getDate().toPython()
-        self.senal_iniciar_scraping.emit({"mode": "to_db", "date_from": d_from, "date_to": d_to, "max_paginas": self.sPages.value()})
+        self.senal_iniciar_scraping.emit({"mode": "to_db", "date_from": d_from, "date_to": d_to, "max_paginas": self.sPages.value(), "listado_paralelo": self.chkParalelo.isChecked()})
 
     def _pag_exportar(self):
         w = QWidget(); l = QVBoxLayout(w); l.setSpacing(20)
@@ -471,7 +476,7 @@ class WidgetHerramientas(QWidget):
         layout.addWidget(self.stack_conf)
         
         btnRecalc = PrimaryPushButton("Guardar y Recalcular")
-        btnRecalc.clicked.connect(lambda: [self.senal_configuracion_cambiada.emit(), self.senal_iniciar_recalculo.emit()])
+        btnRecalc.clicked.connect(self._guardar_y_recalcular)
         layout.addWidget(btnRecalc)
 
         self.pivot_conf.currentItemChanged.connect(lambda k: self.stack_conf.setCurrentIndex(0 if k == "orgs" else 1))
@@ -479,6 +484,18 @@ class WidgetHerramientas(QWidget):
         self.cargar_datos_config()
         return w
 
+    def _guardar_y_recalcular(self):
+        """Recalcula solo lo afectado por las reglas editadas; sin cambios registrados, recálculo total."""
+        self.senal_configuracion_cambiada.emit()
+        if self.cambios_reglas["terminos"] or self.cambios_reglas["organismo_ids"]:
+            self.senal_iniciar_recalculo_incremental.emit({
+                "terminos": sorted(self.cambios_reglas["terminos"]),
+                "organismo_ids": sorted(self.cambios_reglas["organismo_ids"]),
+            })
+        else:
+            self.senal_iniciar_recalculo.emit()
+        self.cambios_reglas = {"terminos": set(), "organismo_ids": set()}
+
     def cargar_datos_config(self):
         """Recarga la lista de organismos y keywords desde la BD."""
         orgs = self.db_service.obtener_todos_organismos()
@@ -526,6 +543,7 @@ class WidgetHerramientas(QWidget):
     def _set_org_regla(self, oid, tipo, pts=None):
         if tipo is None: self.db_service.eliminar_regla_organismo(oid)
         else: self.db_service.establecer_regla_organismo(oid, tipo, pts)
+        self.cambios_reglas["organismo_ids"].add(oid)
         self.cargar_datos_config()
 
     def _accion_masiva_tipo(self, tipo):
@@ -552,6 +570,7 @@ class WidgetHerramientas(QWidget):
                 
                 self.db_service.establecer_regla_organismo(oid, tipo, pts)
             
+        self.cambios_reglas["organismo_ids"].update(ids)
         self.cargar_datos_config()
         InfoBar.success("Proceso completado", f"Se actualizaron {len(ids)} organismos.", parent=self.window())
 
@@ -560,6 +579,7 @@ class WidgetHerramientas(QWidget):
         txt = self.txtNewKw.text().strip()
         if txt:
             self.db_service.agregar_palabra_clave(txt, "titulo_pos", 5)
+            self.cambios_reglas["terminos"].add(txt)
             self.txtNewKw.clear()
             self.cargar_datos_config()
 
@@ -568,6 +588,8 @@ class WidgetHerramientas(QWidget):
         kw = self.modeloKws.get_keyword_at(real_idx.row())
         d = DialogoEditarKeyword(kw, self)
         if d.exec():
+            # El texto antiguo y el nuevo delimitan las licitaciones afectadas
+            self.cambios_reglas["terminos"].add(kw.keyword)
             if d.solicita_borrar:
                 self.db_service.eliminar_palabra_clave(kw.keyword_id)
             else:
@@ -575,4 +597,5 @@ class WidgetHerramientas(QWidget):
                 with self.db_service.session_factory() as s:
                     s.execute(update(CaPalabraClave).where(CaPalabraClave.keyword_id==kw.keyword_id).values(keyword=n, puntos_nombre=a, puntos_descripcion=b, puntos_productos=c))
                     s.commit()
+                self.cambios_reglas["terminos"].add(n)
             self.cargar_datos_config()
\ No newline at end of file
@@ -71,4 +71,11 @@ class Trabajador(QRunnable):
             self.senales.error.emit(e)
         finally:
             self.senales.finalizado.emit()
-            logger.debug(f"Hilo finalizó tarea: {self.tarea.__name__}")
\ No newline at end of file
+            logger.debug(f"Hilo finalizó tarea: {self.tarea.__name__}")
+
+class PuenteCambiosBD(QObject):
+    """
+    Lleva las notificaciones del feed de cambios de DbService al hilo de la GUI.
+    Se emite desde el hilo del trabajador; Qt encola la señal hacia el receptor.
+    """
+    cambios = Signal(list)
@@ -105,21 +105,21 @@ class MixinMenuContextual:
         if lic and lic.codigo_ca: 
             QDesktopServices.openUrl(QUrl(f"https://buscador.mercadopublico.cl/ficha?code={lic.codigo_ca}"))
 
-    # Acciones con auto-refresh 
-    def _mover_a_favoritos(self, cid): self.start_task(self.db_service.gestionar_favorito, on_finished=self.on_load_data_thread, task_args=(cid, True))
-    def _quitar_de_favoritos(self, cid): self.start_task(self.db_service.gestionar_favorito, on_finished=self.on_load_data_thread, task_args=(cid, False))
-    def _marcar_ofertada(self, cid): self.start_task(self.db_service.gestionar_ofertada, on_finished=self.on_load_data_thread, task_args=(cid, True))
-    def _desmarcar_ofertada(self, cid): self.start_task(self.db_service.gestionar_ofertada, on_finished=self.on_load_data_thread, task_args=(cid, False))
+    # Acciones: las tablas se parchan vía el feed de cambios de DbService
+    def _mover_a_favoritos(self, cid): self.start_task(self.db_service.gestionar_favorito, task_args=(cid, True))
+    def _quitar_de_favoritos(self, cid): self.start_task(self.db_service.gestionar_favorito, task_args=(cid, False))
+    def _marcar_ofertada(self, cid): self.start_task(self.db_service.gestionar_ofertada, task_args=(cid, True))
+    def _desmarcar_ofertada(self, cid): self.start_task(self.db_service.gestionar_ofertada, task_args=(cid, False))
     
     def _ocultar_de_candidatas(self, cid, nombre):
         if QMessageBox.question(self, "Ocultar", f"¿Ocultar esta licitación?\n{nombre}", QMessageBox.Yes|QMessageBox.No) == QMessageBox.Yes:
-            self.start_task(self.db_service.ocultar_licitacion, on_finished=self.on_load_data_thread, task_args=(cid, True))
+            self.start_task(self.db_service.ocultar_licitacion, task_args=(cid, True))
 
     def _dialogo_nota(self, cid):
         text, ok = QInputDialog.getMultiLineText(self, "Nota", "Escribe una nota:")
         if ok and text is not None:
-            self.start_task(self.db_service.guardar_nota_usuario, on_finished=self.on_load_data_thread, task_args=(cid, text))
+            self.start_task(self.db_service.guardar_nota_usuario, task_args=(cid, text))
 
     def _borrar_nota(self, cid):
         if QMessageBox.question(self, "Borrar Nota", "¿Eliminar la nota asociada?", QMessageBox.Yes|QMessageBox.No) == QMessageBox.Yes:
-            self.start_task(self.db_service.guardar_nota_usuario, on_finished=self.on_load_data_thread, task_args=(cid, ""))
\ No newline at end of file
+            self.start_task(self.db_service.guardar_nota_usuario, task_args=(cid, ""))
\ No newline at end of file
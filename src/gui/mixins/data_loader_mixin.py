@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
-from PySide6.QtCore import Slot
+from PySide6.QtCore import Slot, QTimer
+from src.gui.gui_worker import PuenteCambiosBD
+from config.config import TAMANO_PAGINA_TABLAS
 from src.utils.logger import configurar_logger
 
 logger = configurar_logger(__name__)
@@ -13,16 +15,39 @@ class MixinCargaDatos:
     def on_load_data_thread(self):
         self.cargar_candidatas()
 
-    def cargar_candidatas(self):
-        # 1. Obtener umbral de configuración
+    def _obtener_umbral_candidatas(self) -> int:
         try:
             self.settings_manager.cargar_configuracion()
-            umbral = int(self.settings_manager.obtener_valor("umbral_puntaje_minimo") or 5)
+            return int(self.settings_manager.obtener_valor("umbral_puntaje_minimo") or 5)
         except:
-            umbral = 5
+            return 5
+
+    def _crear_consulta_pestana(self, nombre):
+        """
+        Fija la consulta paginable de una pestaña con sus filtros y búsqueda actuales
+        (se aplican en SQL). Queda en 'consultas_pestanas' para pedir las páginas siguientes.
+        """
+        if nombre == "candidatas":
+            ui, base = self.interfazCandidatas, self.db_service.obtener_resumen_candidatas
+            extra = {"umbral_minimo": self.umbral_candidatas}
+        elif nombre == "seguimiento":
+            ui, base, extra = self.interfazSeguimiento, self.db_service.obtener_resumen_seguimiento, {}
+        else:
+            ui, base, extra = self.interfazOfertadas, self.db_service.obtener_resumen_ofertadas, {}
+
+        filtros = dict(ui.estado_filtro)
+        texto = ui.barraBusqueda.text()
+        consulta = lambda **pagina: base(filtros=filtros, texto=texto, **extra, **pagina)
+        self.consultas_pestanas[nombre] = consulta
+        return consulta
+
+    def cargar_candidatas(self):
+        # 1. Obtener umbral de configuración
+        self.umbral_candidatas = self._obtener_umbral_candidatas()
         
-        # 2. Definir tarea
-        tarea = lambda: self.db_service.obtener_candidatas_filtradas(umbral_minimo=umbral)
+        # 2. Definir tarea (primera página; el resto se pide al hacer scroll)
+        consulta = self._crear_consulta_pestana("candidatas")
+        tarea = lambda: consulta(limite=TAMANO_PAGINA_TABLAS)
         
         self.start_task(
             task=tarea,
@@ -32,31 +57,87 @@ class MixinCargaDatos:
 
     def poblar_tab_unificada(self, data):
         logger.info(f"DATA LOADER: Cargando {len(data)} licitaciones en Candidatas.")
-        self.poblar_tabla_generica(self.modelo_tab1, data)
+        self.poblar_tabla_generica(self.modelo_tab1, data, self.consultas_pestanas["candidatas"])
         self.cargar_seguimiento()
 
     def cargar_seguimiento(self):
+        consulta = self._crear_consulta_pestana("seguimiento")
         self.start_task(
-            task=self.db_service.obtener_licitaciones_seguimiento, 
+            task=lambda: consulta(limite=TAMANO_PAGINA_TABLAS), 
             on_result=self.poblar_tab_seguimiento, 
             on_error=self.on_task_error
         )
 
     def poblar_tab_seguimiento(self, data):
-        self.poblar_tabla_generica(self.modelo_tab3, data)
+        self.poblar_tabla_generica(self.modelo_tab3, data, self.consultas_pestanas["seguimiento"])
         self.cargar_ofertadas()
 
     def cargar_ofertadas(self):
+        consulta = self._crear_consulta_pestana("ofertadas")
         self.start_task(
-            task=self.db_service.obtener_licitaciones_ofertadas, 
+            task=lambda: consulta(limite=TAMANO_PAGINA_TABLAS), 
             on_result=self.poblar_tab_ofertadas, 
             on_error=self.on_task_error
         )
 
     def poblar_tab_ofertadas(self, data):
-        self.poblar_tabla_generica(self.modelo_tab4, data)
+        self.poblar_tabla_generica(self.modelo_tab4, data, self.consultas_pestanas["ofertadas"])
+
+    def recargar_pestana_filtrada(self, nombre, modelo):
+        """Vuelve a pedir la primera página de una pestaña tras un cambio de filtros o búsqueda."""
+        if not hasattr(self, 'umbral_candidatas'):
+            return  # La carga inicial aún no corre; usará los filtros vigentes
+        consulta = self._crear_consulta_pestana(nombre)
+
+        def poblar(data):
+            # Una respuesta de filtros ya reemplazados (tecleo rápido) se descarta
+            if self.consultas_pestanas.get(nombre) is consulta:
+                self.poblar_tabla_generica(modelo, data, consulta)
+
+        self.start_task(
+            task=lambda: consulta(limite=TAMANO_PAGINA_TABLAS),
+            on_result=poblar,
+            on_error=self.on_task_error_segundo_plano,
+            marcar_ocupado=False
+        )
         
     @Slot()
     def on_auto_task_finished(self):
         logger.info("Tarea automática finalizada. Recargando datos visuales...")
-        self.on_load_data_thread()
\ No newline at end of file
+        self.on_load_data_thread()
+
+    # --- REFRESCO PARCIAL (FEED DE CAMBIOS) ---
+
+    def conectar_feed_cambios(self):
+        """Suscribe la GUI a los cambios de DbService para parchar solo las filas afectadas."""
+        self.ca_ids_pendientes = set()
+        self.consultas_pestanas = {}
+        self.puente_cambios = PuenteCambiosBD(self)
+        self.puente_cambios.cambios.connect(self.on_licitaciones_cambiadas)
+        self.db_service.suscribir_cambios(self.puente_cambios.cambios.emit)
+
+    @Slot(list)
+    def on_licitaciones_cambiadas(self, ca_ids):
+        # Agrupa ráfagas de cambios (p. ej. seguimiento automático del ETL) en un solo refresco
+        if not self.ca_ids_pendientes:
+            QTimer.singleShot(0, self.aplicar_cambios_pendientes)
+        self.ca_ids_pendientes.update(ca_ids)
+
+    def aplicar_cambios_pendientes(self):
+        ca_ids, self.ca_ids_pendientes = self.ca_ids_pendientes, set()
+        if not ca_ids:
+            return
+        umbral = getattr(self, 'umbral_candidatas', None) or self._obtener_umbral_candidatas()
+        self.start_task(
+            task=self.db_service.obtener_pestanas_por_ids,
+            on_result=lambda pestanas: self.parchar_pestanas(ca_ids, pestanas),
+            on_error=self.on_task_error_segundo_plano,
+            task_args=(ca_ids, umbral),
+            marcar_ocupado=False
+        )
+
+    def parchar_pestanas(self, ca_ids, pestanas):
+        logger.info(f"DATA LOADER: Refrescando {len(ca_ids)} licitaciones modificadas.")
+        self.parchar_tabla(self.modelo_tab1, ca_ids, pestanas["candidatas"])
+        self.parchar_tabla(self.modelo_tab3, ca_ids, pestanas["seguimiento"])
+        self.parchar_tabla(self.modelo_tab4, ca_ids, pestanas["ofertadas"])
@@ -1,13 +1,7 @@
 # -*- coding: utf-8 -*-
-from PySide6.QtGui import QStandardItem, QBrush, QColor
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QTableView, QHeaderView, QAbstractItemView
-
-# Definición global de encabezados (Se agregó "Código")
-COLUMN_HEADERS = [
-    "Score", "Código", "Nombre", "Organismo", "Estado", 
-    "Fecha Pub.", "Fecha Cierre", "Cierre 2°", "Monto", "Nota"
-]
+from config.config import TAMANO_PAGINA_TABLAS
 
 class MixinGestorTabla:
     def crear_tabla_view(self, model, object_name):
@@ -15,8 +9,6 @@ class MixinGestorTabla:
         table.setObjectName(object_name)
         table.setModel(model)
         
-        model.setHorizontalHeaderLabels(COLUMN_HEADERS)
-        
         # Estilo y comportamiento
         table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         table.setSelectionBehavior(QAbstractItemView.SelectRows)
@@ -51,97 +43,33 @@ class MixinGestorTabla:
 
         return table
 
-    def poblar_tabla_generica(self, model, lista_datos):
-        """Llena un QStandardItemModel con objetos CaLicitacion."""
-        model.removeRows(0, model.rowCount())
-        
-        for data in lista_datos:
-            # 0. Score
-            score = getattr(data, 'puntuacion_final', 0)
-            item_score = QStandardItem(str(score))
-            item_score.setData(score, Qt.DisplayRole)
-            item_score.setData(getattr(data, 'ca_id', None), Qt.UserRole + 1)
-            
-            detalles = getattr(data, 'puntaje_detalle', [])
-            if detalles and isinstance(detalles, list):
-                item_score.setToolTip("\n".join(str(d) for d in detalles))
-            
-            bg_color = None
-            if score >= 500: bg_color = QColor("#dff6dd") 
-            elif score >= 10: bg_color = QColor("#e6f7ff") 
-            elif score == 0: bg_color = QColor("#ffffff") 
-            elif score < 0: bg_color = QColor("#ffe6e6") 
-            
-            if bg_color: item_score.setBackground(QBrush(bg_color))
-
-            # 1. Código (NUEVA)
-            codigo = getattr(data, 'codigo_ca', '') or ''
-            item_codigo = QStandardItem(codigo)
-            item_codigo.setToolTip(codigo)
-            item_codigo.setData(codigo, Qt.UserRole)
-
-            # 2. Nombre
-            nombre = getattr(data, 'nombre', 'Sin Nombre') or 'Sin Nombre'
-            item_nombre = QStandardItem(nombre)
-            item_nombre.setToolTip(nombre)
-            item_nombre.setData(nombre, Qt.UserRole)
-
-            # 3. Organismo
-            org_obj = getattr(data, 'organismo', None)
-            org_nombre = org_obj.nombre if org_obj else 'N/A'
-            item_org = QStandardItem(org_nombre)
-            item_org.setToolTip(org_nombre)
-            item_org.setData(org_nombre, Qt.UserRole) 
-
-            # 4. Estado
-            estado_txt = getattr(data, 'estado_ca_texto', 'N/A') or 'N/A'
-            item_estado = QStandardItem(estado_txt)
-            item_estado.setData(getattr(data, 'estado_convocatoria', 0), Qt.UserRole)
-            item_estado.setData(estado_txt, Qt.UserRole + 2)
-
-            # 5. Fecha Pub
-            f_pub = getattr(data, 'fecha_publicacion', None)
-            f_pub_str = f_pub.strftime("%d-%m") if f_pub else ""
-            item_fpub = QStandardItem(f_pub_str)
-            item_fpub.setData(f_pub, Qt.UserRole)
-
-            # 6. Fecha Cierre
-            f_cierre = getattr(data, 'fecha_cierre', None)
-            f_cierre_str = f_cierre.strftime("%d-%m %H:%M") if f_cierre else ""
-            item_fcierre = QStandardItem(f_cierre_str)
-            item_fcierre.setData(f_cierre, Qt.UserRole)
-
-            # 7. Fecha Cierre 2° Llamado
-            f_cierre2 = getattr(data, 'fecha_cierre_segundo_llamado', None)
-            f_cierre2_str = f_cierre2.strftime("%d-%m %H:%M") if f_cierre2 else "-"
-            item_fcierre2 = QStandardItem(f_cierre2_str)
-            item_fcierre2.setData(f_cierre2, Qt.UserRole)
+    def poblar_tabla_generica(self, model, lista_datos, consulta_pagina=None):
+        """
+        Carga objetos LicitacionResumen en un ModeloLicitaciones (un solo reset del modelo).
+        Con 'consulta_pagina(limite=, despues_de=)' la lista es la primera página y el modelo
+        pide las siguientes al hacer scroll.
+        """
+        solicitar_pagina = self._crear_solicitud_pagina(model, consulta_pagina) if consulta_pagina else None
+        model.establecer_datos(lista_datos, solicitar_pagina, TAMANO_PAGINA_TABLAS)
 
-            # 8. Monto
-            monto = getattr(data, 'monto_clp', 0)
-            monto_val = float(monto) if monto is not None else 0
-            monto_str = f"${int(monto_val):,}".replace(",", ".") if monto is not None else "N/A"
-            item_monto = QStandardItem(monto_str)
-            item_monto.setData(monto_val, Qt.UserRole)
+    def _crear_solicitud_pagina(self, model, consulta_pagina):
+        def solicitar(ultima):
+            def on_error(e):
+                model.cancelar_solicitud_pagina()
+                self.on_task_error_segundo_plano(e)
 
-            # 9. Nota
-            nota_texto = ""
-            seguimiento = getattr(data, 'seguimiento', None)
-            if seguimiento:
-                nota_texto = getattr(seguimiento, 'notas', "") or ""
-            
-            display_nota = "📝" if nota_texto.strip() else ""
-            item_nota = QStandardItem(display_nota)
-            item_nota.setTextAlignment(Qt.AlignCenter)
-            item_nota.setData(nota_texto, Qt.UserRole) 
-            
-            if nota_texto: 
-                item_nota.setToolTip(f"Nota: {nota_texto}")
+            self.start_task(
+                task=consulta_pagina,
+                on_result=lambda pagina: model.agregar_pagina(ultima, pagina),
+                on_error=on_error,
+                task_kwargs={"limite": TAMANO_PAGINA_TABLAS, "despues_de": ultima},
+                marcar_ocupado=False
+            )
+        return solicitar
 
-            # Fila final
-            row_items = [
-                item_score, item_codigo, item_nombre, item_org, item_estado, 
-                item_fpub, item_fcierre, item_fcierre2, item_monto, item_nota
-            ]
-            
-            model.appendRow(row_items)
\ No newline at end of file
+    def parchar_tabla(self, model, ca_ids, lista_datos):
+        """
+        Refresca solo las filas de 'ca_ids': quita las existentes y agrega las de 'lista_datos'
+        (las licitaciones que siguen perteneciendo a la pestaña).
+        """
+        model.parchar(ca_ids, lista_datos)
@@ -21,6 +21,7 @@ class MixinHilos:
         on_progress_percent=None,
         task_args=(),
         task_kwargs=None,
+        marcar_ocupado=True,
     ):
         """
         Lanza una tarea asíncrona.
@@ -32,10 +33,13 @@ class MixinHilos:
             on_finished: Función a llamar siempre al finalizar.
             on_progress: Función para recibir actualizaciones de texto.
             on_progress_percent: Función para recibir actualizaciones de barra de carga (0-100).
+            marcar_ocupado: Si es False la tarea no toca el estado 'ocupado' de la UI
+                (refrescos breves que pueden correr junto a otra tarea); sus errores
+                deben ir a 'on_task_error_segundo_plano'.
         """
         if task_kwargs is None: task_kwargs = {}
 
-        if hasattr(self, 'set_ui_busy'):
+        if marcar_ocupado and hasattr(self, 'set_ui_busy'):
             self.set_ui_busy(True)
 
         necesita_texto = bool(on_progress)
@@ -52,11 +56,14 @@ class MixinHilos:
             
             if on_error: 
                 trabajador.senales.error.connect(on_error)
-            else: 
+            elif marcar_ocupado: 
                 trabajador.senales.error.connect(self.on_task_error)
+            else:
+                trabajador.senales.error.connect(self.on_task_error_segundo_plano)
             
             # Limpieza y UI
-            trabajador.senales.finalizado.connect(self.on_task_finished_common)
+            if marcar_ocupado:
+                trabajador.senales.finalizado.connect(self.on_task_finished_common)
             trabajador.senales.finalizado.connect(lambda: self._limpiar_trabajador(trabajador))
             if on_finished: 
                 trabajador.senales.finalizado.connect(on_finished)
@@ -76,7 +83,7 @@ class MixinHilos:
             self.trabajadores_activos.append(trabajador)
             
         except Exception as e:
-            if hasattr(self, 'set_ui_busy'): self.set_ui_busy(False)
+            if marcar_ocupado and hasattr(self, 'set_ui_busy'): self.set_ui_busy(False)
             logger.critical(f"Error al iniciar Trabajador: {e}")
             if on_error: on_error(e)
 
@@ -106,4 +113,10 @@ class MixinHilos:
     def on_task_error(self, error):
         if hasattr(self, 'set_ui_busy'): self.set_ui_busy(False)
         self.ultimo_error = error
-        logger.error(f"Error no manejado en tarea: {error}")
\ No newline at end of file
+        logger.error(f"Error no manejado en tarea: {error}")
+
+    @Slot(object)
+    def on_task_error_segundo_plano(self, error):
+        # Tareas con marcar_ocupado=False: no libera la UI de una tarea principal en curso
+        self.ultimo_error = error
+        logger.error(f"Error en tarea de segundo plano: {error}")
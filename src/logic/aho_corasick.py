@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Autómata Aho–Corasick.
+
+Busca simultáneamente todas las palabras clave dentro de un texto en una sola
+pasada (tiempo lineal en el largo del texto más la cantidad de coincidencias),
+en lugar de recorrer el texto una vez por cada palabra clave.
+"""
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class AutomataAhoCorasick:
+    """
+    Autómata compilado a partir de una lista de patrones.
+    Los patrones se identifican por su índice en la lista original.
+    """
+
+    def __init__(self, patrones: Iterable[str]):
+        self.patrones: List[str] = list(patrones)
+        self._largos: List[int] = [len(p) for p in self.patrones]
+
+        # Nodo 0 = raíz. Cada nodo: transiciones {caracter: nodo}, enlace de fallo y salidas.
+        self._transiciones: List[Dict[str, int]] = [{}]
+        self._salidas: List[List[int]] = [[]]
+
+        # 1. Trie de patrones
+        for indice, patron in enumerate(self.patrones):
+            if not patron:
+                continue
+            nodo = 0
+            for caracter in patron:
+                siguiente = self._transiciones[nodo].get(caracter)
+                if siguiente is None:
+                    siguiente = len(self._transiciones)
+                    self._transiciones.append({})
+                    self._salidas.append([])
+                    self._transiciones[nodo][caracter] = siguiente
+                nodo = siguiente
+            self._salidas[nodo].append(indice)
+
+        # 2. Enlaces de fallo (recorrido en anchura)
+        self._fallos: List[int] = [0] * len(self._transiciones)
+        cola = deque(self._transiciones[0].values())
+        while cola:
+            nodo = cola.popleft()
+            for caracter, hijo in self._transiciones[nodo].items():
+                cola.append(hijo)
+                fallo = self._fallos[nodo]
+                while fallo and caracter not in self._transiciones[fallo]:
+                    fallo = self._fallos[fallo]
+                destino = self._transiciones[fallo].get(caracter, 0)
+                self._fallos[hijo] = destino if destino != hijo else 0
+                # Las salidas del sufijo más largo también terminan en este nodo
+                self._salidas[hijo] = self._salidas[hijo] + self._salidas[self._fallos[hijo]]
+
+    def buscar(self, texto: str) -> Iterator[Tuple[int, int]]:
+        """Entrega (posicion_inicio, indice_patron) por cada ocurrencia, incluidas las solapadas."""
+        transiciones, fallos, salidas, largos = self._transiciones, self._fallos, self._salidas, self._largos
+        nodo = 0
+        for posicion, caracter in enumerate(texto):
+            while nodo and caracter not in transiciones[nodo]:
+                nodo = fallos[nodo]
+            nodo = transiciones[nodo].get(caracter, 0)
+            for indice in salidas[nodo]:
+                yield posicion - largos[indice] + 1, indice
+
+    def ocurrencias(self, texto: str) -> Dict[int, List[int]]:
+        """Agrupa las posiciones de inicio por índice de patrón (ya vienen en orden ascendente)."""
+        # Mismo recorrido que 'buscar', sin la sobrecarga del generador (es el camino caliente)
+        transiciones, fallos, salidas, largos = self._transiciones, self._fallos, self._salidas, self._largos
+        resultado: Dict[int, List[int]] = {}
+        nodo = 0
+        for posicion, caracter in enumerate(texto):
+            siguiente = transiciones[nodo].get(caracter)
+            while siguiente is None and nodo:
+                nodo = fallos[nodo]
+                siguiente = transiciones[nodo].get(caracter)
+            nodo = siguiente or 0
+            if salidas[nodo]:
+                for indice in salidas[nodo]:
+                    inicio = posicion - largos[indice] + 1
+                    if indice in resultado:
+                        resultado[indice].append(inicio)
+                    else:
+                        resultado[indice] = [inicio]
+        return resultado
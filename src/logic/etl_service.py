@@ -3,11 +3,17 @@
 Servicio ETL (Extract, Transform, Load).
 Orquestador principal del proceso de scraping y puntuación.
 """
-import time
 import datetime
-from typing import TYPE_CHECKING, List, Dict
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Dict, Optional, Tuple
 from src.utils.logger import configurar_logger
+from config.config import (
+    LISTADO_PARALELO, LISTADO_PAGINAS_POR_LOTE, MOTOR_INGESTA, FASE2_TAMANO_COMMIT, TAMANO_LOTE_RECALCULO,
+    PROCESOS_PUNTAJE, PUNTAJE_VECTORIZADO
+)
 
+from src.logic.score_engine import inicializar_proceso_puntajes, puntuar_particion_en_proceso
 from src.utils.exceptions import (
     ErrorScrapingFase1, ErrorCargaBD, ErrorTransformacionBD,
     ErrorScrapingFase2, ErrorRecalculo
@@ -21,10 +27,12 @@ if TYPE_CHECKING:
 logger = configurar_logger(__name__)
 
 class ServicioEtl:
-    def __init__(self, db_service: "DbService", scraper_service: "ServicioScraper", score_engine: "MotorPuntajes"):
+    def __init__(self, db_service: "DbService", scraper_service: "ServicioScraper", score_engine: "MotorPuntajes", motor_ingesta: Optional[str] = None):
         self.db_service = db_service
         self.scraper_service = scraper_service
         self.score_engine = score_engine
+        # 'upsert' (executemany por lotes) o 'copy' (COPY a tabla staging + fusión)
+        self.motor_ingesta = (motor_ingesta or MOTOR_INGESTA).lower()
         logger.info("ServicioEtl inicializado correctamente.")
 
     def _crear_emisores_progreso(self, callback_texto, callback_porcentaje):
@@ -37,7 +45,7 @@ class ServicioEtl:
 
     def ejecutar_etl_completo(self, callback_texto=None, callback_porcentaje=None, configuracion=None) -> int:
         """
-        Flujo principal: Limpieza -> Scraping Fase 1 -> Guardado BD -> Puntuación -> Fase 2 Top.
+        Flujo principal: Limpieza -> [Scraping Fase 1 -> Guardado BD -> Puntuación] por micro-lotes -> Fase 2 Top.
         """
         emitir_texto, emitir_porcentaje = self._crear_emisores_progreso(callback_texto, callback_porcentaje)
         
@@ -53,38 +61,25 @@ class ServicioEtl:
         fecha_desde = configuracion["date_from"]
         fecha_hasta = configuracion["date_to"]
         max_paginas = configuracion["max_paginas"]
+        listado_paralelo = configuracion.get("listado_paralelo", LISTADO_PARALELO)
+        motor_ingesta = configuracion.get("motor_ingesta", self.motor_ingesta)
         
-        # 1. EXTRACCIÓN (Scraping Fase 1)
+        # 1-3. EXTRACCIÓN + CARGA + PUNTUACIÓN en streaming (micro-lotes de páginas)
         emitir_texto("Iniciando Fase 1 (Buscando listado)...")
         emitir_porcentaje(5)
         
-        try:
-            filtros = {
-                'date_from': fecha_desde.strftime('%Y-%m-%d'), 
-                'date_to': fecha_hasta.strftime('%Y-%m-%d')
-            }
-
-            datos = self.scraper_service.ejecutar_scraper_listado(emitir_texto, filtros, max_paginas)
-        except Exception as e:
-            raise ErrorScrapingFase1(f"Fallo scraping listado: {e}") from e
+        filtros = {
+            'date_from': fecha_desde.strftime('%Y-%m-%d'), 
+            'date_to': fecha_hasta.strftime('%Y-%m-%d')
+        }
+        paginas = self.scraper_service.iterar_paginas_listado(emitir_texto, filtros, max_paginas, paralelo=listado_paralelo)
+        cantidad_datos = self._cargar_listado_en_streaming(paginas, emitir_texto, motor_ingesta)
 
-        cantidad_datos = len(datos) if datos else 0
         if cantidad_datos == 0:
             emitir_texto("No se encontraron datos nuevos.")
             emitir_porcentaje(100)
             return 0 
-
-        # 2. CARGA (Bulk Upsert)
-        emitir_porcentaje(20)
-        emitir_texto(f"Guardando {cantidad_datos} registros en BD...")
-        try:
-            self.db_service.insertar_o_actualizar_masivo(datos)
-        except Exception as e:
-            raise ErrorCargaBD(f"Fallo guardado en BD: {e}") from e
-            
-        # 3. TRANSFORMACIÓN (Cálculo de Puntajes Fase 1)
         emitir_porcentaje(30)
-        self._transformar_puntajes_fase_1(emitir_texto, emitir_porcentaje)
         
         # 4. ENRIQUECIMIENTO (Fase 2 Automática para las TOP mejores)
         try:
@@ -100,59 +95,85 @@ class ServicioEtl:
         
         return cantidad_datos
 
-    def _transformar_puntajes_fase_1(self, callback_texto, callback_porcentaje):
-        """Recalcula puntajes base, guardando SOLO si hubo cambios (Dirty Checking)."""
+    def _puntuar_particiones_multiproceso(self, particiones: Iterable[List[Dict]], procesos: int, vectorizado: bool = False) -> Iterator[Tuple[int, List]]:
+        """
+        Reparte las particiones entre un ProcessPoolExecutor. Cada proceso arma su propio
+        MotorPuntajes desde una instantánea de las reglas y devuelve solo los cambios.
+        Entrega (filas_procesadas, cambios) a medida que terminan, con a lo más 2N particiones en vuelo.
+        """
+        reglas = self.score_engine.exportar_reglas()
+        contexto = multiprocessing.get_context("spawn")  # Igual en Windows y Linux; seguro con hilos de Qt
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto,
+                                 initializer=inicializar_proceso_puntajes, initargs=(reglas,)) as pool:
+            en_vuelo = {}
+            for particion in particiones:
+                en_vuelo[pool.submit(puntuar_particion_en_proceso, particion, vectorizado)] = len(particion)
+                if len(en_vuelo) >= procesos * 2:
+                    listos, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                    for futuro in listos:
+                        yield en_vuelo.pop(futuro), futuro.result()
+            for futuro in as_completed(list(en_vuelo)):
+                yield en_vuelo.pop(futuro), futuro.result()
+
+    def _transformar_puntajes_fase_1(self, callback_texto, callback_porcentaje, codigos: Optional[List[str]] = None, recargar_reglas: bool = True, procesos: Optional[int] = None, vectorizado: Optional[bool] = None, **filtros_reglas):
+        """
+        Recalcula puntajes base, guardando SOLO si hubo cambios (Dirty Checking).
+        Las filas cuyas huellas (reglas + datos de entrada) siguen vigentes no se vuelven a puntuar.
+        Con 'codigos' se limita a esas licitaciones (micro-lotes del streaming de Fase 1);
+        'filtros_reglas' (terminos / organismo_ids) lo limita a las afectadas por un cambio de reglas.
+        Las filas llegan en particiones desde un cursor del servidor y los cambios se guardan
+        en lotes de TAMANO_LOTE_RECALCULO: la memoria se mantiene plana.
+        Con 'procesos' > 1 (por defecto PROCESOS_PUNTAJE) las particiones se puntúan en varios procesos.
+        Con 'vectorizado' (por defecto PUNTAJE_VECTORIZADO) los recálculos grandes usan el motor
+        por columnas ('puntuar_particion_lote'), que entrega los mismos puntajes.
+        """
         emitir_texto, emitir_porcentaje = self._crear_emisores_progreso(callback_texto, callback_porcentaje)
         try:
-            licitaciones_dicts = self.db_service.obtener_datos_para_recalculo_puntajes()
-            if not licitaciones_dicts: return
+            # Los micro-lotes ya conocen su tamaño; evitamos el COUNT extra
+            if codigos is not None:
+                total = len(codigos)
+            else:
+                total = self.db_service.contar_datos_para_recalculo_puntajes(**filtros_reglas)
+            if not total: return
             
-            total = len(licitaciones_dicts)
             emitir_texto(f"Analizando {total} registros para puntuación...")
             
-            lista_actualizaciones = []
-            
             # Recargar reglas en memoria
-            self.score_engine.recargar_reglas_memoria()
+            if recargar_reglas:
+                self.score_engine.recargar_reglas_memoria()
 
+            lista_actualizaciones = []
             cambios_detectados = 0
-
-            for i, lic_data in enumerate(licitaciones_dicts):
-                # Cálculo Fase 1
-                item_f1 = { 
-                    'codigo': lic_data['codigo_ca'],
-                    'nombre': lic_data['nombre'], 
-                    'estado_ca_texto': lic_data['estado_ca_texto'], 
-                    'organismo_comprador': lic_data['organismo_nombre']
-                }
-                pts1, det1 = self.score_engine.calcular_puntaje_fase_1(item_f1)
-                
-                # Cálculo Fase 2
-                pts2 = 0
-                det2 = []
-                desc = lic_data.get('descripcion')
-                prods = lic_data.get('productos_solicitados')
-                
-                if desc or (prods and len(prods) > 0):
-                    item_f2 = {'descripcion': desc, 'productos_solicitados': prods}
-                    pts2, det2 = self.score_engine.calcular_puntaje_fase_2(item_f2)
-                
-                nuevo_score = pts1 + pts2
-                nuevo_detalle = det1 + det2
-                
-                # Dirty Checking
-                score_actual = lic_data.get('puntuacion_final_actual', 0)
-                
-                if nuevo_score != score_actual:
-                    lista_actualizaciones.append((lic_data['ca_id'], nuevo_score, nuevo_detalle))
-                    cambios_detectados += 1
-                
-                if i % 500 == 0: 
-                    emitir_porcentaje(int(((i+1)/total)*100))
+            procesados = 0
+
+            particiones = self.db_service.iterar_datos_para_recalculo_puntajes(codigos=codigos, **filtros_reglas)
+            procesos = int(procesos or PROCESOS_PUNTAJE)
+            # El motor por columnas solo se usa en recálculos completos (no en micro-lotes)
+            vectorizado = (PUNTAJE_VECTORIZADO if vectorizado is None else vectorizado) and codigos is None
+            # El pool solo compensa su arranque en recálculos grandes (no en micro-lotes)
+            if codigos is None and procesos > 1 and total > TAMANO_LOTE_RECALCULO:
+                emitir_texto(f"Puntuando en {procesos} procesos...")
+                resultados = self._puntuar_particiones_multiproceso(particiones, procesos, vectorizado)
+            elif vectorizado:
+                resultados = ((len(p), self.score_engine.puntuar_particion_lote(p)) for p in particiones)
+            else:
+                resultados = ((len(p), self.score_engine.puntuar_particion(p)) for p in particiones)
+
+            for filas_particion, cambios in resultados:
+                lista_actualizaciones.extend(cambios)
+                procesados += filas_particion
+                if len(lista_actualizaciones) >= TAMANO_LOTE_RECALCULO:
+                    self.db_service.actualizar_puntajes_en_lote(lista_actualizaciones, huella_reglas=self.score_engine.huella_reglas)
+                    cambios_detectados += len(lista_actualizaciones)
+                    lista_actualizaciones = []
+                emitir_porcentaje(int((min(procesados, total) / total) * 100))
             
             if lista_actualizaciones:
-                emitir_texto(f"Actualizando {cambios_detectados} puntajes que cambiaron...")
-                self.db_service.actualizar_puntajes_en_lote(lista_actualizaciones)
+                self.db_service.actualizar_puntajes_en_lote(lista_actualizaciones, huella_reglas=self.score_engine.huella_reglas)
+                cambios_detectados += len(lista_actualizaciones)
+
+            if cambios_detectados:
+                emitir_texto(f"Actualizados {cambios_detectados} puntajes (nuevos, modificados o con reglas distintas).")
             else:
                 emitir_texto("No hubo cambios en los puntajes.")
             
@@ -170,6 +191,27 @@ class ServicioEtl:
         except Exception as e:
             raise ErrorRecalculo(f"Fallo recalculo: {e}") from e
 
+    def ejecutar_recalculo_incremental(self, terminos: List[str] = None, organismo_ids: List[int] = None, callback_texto=None, callback_porcentaje=None):
+        """
+        Recálculo acotado tras un cambio de reglas: solo se repuntúan las licitaciones que
+        mencionan alguna keyword agregada/editada/eliminada ('terminos', con su texto antiguo
+        y nuevo) o que pertenecen a un organismo cuya regla cambió ('organismo_ids').
+        """
+        emitir_texto, emitir_porcentaje = self._crear_emisores_progreso(callback_texto, callback_porcentaje)
+        terminos = list(terminos or [])
+        organismo_ids = list(organismo_ids or [])
+        try:
+            emitir_texto("Recargando reglas...")
+            self.score_engine.recargar_reglas_memoria()
+            emitir_texto(f"Buscando licitaciones afectadas ({len(terminos)} keywords, {len(organismo_ids)} organismos)...")
+            self._transformar_puntajes_fase_1(
+                emitir_texto, emitir_porcentaje,
+                recargar_reglas=False, terminos=terminos, organismo_ids=organismo_ids
+            )
+            emitir_porcentaje(100)
+        except Exception as e:
+            raise ErrorRecalculo(f"Fallo recalculo incremental: {e}") from e
+
     def ejecutar_actualizacion_selectiva(self, callback_texto=None, callback_porcentaje=None, alcances: List[str] = None):
         emitir_texto, emitir_porcentaje = self._crear_emisores_progreso(callback_texto, callback_porcentaje)
         alcances = alcances or ['all']
@@ -191,11 +233,10 @@ class ServicioEtl:
                     emitir_texto(f"Actualizando estados ({f_min_safe} al {fecha_tope})...")
                     
                     filtros = {'date_from': f_min_safe.strftime('%Y-%m-%d'), 'date_to': fecha_tope.strftime('%Y-%m-%d')}
-                    datos_barrido = self.scraper_service.ejecutar_scraper_listado(emitir_texto, filtros, max_paginas=0)
+                    paginas = self.scraper_service.iterar_paginas_listado(emitir_texto, filtros, max_paginas=0, paralelo=LISTADO_PARALELO)
+                    sincronizados = self._cargar_listado_en_streaming(paginas, emitir_texto)
                     
-                    if datos_barrido:
-                        emitir_texto(f"Sincronizando {len(datos_barrido)} registros...")
-                        self.db_service.insertar_o_actualizar_masivo(datos_barrido)
+                    if sincronizados:
                         self.db_service.cerrar_licitaciones_vencidas_localmente()
                     else:
                         emitir_texto("No se detectaron cambios en candidatas.")
@@ -231,71 +272,155 @@ class ServicioEtl:
         emitir_texto("Actualización finalizada.")
         emitir_porcentaje(100)
 
-    def _procesar_detalle_lote(self, candidatas: List, emitir_texto, emitir_porcentaje):
-        total = len(candidatas)
+    def _guardar_listado(self, compras: List[Dict], motor_ingesta: Optional[str] = None) -> Dict[str, int]:
+        """Guarda registros del listado con el motor de ingesta elegido ('upsert' o 'copy')."""
+        if (motor_ingesta or self.motor_ingesta) == 'copy':
+            return self.db_service.insertar_o_actualizar_masivo_copy(compras)
+        return self.db_service.insertar_o_actualizar_masivo(compras)
+
+    def _cargar_listado_en_streaming(self, paginas: Iterable[List[Dict]], emitir_texto, motor_ingesta: Optional[str] = None) -> int:
+        """
+        Consume las páginas de la Fase 1 a medida que llegan y, cada LISTADO_PAGINAS_POR_LOTE
+        páginas, deduplica, guarda (upsert) y puntúa ese micro-lote.
+        La memoria queda acotada al tamaño del lote y un fallo a mitad de camino
+        conserva los lotes ya guardados. Retorna la cantidad de códigos únicos procesados.
+        """
+        self.score_engine.recargar_reglas_memoria()
+
+        iterador = iter(paginas)
+        codigos_vistos = set()
+        lote: Dict[str, Dict] = {}
+        paginas_en_lote = 0
+        numero_lote = 0
+
+        while True:
+            try:
+                items = next(iterador, None)
+            except Exception as e:
+                raise ErrorScrapingFase1(f"Fallo scraping listado: {e}") from e
+
+            if items is not None:
+                for item in items:
+                    codigo = item.get('codigo', item.get('id'))
+                    if codigo:
+                        lote[codigo] = item  # Deduplicación: gana la versión más reciente
+                paginas_en_lote += 1
+
+            fin_del_flujo = items is None
+            if lote and (fin_del_flujo or paginas_en_lote >= LISTADO_PAGINAS_POR_LOTE):
+                numero_lote += 1
+                codigos = list(lote.keys())
+                emitir_texto(f"Guardando lote {numero_lote} ({len(codigos)} registros)...")
+                try:
+                    totales = self._guardar_listado(list(lote.values()), motor_ingesta)
+                    logger.info(f"Lote {numero_lote} de Fase 1 guardado: {totales}")
+                except Exception as e:
+                    raise ErrorCargaBD(f"Fallo guardado en BD: {e}") from e
+
+                self._transformar_puntajes_fase_1(None, None, codigos=codigos, recargar_reglas=False)
+                codigos_vistos.update(codigos)
+                lote = {}
+                paginas_en_lote = 0
+
+            if fin_del_flujo:
+                break
+
+        if codigos_vistos:
+            emitir_texto(f"Fase 1 completada: {len(codigos_vistos)} registros guardados y puntuados.")
+        return len(codigos_vistos)
+
+    def _datos_base_candidata(self, item) -> Dict:
+        """Extrae los campos de Fase 1 de una candidata, venga como objeto ORM o como dict."""
+        if isinstance(item, dict):
+            return {
+                'codigo': item.get('codigo') or item.get('codigo_ca'),
+                'nombre': item.get('nombre'),
+                'estado_ca_texto': item.get('estado_ca_texto'),
+                'organismo_comprador': item.get('organismo_comprador') or item.get('organismo_nombre'),
+            }
+        organismo = getattr(item, 'organismo', None)
+        return {
+            'codigo': item.codigo_ca,
+            'nombre': item.nombre,
+            'nombre_norm': item.nombre_norm,
+            'estado_ca_texto': item.estado_ca_texto,
+            'organismo_comprador': organismo.nombre if organismo else "",
+            'organismo_id': item.organismo_id,
+        }
+
+    def _guardar_detalles_pendientes(self, pendientes: List) -> int:
+        """Escribe en BD un bloque de detalles de Fase 2. Retorna cuántos quedaron guardados."""
+        if not pendientes:
+            return 0
+        try:
+            self.db_service.actualizar_fase_2_detalle_en_lote(pendientes)
+            return len(pendientes)
+        except Exception as e:
+            logger.error(f"Error guardando bloque de {len(pendientes)} detalles: {e}")
+            return 0
+
+    def _procesar_detalle_lote(self, candidatas: List, emitir_texto, emitir_porcentaje, max_hilos: int = None):
+        """
+        Fase 2 concurrente: las fichas se descargan en paralelo (pool acotado + limitador de tasa)
+        y cada resultado se puntúa apenas llega. Las escrituras se acumulan y se guardan
+        en bloques de FASE2_TAMANO_COMMIT con un UPDATE masivo.
+        """
+        bases = {}
+        for item in candidatas:
+            base = self._datos_base_candidata(item)
+            if base['codigo']:
+                bases[base['codigo']] = base
+
+        total = len(bases)
+        if total == 0:
+            return
         procesados = 0
+        pendientes = []
         
-        for idx, item in enumerate(candidatas):
-            codigo = item['codigo']
-            
+        flujo = self.scraper_service.extraer_detalles_concurrente(list(bases.keys()), max_hilos=max_hilos)
+        for idx, (codigo, datos_obj) in enumerate(flujo, start=1):
             try:
-                # datos ahora es un Objeto Pydantic (LicitacionDetalleSchema)
-                datos_obj = self.scraper_service.extraer_detalle_api(None, codigo)
-
                 if datos_obj:
                     # CONVERSIÓN CRÍTICA: Transformamos a dict para compatibilidad
                     datos = datos_obj.model_dump()
+                    base = bases[codigo]
+
+                    # 1. Puntaje Fase 1 (con el estado más reciente de la ficha)
+                    item_f1 = dict(base, estado_ca_texto=datos.get('estado') or base['estado_ca_texto'])
+                    pts_base, det_base = self.score_engine.calcular_puntaje_fase_1(item_f1)
 
-                    # 1. Calcular Puntaje Fase 2 (Productos + Descripción)
+                    # 2. Calcular Puntaje Fase 2 (Productos + Descripción)
                     pts_prod, det_prod = self.score_engine.calcular_puntaje_fase_2(datos)
-                    
-                    # 2. Recalcular total
-                    puntos_base = item.get('puntos_base', 0)
-                    nuevo_total = puntos_base + pts_prod
-                    nuevo_detalle = (item.get('detalle_base') or []) + det_prod
-
-                    # 3. Guardar en BD (Fase 2)
-                    self.db_service.actualizar_fase_2_detalle(
-                        codigo_ca=codigo,
-                        datos_fase_2=datos,
-                        puntuacion_total=nuevo_total,
-                        detalle_completo=nuevo_detalle
-                    )
-                    
-                    procesados += 1
+
+                    # 3. Acumular para el guardado masivo (Fase 2)
+                    pendientes.append((codigo, datos, pts_base + pts_prod, det_base + det_prod))
                 else:
                     logger.warning(f"No se pudo descargar info para {codigo}")
-                
-                # Pequeña pausa para no saturar CPU en bucles muy rápidos
-                time.sleep(0.05) 
-
-                if idx % 5 == 0:
-                    progreso = 30 + int((idx / total) * 60)
-                    emitir_porcentaje(progreso)
 
             except Exception as e:
                 logger.error(f"Error procesando detalle {codigo}: {e}")
 
-        emitir_texto("Fase 2 Completada.")
+            if len(pendientes) >= FASE2_TAMANO_COMMIT:
+                procesados += self._guardar_detalles_pendientes(pendientes)
+                pendientes = []
 
-    def ejecutar_limpieza_automatica(self):
-        try: 
-            cerradas = self.db_service.cerrar_licitaciones_vencidas_localmente()
-            eliminados = self.db_service.limpiar_registros_antiguos()
-            if eliminados > 0 or cerradas > 0:
-                logger.info(f"Limpieza: {cerradas} cerradas, {eliminados} borradas.")
-        except Exception as e:
-            logger.error(f"Error en limpieza automática: {e}")
+            if idx % 5 == 0 or idx == total:
+                emitir_porcentaje(30 + int((idx / total) * 60))
+
+        procesados += self._guardar_detalles_pendientes(pendientes)
+        emitir_texto(f"Fase 2 Completada ({procesados}/{total}).")
 
     def importar_lista_manual(self, lista_codigos: List[str], destino: str, callback_texto=None, callback_porcentaje=None):
         """
         Importa manualmente una lista de códigos CA.
         destino: 'candidatas', 'seguimiento' u 'ofertadas'.
+        Las fichas se descargan en paralelo (Fase 2 concurrente) y se guardan en bloque:
+        un Upsert de los datos base, un UPDATE masivo del detalle y la asignación al destino.
         """
         emitir_texto, emitir_porcentaje = self._crear_emisores_progreso(callback_texto, callback_porcentaje)
         
-        # Limpieza de lista
-        codigos_limpios = [c.strip().upper() for c in lista_codigos if c.strip()]
+        # Limpieza de lista (sin duplicados, respetando el orden)
+        codigos_limpios = list(dict.fromkeys(c.strip().upper() for c in lista_codigos if c.strip()))
         total = len(codigos_limpios)
         if total == 0: return 0
 
@@ -304,77 +429,72 @@ class ServicioEtl:
         # Recargar reglas para puntajes
         self.score_engine.recargar_reglas_memoria()
         
-        procesados = 0
-        
         # Verificamos sesión una vez antes de empezar
         if hasattr(self.scraper_service, 'verificar_sesion'):
             self.scraper_service.verificar_sesion(emitir_texto)
 
-        for i, codigo in enumerate(codigos_limpios):
-            try:
-                percent = int(((i+1)/total)*100)
-                emitir_porcentaje(percent)
-                emitir_texto(f"Procesando ({i+1}/{total}): {codigo}")
+        registros_base = []
+        detalles = []
 
-                # 1. Extraer datos (Usamos lógica de Fase 2 directa)
-                datos = self.scraper_service.extraer_detalle_api(None, codigo)
-                
-                if datos:
-                    # --- Nombre del Organismo ---
-                    org_real = datos.get('organismo_nombre')
-                    if not org_real or len(org_real) < 2:
-                        org_real = "Importado Manual"
-
-                    # 2. Calcular Puntajes
-                    puntos1, det1 = self.score_engine.calcular_puntaje_fase_1({
-                        'nombre': datos.get('descripcion', 'Importado Manualmente')[:100], 
-                        'estado_ca_texto': datos.get('estado'),
-                        'organismo_comprador': org_real
-                    })
-                    puntos2, det2 = self.score_engine.calcular_puntaje_fase_2(datos)
-                    
-                    # 3. Guardar en BD (CORREGIDO CON DATOS FASE 2)
-                    registro_base = [{
-                        "codigo": codigo,
-                        "nombre": datos.get('descripcion', 'Sin Nombre (Manual)'),
-                        "estado": datos.get('estado'),
-                        # AQUÍ MAPEAMOS LOS NUEVOS CAMPOS:
-                        "fecha_publicacion": datos.get('fecha_publicacion'),  # Fecha real extraída
-                        "monto_disponible_CLP": datos.get('monto_estimado'), # Mapeamos 'presupuesto' a 'monto_clp'
-                        "fecha_cierre": datos.get('fecha_cierre_p1'),
-                        "organismo": org_real
-                    }]
-                    
-                    # Paso A: Insertar/Actualizar Base
-                    self.db_service.insertar_o_actualizar_masivo(registro_base)
-                    
-                    # Paso B: Actualizar con detalle completo
-                    self.db_service.actualizar_fase_2_detalle(
-                        codigo_ca=codigo,
-                        datos_fase_2=datos,
-                        puntuacion_total=puntos1 + puntos2,
-                        detalle_completo=det1 + det2
-                    )
-
-                    # 4. Asignar al destino (Pestaña)
-                    with self.db_service.session_factory() as session:
-                        from src.db.db_models import CaLicitacion
-                        lic = session.query(CaLicitacion).filter_by(codigo_ca=codigo).first()
-                        if lic:
-                            if destino == 'seguimiento':
-                                self.db_service.gestionar_favorito(lic.ca_id, True)
-                            elif destino == 'ofertadas':
-                                self.db_service.gestionar_ofertada(lic.ca_id, True)
-                            # Si es 'candidatas', no hacemos nada extra
-
-                    procesados += 1
-                else:
+        # 1. Extraer datos (Fase 2 concurrente) y calcular puntajes
+        flujo = self.scraper_service.extraer_detalles_concurrente(codigos_limpios)
+        for i, (codigo, datos_obj) in enumerate(flujo, start=1):
+            emitir_porcentaje(int((i / total) * 80))
+            emitir_texto(f"Procesando ({i}/{total}): {codigo}")
+            try:
+                if not datos_obj:
                     logger.warning(f"No se pudo descargar info para {codigo}")
-                
-                time.sleep(0.2)
+                    continue
+
+                datos = datos_obj.model_dump()
+
+                # --- Nombre del Organismo ---
+                org_real = datos.get('organismo_nombre')
+                if not org_real or len(org_real) < 2:
+                    org_real = "Importado Manual"
+
+                puntos1, det1 = self.score_engine.calcular_puntaje_fase_1({
+                    'nombre': (datos.get('descripcion') or 'Importado Manualmente')[:100], 
+                    'estado_ca_texto': datos.get('estado'),
+                    'organismo_comprador': org_real
+                })
+                puntos2, det2 = self.score_engine.calcular_puntaje_fase_2(datos)
+
+                registros_base.append({
+                    "codigo": codigo,
+                    "nombre": datos.get('descripcion') or 'Sin Nombre (Manual)',
+                    "estado": datos.get('estado'),
+                    "fecha_publicacion": datos.get('fecha_publicacion'),  # Fecha real extraída
+                    "monto_disponible_CLP": datos.get('monto_estimado'), # Mapeamos 'presupuesto' a 'monto_clp'
+                    "fecha_cierre": datos.get('fecha_cierre_p1'),
+                    "organismo": org_real
+                })
+                detalles.append((codigo, datos, puntos1 + puntos2, det1 + det2))
 
             except Exception as e:
                 logger.error(f"Error importando {codigo}: {e}")
 
+        if not detalles:
+            emitir_texto("Importación finalizada.")
+            return 0
+
+        # 2. Guardar en BD: Base (Upsert) + Detalle (UPDATE masivo)
+        emitir_texto(f"Guardando {len(detalles)} licitaciones...")
+        try:
+            self.db_service.insertar_o_actualizar_masivo(registros_base)
+            self.db_service.actualizar_fase_2_detalle_en_lote(detalles)
+        except Exception as e:
+            raise ErrorCargaBD(f"Fallo guardado de importación manual: {e}") from e
+        emitir_porcentaje(90)
+
+        # 3. Asignar al destino (Pestaña). Si es 'candidatas', no hacemos nada extra
+        ids_por_codigo = self.db_service.obtener_ids_por_codigo([d[0] for d in detalles])
+        for ca_id in ids_por_codigo.values():
+            if destino == 'seguimiento':
+                self.db_service.gestionar_favorito(ca_id, True)
+            elif destino == 'ofertadas':
+                self.db_service.gestionar_ofertada(ca_id, True)
+
+        emitir_porcentaje(100)
         emitir_texto("Importación finalizada.")
-        return procesados
\ No newline at end of file
+        return len(ids_por_codigo)
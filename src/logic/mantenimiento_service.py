@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Servicio de Mantenimiento.
+
+Cierra licitaciones vencidas y archiva las antiguas en lotes keyset de pocas filas,
+cada uno en una transacción corta, para no bloquear la tabla mientras la GUI carga datos.
+El avance queda en ca_mantenimiento_checkpoint: si la aplicación se cierra a mitad de
+una tarea, la siguiente ejecución la retoma donde quedó.
+"""
+import threading
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Set
+
+from config.config import TAMANO_LOTE_MANTENIMIENTO
+from src.utils.logger import configurar_logger
+
+if TYPE_CHECKING:
+    from src.db.db_service import DbService
+
+logger = configurar_logger(__name__)
+
+TAREA_CERRAR_VENCIDAS = "cerrar_vencidas"
+TAREA_ARCHIVAR_ANTIGUAS = "archivar_antiguas"
+
+
+class ServicioMantenimiento:
+    def __init__(self, db_service: "DbService", tamano_lote: Optional[int] = None):
+        self.db_service = db_service
+        self.tamano_lote = max(int(tamano_lote or TAMANO_LOTE_MANTENIMIENTO), 1)
+        self._detener = threading.Event()
+        logger.info("ServicioMantenimiento inicializado correctamente.")
+
+    def detener(self):
+        """
+        Pide terminar después del lote en curso; el checkpoint permite retomar después.
+        Es definitivo para esta instancia: un ejecutar() posterior (p. ej. si la ventana se cierra
+        antes de que el hilo arranque) termina sin procesar lotes.
+        """
+        self._detener.set()
+
+    def ejecutar(self, dias_retencion: int = 30, callback_texto: Optional[Callable[[str], None]] = None) -> Dict[str, int]:
+        """
+        Ejecuta (o retoma) las tareas en orden: cerrar vencidas y luego archivar antiguas.
+        Retorna las filas procesadas por tarea, contando las de ejecuciones interrumpidas.
+        """
+        ahora = datetime.now()
+        tareas = (
+            (TAREA_CERRAR_VENCIDAS, "cerradas", self.db_service.cerrar_vencidas_lote, ahora),
+            (TAREA_ARCHIVAR_ANTIGUAS, "archivadas", self.db_service.archivar_antiguas_lote, ahora - timedelta(days=dias_retencion)),
+        )
+        resumen = {}
+        for tarea, etiqueta, procesar_lote, fecha_limite in tareas:
+            if self._detener.is_set():
+                break
+            try:
+                resumen[tarea] = self._ejecutar_tarea(tarea, etiqueta, procesar_lote, fecha_limite, callback_texto)
+            except Exception as e:
+                logger.error(f"Error en mantenimiento '{tarea}': {e}")
+                break
+
+        if any(resumen.values()):
+            logger.info(f"Mantenimiento: {resumen}")
+        return resumen
+
+    def _ejecutar_tarea(self, tarea: str, etiqueta: str, procesar_lote, fecha_limite: datetime,
+                        callback_texto: Optional[Callable[[str], None]]) -> int:
+        """
+        Procesa lotes de una tarea hasta agotarla (o hasta detener()), partiendo del checkpoint si existe.
+        Los ca_id tocados se publican en el feed de cambios una sola vez al terminar la tarea, para
+        que la GUI no consulte las pestañas tras cada lote mientras carga.
+        """
+        ultimo_id, procesados = 0, 0
+        checkpoint = self.db_service.obtener_checkpoint_mantenimiento(tarea)
+        if checkpoint:
+            ultimo_id, fecha_limite, procesados = checkpoint
+            logger.info(f"Mantenimiento '{tarea}': retomando desde ca_id {ultimo_id} ({procesados} ya procesadas).")
+
+        cambios: Set[int] = set()
+        try:
+            while not self._detener.is_set():
+                siguiente_id, afectados = procesar_lote(fecha_limite, ultimo_id, self.tamano_lote, tarea=tarea,
+                                                        procesados=procesados, cambios=cambios)
+                if siguiente_id is None:
+                    self.db_service.borrar_checkpoint_mantenimiento(tarea)
+                    break
+                ultimo_id = siguiente_id
+                procesados += afectados
+                if callback_texto:
+                    callback_texto(f"Mantenimiento: {procesados} licitaciones {etiqueta}...")
+        finally:
+            # Los lotes ya confirmados se publican aunque la tarea se detenga o falle
+            self.db_service.publicar_cambios(cambios)
+        return procesados
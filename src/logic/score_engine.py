@@ -5,30 +5,125 @@ Motor de Puntajes.
 Este módulo contiene el algoritmo de priorización de licitaciones.
 Implementa lógica de 'Masking' para evitar puntuación doble en frases contenidas.
 """
-import unicodedata
+import hashlib
 import json
+import re
 from functools import lru_cache
-from typing import Dict, List, Tuple, Any, Set
+from typing import Dict, List, Tuple, Any, Set, Optional
+
+import pandas as pd
+
+from src.logic.aho_corasick import AutomataAhoCorasick
+from src.utils.normalizacion import normalizar_texto, normalizar_productos
 from src.utils.logger import configurar_logger
 from config.config import PUNTOS_SEGUNDO_LLAMADO
 
 logger = configurar_logger(__name__)
 
+CAMPOS_PUNTAJE = ("p_nom", "p_desc", "p_prod")
+
+
+def _huella(*partes: Any) -> str:
+    return hashlib.blake2b("\x1f".join(str(p) for p in partes).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def calcular_huella_entrada(lic_data: dict) -> str:
+    """
+    Huella de los datos de una fila que intervienen en su puntaje
+    (textos normalizados, estado y organismo). Ver 'MotorPuntajes.puntuar_particion'.
+    """
+    nom_norm = lic_data.get("nombre_norm")
+    if nom_norm is None:
+        nom_norm = normalizar_texto(lic_data.get("nombre"))
+    desc_norm = lic_data.get("descripcion_norm")
+    if desc_norm is None:
+        desc_norm = normalizar_texto(lic_data.get("descripcion"))
+    prods_norm = lic_data.get("productos_norm")
+    if prods_norm is None:
+        prods_norm = normalizar_productos(lic_data.get("productos_solicitados"))
+    return _huella(nom_norm, desc_norm, prods_norm, lic_data.get("estado_ca_texto") or "", lic_data.get("organismo_id"))
+
+
+class ResolutorOrganismos:
+    """
+    Resuelve el nombre normalizado de un organismo a su organismo_id.
+    Equivale a: coincidencia exacta en el mapa y, si no hay, la primera clave del mapa
+    (en su orden) contenida en el nombre. La búsqueda parcial usa un autómata sobre
+    todas las claves y cada nombre ya resuelto queda memorizado.
+    """
+
+    def __init__(self, mapa_nombre_id: Dict[str, int]):
+        self.mapa_nombre_id = mapa_nombre_id
+        self._claves = list(mapa_nombre_id.keys())
+        self._automata = AutomataAhoCorasick(self._claves)
+        # La clave vacía está contenida en cualquier nombre
+        self._posicion_clave_vacia = self._claves.index("") if "" in mapa_nombre_id else None
+        self._memo: Dict[str, Optional[int]] = {}
+
+    def resolver(self, org_norm: str) -> Optional[int]:
+        if org_norm in self._memo:
+            return self._memo[org_norm]
+
+        org_id = self.mapa_nombre_id.get(org_norm)
+        if not org_id:
+            posiciones = list(self._automata.ocurrencias(org_norm))
+            if self._posicion_clave_vacia is not None:
+                posiciones.append(self._posicion_clave_vacia)
+            if posiciones:
+                org_id = self.mapa_nombre_id[self._claves[min(posiciones)]]
+
+        self._memo[org_norm] = org_id
+        return org_id
+
+
 class MotorPuntajes:
     """
     Clase encargada de calcular el puntaje (Score) de cada licitación
     basándose en reglas configurables (Palabras clave y Organismos).
     """
     
-    def __init__(self, db_service):
+    def __init__(self, db_service, reglas: Optional[Dict[str, Any]] = None):
+        """
+        Con 'reglas' (ver 'exportar_reglas') el motor se construye sin consultar la BD;
+        así lo instancian los procesos de puntuación en paralelo.
+        """
         self.db_service = db_service
         
         self.cache_palabras_clave: List[Dict[str, Any]] = [] 
+        # Por campo: (autómata, índices de cache_palabras_clave por patrón) o None si se usa el recorrido clásico
+        self.automatas_palabras_clave: Dict[str, Optional[Tuple[AutomataAhoCorasick, List[List[int]]]]] = {}
+        # Por campo: alternancia de todas sus keywords (prefiltro de 'calcular_puntajes_lote')
+        self.regex_palabras_clave: Dict[str, Optional[re.Pattern]] = {}
         self.reglas_prioritarias: Dict[int, int] = {}
         self.reglas_no_deseadas: Dict[int, int] = {} 
         
         self.mapa_nombre_id_organismo: Dict[str, int] = {}
-        self.recargar_reglas_memoria()
+        self.resolutor_organismos = ResolutorOrganismos({})
+        # Huella de la versión de reglas cargada (keywords + reglas de organismos)
+        self.huella_reglas: Optional[str] = None
+        if reglas is not None:
+            self.cargar_reglas(reglas)
+        else:
+            self.recargar_reglas_memoria()
+
+    def exportar_reglas(self) -> Dict[str, Any]:
+        """Instantánea serializable (pickle) de las reglas en memoria, sin referencias a la BD."""
+        return {
+            "palabras_clave": [dict(kw) for kw in self.cache_palabras_clave],
+            "reglas_prioritarias": dict(self.reglas_prioritarias),
+            "reglas_no_deseadas": dict(self.reglas_no_deseadas),
+            "mapa_nombre_id_organismo": dict(self.mapa_nombre_id_organismo),
+        }
+
+    def cargar_reglas(self, reglas: Dict[str, Any]):
+        """Carga una instantánea de 'exportar_reglas' (ya ordenada) y compila los autómatas."""
+        self.cache_palabras_clave = [dict(kw) for kw in reglas["palabras_clave"]]
+        self.reglas_prioritarias = dict(reglas["reglas_prioritarias"])
+        self.reglas_no_deseadas = dict(reglas["reglas_no_deseadas"])
+        self.mapa_nombre_id_organismo = dict(reglas["mapa_nombre_id_organismo"])
+        self._compilar_automatas()
+        self.resolutor_organismos = ResolutorOrganismos(self.mapa_nombre_id_organismo)
+        self.huella_reglas = self._calcular_huella_reglas()
 
     def recargar_reglas_memoria(self):
         """
@@ -56,6 +151,7 @@ class MotorPuntajes:
             
         except Exception as e: 
             logger.error(f"Error cargando palabras clave: {e}")
+        self._compilar_automatas()
 
         # 2. Cargar Reglas de Organismos
         self.reglas_prioritarias = {}
@@ -83,19 +179,103 @@ class MotorPuntajes:
                     self.mapa_nombre_id_organismo[self._normalizar_texto(o.nombre)] = o.organismo_id
         except Exception as e:
             logger.error(f"Error mapeando nombres de organismos: {e}")
+        self.resolutor_organismos = ResolutorOrganismos(self.mapa_nombre_id_organismo)
+        self.huella_reglas = self._calcular_huella_reglas()
+
+    def _calcular_huella_reglas(self) -> str:
+        """
+        Huella de todo lo que define un puntaje salvo los datos de la fila.
+        El mapa de nombres de organismos queda fuera (crece con cada scraping): las filas
+        sin organismo_id, que dependen de él, se repuntúan siempre.
+        """
+        contenido = json.dumps({
+            "palabras_clave": [[kw["keyword"], kw["norm"], kw["p_nom"], kw["p_desc"], kw["p_prod"]] for kw in self.cache_palabras_clave],
+            "reglas_prioritarias": sorted(self.reglas_prioritarias.items()),
+            "reglas_no_deseadas": sorted(self.reglas_no_deseadas.items()),
+            "puntos_segundo_llamado": PUNTOS_SEGUNDO_LLAMADO,
+        }, ensure_ascii=False)
+        return _huella(contenido)
+
+    def _compilar_automatas(self):
+        """
+        Compila un autómata Aho–Corasick por campo de puntaje con las keywords que puntúan en él.
+        Varias keywords pueden compartir el mismo texto normalizado: cada patrón guarda
+        sus posiciones en 'cache_palabras_clave' (orden de masking).
+        """
+        self.automatas_palabras_clave = {}
+        self.regex_palabras_clave = {}
+        for campo in CAMPOS_PUNTAJE:
+            indices_por_norm: Dict[str, List[int]] = {}
+            for i, kw_dict in enumerate(self.cache_palabras_clave):
+                if kw_dict[campo] != 0 and kw_dict["norm"]:
+                    indices_por_norm.setdefault(kw_dict["norm"], []).append(i)
+
+            # Una keyword con '#' podría calzar sobre la máscara: se usa el recorrido clásico
+            if any("#" in norm for norm in indices_por_norm):
+                self.automatas_palabras_clave[campo] = None
+                continue
+
+            patrones = list(indices_por_norm.keys())
+            self.automatas_palabras_clave[campo] = (AutomataAhoCorasick(patrones), list(indices_por_norm.values()))
+            if patrones:
+                self.regex_palabras_clave[campo] = re.compile("|".join(re.escape(p) for p in patrones))
 
     @lru_cache(maxsize=4096)
     def _normalizar_texto(self, texto: Any) -> str:
-        if not texto:
-            return ""
-        
-        texto_str = str(texto)
-        s = ''.join(c for c in unicodedata.normalize('NFD', texto_str.lower()) if unicodedata.category(c) != 'Mn')
-        return " ".join(s.split())
+        return normalizar_texto(texto)
 
     def _evaluar_con_masking(self, texto_base: str, campo_puntaje: str, etiqueta: str) -> Tuple[int, List[str]]:
         """
-        Aplica la lógica de 'Masking' (Enmascaramiento).
+        Aplica la lógica de 'Masking' (Enmascaramiento) usando el autómata del campo:
+        una sola pasada encuentra todas las ocurrencias y luego se replica la semántica de
+        '_evaluar_con_masking_secuencial' sobre los intervalos encontrados.
+        """
+        if not texto_base: return 0, []
+
+        compilado = self.automatas_palabras_clave.get(campo_puntaje)
+        if compilado is None:
+            return self._evaluar_con_masking_secuencial(texto_base, campo_puntaje, etiqueta)
+        automata, indices_por_patron = compilado
+
+        # Keywords presentes en el texto, en el mismo orden de evaluación (largo DESC)
+        ocurrencias_por_kw: Dict[int, List[int]] = {}
+        for patron, inicios in automata.ocurrencias(texto_base).items():
+            for indice_kw in indices_por_patron[patron]:
+                ocurrencias_por_kw[indice_kw] = inicios
+
+        puntaje_acumulado = 0
+        detalle_acumulado = []
+        tachado = bytearray(len(texto_base))
+
+        for indice_kw in sorted(ocurrencias_por_kw):
+            kw_dict = self.cache_palabras_clave[indice_kw]
+            largo = len(kw_dict["norm"])
+
+            # Igual que str.replace: ocurrencias no solapadas de izquierda a derecha,
+            # descartando las que tocan partes ya tachadas
+            fin_anterior = 0
+            encontradas = []
+            for inicio in ocurrencias_por_kw[indice_kw]:
+                fin = inicio + largo
+                if inicio >= fin_anterior and not any(tachado[inicio:fin]):
+                    encontradas.append(inicio)
+                    fin_anterior = fin
+            if not encontradas:
+                continue
+
+            puntos = kw_dict[campo_puntaje]
+            puntaje_acumulado += puntos
+            detalle_acumulado.append(f"KW {etiqueta}: '{kw_dict['keyword']}' ({'+' if puntos>0 else ''}{puntos})")
+
+            # --- MASKING ---
+            for inicio in encontradas:
+                tachado[inicio:inicio + largo] = b"\x01" * largo
+
+        return puntaje_acumulado, detalle_acumulado
+
+    def _evaluar_con_masking_secuencial(self, texto_base: str, campo_puntaje: str, etiqueta: str) -> Tuple[int, List[str]]:
+        """
+        Lógica de 'Masking' (Enmascaramiento) keyword por keyword.
         Si encuentra una keyword, suma puntos y la tacha del texto para que no vuelva a contar.
         """
         if not texto_base: return 0, []
@@ -127,9 +307,14 @@ class MotorPuntajes:
         return puntaje_acumulado, detalle_acumulado
 
     def calcular_puntaje_fase_1(self, licitacion_raw: dict) -> Tuple[int, List[str]]:
-        """Calcula puntaje base (Organismo + Estado + Título)."""
-        org_norm = self._normalizar_texto(licitacion_raw.get("organismo_comprador"))
-        nom_norm = self._normalizar_texto(licitacion_raw.get("nombre"))
+        """
+        Calcula puntaje base (Organismo + Estado + Título).
+        Si la fila trae 'nombre_norm' (columna persistida) se usa sin volver a normalizar,
+        y si trae 'organismo_id' (resuelto en la ingesta) no se busca el organismo por nombre.
+        """
+        nom_norm = licitacion_raw.get("nombre_norm")
+        if nom_norm is None:
+            nom_norm = self._normalizar_texto(licitacion_raw.get("nombre"))
         
         puntaje = 0
         detalle = []
@@ -138,11 +323,10 @@ class MotorPuntajes:
             return 0, ["Error: Sin nombre"]
 
         # 1. Evaluar Organismo
-        org_id = self.mapa_nombre_id_organismo.get(org_norm)
-        if not org_id:
-            for name_key, oid in self.mapa_nombre_id_organismo.items():
-                if name_key in org_norm: 
-                    org_id = oid; break
+        org_id = licitacion_raw.get("organismo_id")
+        if org_id is None:
+            org_norm = self._normalizar_texto(licitacion_raw.get("organismo_comprador"))
+            org_id = self.resolutor_organismos.resolver(org_norm)
 
         if org_id:
             if org_id in self.reglas_no_deseadas:
@@ -169,38 +353,232 @@ class MotorPuntajes:
         return max(0, puntaje), detalle
 
     def calcular_puntaje_fase_2(self, datos_ficha: dict) -> Tuple[int, List[str]]:
-        """Calcula puntaje avanzado (Descripción + Productos)."""
+        """
+        Calcula puntaje avanzado (Descripción + Productos).
+        Usa 'descripcion_norm' / 'productos_norm' cuando vienen de la BD ya normalizados.
+        """
         puntaje = 0
         detalle = []
         
         # 1. Evaluar Descripción
-        desc_norm = self._normalizar_texto(datos_ficha.get("descripcion"))
+        desc_norm = datos_ficha.get("descripcion_norm")
+        if desc_norm is None:
+            desc_norm = self._normalizar_texto(datos_ficha.get("descripcion"))
         if desc_norm:
             pts_desc, det_desc = self._evaluar_con_masking(desc_norm, "p_desc", "Desc.")
             puntaje += pts_desc
             detalle.extend(det_desc)
         
         # 2. Evaluar Productos
-        prods_raw = datos_ficha.get("productos_solicitados")
-        if isinstance(prods_raw, str):
-            try: prods_raw = json.loads(prods_raw)
-            except: prods_raw = []
-        elif prods_raw is None:
-            prods_raw = []
-            
-        txt_prods_norm = ""
-        if isinstance(prods_raw, list):
-            parts = []
-            for p in prods_raw:
-                if isinstance(p, dict):
-                    n = p.get("nombre") or ""
-                    d = p.get("descripcion") or ""
-                    parts.append(self._normalizar_texto(f"{n} {d}"))
-            txt_prods_norm = " | ".join(parts)
+        txt_prods_norm = datos_ficha.get("productos_norm")
+        if txt_prods_norm is None:
+            txt_prods_norm = normalizar_productos(datos_ficha.get("productos_solicitados"))
 
         if txt_prods_norm:
             pts_prod, det_prod = self._evaluar_con_masking(txt_prods_norm, "p_prod", "Prod.")
             puntaje += pts_prod
             detalle.extend(det_prod)
                 
-        return puntaje, detalle
\ No newline at end of file
+        return puntaje, detalle
+
+    def calcular_puntaje_total(self, lic_data: dict) -> Tuple[int, List[str]]:
+        """
+        Puntaje completo (Fase 1 + Fase 2) de una fila de recálculo
+        (ver DbService.iterar_datos_para_recalculo_puntajes).
+        """
+        # Cálculo Fase 1
+        item_f1 = { 
+            'codigo': lic_data['codigo_ca'],
+            'nombre': lic_data['nombre'], 
+            'nombre_norm': lic_data.get('nombre_norm'),
+            'estado_ca_texto': lic_data['estado_ca_texto'], 
+            'organismo_comprador': lic_data['organismo_nombre'],
+            'organismo_id': lic_data.get('organismo_id'),
+        }
+        pts1, det1 = self.calcular_puntaje_fase_1(item_f1)
+        
+        # Cálculo Fase 2
+        pts2 = 0
+        det2 = []
+        desc = lic_data.get('descripcion')
+        prods = lic_data.get('productos_solicitados')
+        desc_norm = lic_data.get('descripcion_norm')
+        prods_norm = lic_data.get('productos_norm')
+        
+        if desc or (prods and len(prods) > 0) or desc_norm or prods_norm:
+            item_f2 = {
+                'descripcion': desc, 'productos_solicitados': prods,
+                'descripcion_norm': desc_norm, 'productos_norm': prods_norm,
+            }
+            pts2, det2 = self.calcular_puntaje_fase_2(item_f2)
+        
+        return pts1 + pts2, det1 + det2
+
+    def _filtrar_por_huellas(self, filas: List[dict]) -> Tuple[List[dict], List[str]]:
+        """
+        Descarta las filas ya puntuadas con estas mismas reglas y estos mismos datos
+        (huella_reglas y huella_entrada guardadas coinciden). Retorna (pendientes, huellas de entrada).
+        """
+        pendientes, huellas = [], []
+        for lic_data in filas:
+            huella = calcular_huella_entrada(lic_data)
+            vigente = (
+                lic_data.get('organismo_id') is not None
+                and lic_data.get('huella_entrada') == huella
+                and lic_data.get('huella_reglas') == self.huella_reglas
+            )
+            if not vigente:
+                pendientes.append(lic_data)
+                huellas.append(huella)
+        return pendientes, huellas
+
+    def _requiere_guardado(self, lic_data: dict, nuevo_score: int, huella: str) -> bool:
+        """Dirty Checking: cambió el puntaje o las huellas guardadas quedaron desactualizadas."""
+        return (
+            nuevo_score != lic_data.get('puntuacion_final_actual', 0)
+            or lic_data.get('huella_entrada') != huella
+            or lic_data.get('huella_reglas') != self.huella_reglas
+        )
+
+    def puntuar_particion(self, filas: List[dict]) -> List[Tuple[int, int, List[str], str]]:
+        """
+        Puntúa una partición y retorna las filas a guardar como (ca_id, puntaje, detalle, huella_entrada).
+        Las filas con huellas vigentes ni siquiera se puntúan.
+        """
+        cambios = []
+        pendientes, huellas = self._filtrar_por_huellas(filas)
+        for lic_data, huella in zip(pendientes, huellas):
+            nuevo_score, nuevo_detalle = self.calcular_puntaje_total(lic_data)
+            if self._requiere_guardado(lic_data, nuevo_score, huella):
+                cambios.append((lic_data['ca_id'], nuevo_score, nuevo_detalle, huella))
+        return cambios
+
+    # --- PUNTUACIÓN POR COLUMNAS (pandas) ---
+
+    def _columna_normalizada(self, df: pd.DataFrame, columna_norm: str, columna_cruda: str, normalizador) -> pd.Series:
+        """Texto normalizado de una columna: el persistido (*_norm) o, si falta, el calculado desde la cruda."""
+        if columna_norm in df:
+            textos = df[columna_norm].astype(object)
+        else:
+            textos = pd.Series(None, index=df.index, dtype=object)
+        faltantes = textos.isna()
+        if faltantes.any():
+            crudos = df[columna_cruda] if columna_cruda in df else pd.Series(None, index=df.index, dtype=object)
+            textos = textos.where(~faltantes, crudos[faltantes].map(normalizador))
+        return textos.fillna("").astype(object)
+
+    def _evaluar_columna_con_masking(self, textos: pd.Series, campo_puntaje: str, etiqueta: str) -> Tuple[pd.Series, Dict[int, List[str]]]:
+        """
+        Masking de una columna completa. La alternancia de keywords descarta en bloque las filas
+        sin ninguna coincidencia; solo las restantes pasan por '_evaluar_con_masking'.
+        Retorna (puntos por fila, {posición: detalle} de las filas con coincidencias).
+        """
+        puntos = [0] * len(textos)
+        detalles: Dict[int, List[str]] = {}
+
+        if self.automatas_palabras_clave.get(campo_puntaje) is None:
+            candidatas = textos != ""  # Recorrido clásico: sin prefiltro
+        elif self.regex_palabras_clave.get(campo_puntaje) is None:
+            return pd.Series(puntos, index=textos.index, dtype="int64"), detalles  # Ninguna keyword puntúa en este campo
+        else:
+            candidatas = textos.str.contains(self.regex_palabras_clave[campo_puntaje])
+
+        for posicion, texto in textos[candidatas].items():
+            pts, det = self._evaluar_con_masking(texto, campo_puntaje, etiqueta)
+            puntos[posicion] = pts
+            if det:
+                detalles[posicion] = det
+        return pd.Series(puntos, index=textos.index, dtype="int64"), detalles
+
+    def calcular_puntajes_lote(self, df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+        """
+        Variante por columnas de 'calcular_puntaje_total', con idéntico resultado.
+        Recibe un DataFrame con las columnas de una fila de recálculo (nombre_norm, descripcion_norm,
+        productos_norm, estado_ca_texto, organismo_id, organismo_nombre; los textos crudos solo
+        se usan donde falte su forma normalizada) y retorna (puntajes, detalles) alineados con 'df'.
+        """
+        indice_original = df.index
+        df = df.reset_index(drop=True)
+        vacia = pd.Series(None, index=df.index, dtype=object)
+
+        nom = self._columna_normalizada(df, "nombre_norm", "nombre", self._normalizar_texto)
+        desc = self._columna_normalizada(df, "descripcion_norm", "descripcion", self._normalizar_texto)
+        prods = self._columna_normalizada(df, "productos_norm", "productos_solicitados", normalizar_productos)
+
+        # 1. Organismo (id persistido o resuelto por nombre)
+        org_ids = (df["organismo_id"] if "organismo_id" in df else vacia).astype(object)
+        sin_id = org_ids.isna()
+        if sin_id.any():
+            nombres_org = df["organismo_nombre"] if "organismo_nombre" in df else vacia
+            org_ids = org_ids.where(~sin_id, nombres_org[sin_id].map(lambda n: self.resolutor_organismos.resolver(self._normalizar_texto(n))))
+        pts_no_deseado = org_ids.map(lambda oid: self.reglas_no_deseadas.get(oid) if oid else None)
+        pts_prioritario = org_ids.map(lambda oid: self.reglas_prioritarias.get(oid) if oid else None)
+
+        # 2. Estado
+        estados = (df["estado_ca_texto"] if "estado_ca_texto" in df else vacia).map(self._normalizar_texto)
+        es_segundo_llamado = estados.str.contains("segundo llamado", regex=False)
+
+        # 3. Keywords por campo
+        pts_nom, det_nom = self._evaluar_columna_con_masking(nom, "p_nom", "Título")
+        pts_desc, det_desc = self._evaluar_columna_con_masking(desc, "p_desc", "Desc.")
+        pts_prod, det_prod = self._evaluar_columna_con_masking(prods, "p_prod", "Prod.")
+
+        # 4. Fase 1 = max(0, prioritario + 2° llamado + título), salvo No Deseado o sin nombre
+        sin_nombre = nom == ""
+        con_no_deseado = pts_no_deseado.notna()
+        fase_1 = (pts_prioritario.fillna(0).astype("int64") + es_segundo_llamado.astype("int64") * PUNTOS_SEGUNDO_LLAMADO + pts_nom).clip(lower=0)
+        fase_1 = fase_1.mask(con_no_deseado, pts_no_deseado.fillna(0).astype("int64"))
+        fase_1 = fase_1.mask(sin_nombre, 0)
+        puntajes = fase_1 + pts_desc + pts_prod
+
+        detalles = []
+        filas_detalle = zip(sin_nombre.tolist(), pts_no_deseado.tolist(), pts_prioritario.tolist(), es_segundo_llamado.tolist())
+        for posicion, (es_sin_nombre, no_deseado, prioritario, segundo_llamado) in enumerate(filas_detalle):
+            if es_sin_nombre:
+                det_1 = ["Error: Sin nombre"]
+            elif pd.notna(no_deseado):
+                det_1 = [f"Organismo No Deseado ({int(no_deseado)})"]
+            else:
+                det_1 = []
+                if pd.notna(prioritario):
+                    pts = int(prioritario)
+                    det_1.append(f"Org. Prioritario ({'+' if pts>0 else ''}{pts})")
+                if segundo_llamado and PUNTOS_SEGUNDO_LLAMADO != 0:
+                    det_1.append(f"2° Llamado (+{PUNTOS_SEGUNDO_LLAMADO})")
+                det_1.extend(det_nom.get(posicion, []))
+            detalles.append(det_1 + det_desc.get(posicion, []) + det_prod.get(posicion, []))
+
+        return (
+            pd.Series(puntajes.to_numpy(), index=indice_original, dtype="int64"),
+            pd.Series(detalles, index=indice_original, dtype=object),
+        )
+
+    def puntuar_particion_lote(self, filas: List[dict]) -> List[Tuple[int, int, List[str], str]]:
+        """Igual que 'puntuar_particion', pero puntuando las filas pendientes por columnas."""
+        pendientes, huellas = self._filtrar_por_huellas(filas)
+        if not pendientes:
+            return []
+        puntajes, detalles = self.calcular_puntajes_lote(pd.DataFrame(pendientes))
+        return [
+            (lic_data['ca_id'], puntaje, detalle, huella)
+            for lic_data, puntaje, detalle, huella in zip(pendientes, puntajes.tolist(), detalles.tolist(), huellas)
+            if self._requiere_guardado(lic_data, puntaje, huella)
+        ]
+
+
+# --- PUNTUACIÓN MULTIPROCESO ---
+# Cada proceso del pool mantiene su propio motor, construido una sola vez a partir
+# de la instantánea de reglas (initializer), y recibe particiones de filas.
+
+_motor_del_proceso: Optional[MotorPuntajes] = None
+
+def inicializar_proceso_puntajes(reglas: Dict[str, Any]):
+    """Initializer del ProcessPoolExecutor: arma el motor del proceso sin acceso a BD."""
+    global _motor_del_proceso
+    _motor_del_proceso = MotorPuntajes(None, reglas=reglas)
+
+def puntuar_particion_en_proceso(filas: List[dict], vectorizado: bool = False) -> List[Tuple[int, int, List[str], str]]:
+    """Tarea del pool: puntúa una partición con el motor del proceso (fila a fila o por columnas)."""
+    if vectorizado:
+        return _motor_del_proceso.puntuar_particion_lote(filas)
+    return _motor_del_proceso.puntuar_particion(filas)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Limitador de Tasa (Token Bucket).
+
+Controla la cantidad de peticiones por segundo que se envían a cada host,
+de modo que varios hilos de descarga compartan un mismo presupuesto de
+peticiones sin saturar el portal de Mercado Público.
+"""
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlsplit
+
+
+class LimitadorTasa:
+    """
+    Cubeta de fichas (Token Bucket) segura para múltiples hilos.
+    Cada petición consume una ficha; las fichas se reponen a 'tasa' por segundo
+    hasta un máximo de 'capacidad' (ráfaga permitida).
+    """
+
+    def __init__(self, tasa: float, capacidad: int = 1):
+        self.tasa = max(float(tasa), 0.0)
+        self.capacidad = max(int(capacidad), 1)
+        self._fichas = float(self.capacidad)
+        self._ultimo = time.monotonic()
+        self._candado = threading.Lock()
+
+    def adquirir(self):
+        """Bloquea el hilo actual hasta que haya una ficha disponible."""
+        if self.tasa <= 0:
+            return  # Sin límite configurado
+
+        while True:
+            with self._candado:
+                ahora = time.monotonic()
+                self._fichas = min(self.capacidad, self._fichas + (ahora - self._ultimo) * self.tasa)
+                self._ultimo = ahora
+
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return
+                espera = (1 - self._fichas) / self.tasa
+
+            time.sleep(espera)
+
+
+class LimitadorTasaPorHost:
+    """Mantiene una cubeta independiente por cada host de destino."""
+
+    def __init__(self, tasa: float, capacidad: int = 1):
+        self.tasa = tasa
+        self.capacidad = capacidad
+        self._limitadores: Dict[str, LimitadorTasa] = {}
+        self._candado = threading.Lock()
+
+    def adquirir(self, url: str):
+        host = urlsplit(url).netloc
+        with self._candado:
+            limitador = self._limitadores.get(host)
+            if limitador is None:
+                limitador = LimitadorTasa(self.tasa, self.capacidad)
+                self._limitadores[host] = limitador
+        limitador.adquirir()
@@ -7,14 +7,23 @@ Implementa una arquitectura híbrida para máxima eficiencia:
 2. Requests: Se usa para la descarga masiva de datos usando los tokens capturados.
 """
 import time
+import queue
+import threading
 import requests 
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from requests.adapters import HTTPAdapter
 from playwright.sync_api import sync_playwright, Playwright
-from typing import Optional, Dict, Callable, List, Any
+from typing import Optional, Dict, Callable, List, Any, Iterable, Iterator, Tuple
 
 from src.utils.logger import configurar_logger
+from src.logic.schemas import LicitacionDetalleSchema
 from . import api_handler as manejador_api
 from . import url_builder as constructor_url
-from config.config import MODO_HEADLESS, HEADERS_API
+from .rate_limiter import LimitadorTasa, LimitadorTasaPorHost
+from config.config import (
+    MODO_HEADLESS, HEADERS_API, MAX_REINTENTOS, FASE2_MAX_HILOS, FASE2_PETICIONES_POR_SEGUNDO,
+    LISTADO_MAX_HILOS, LISTADO_PETICIONES_POR_SEGUNDO, LISTADO_MAX_PAGINAS
+)
 
 logger = configurar_logger(__name__)
 
@@ -25,6 +34,25 @@ class ServicioScraper:
         self.headers_sesion = {} 
         self.cookies_sesion = {}
 
+        # Sesión HTTP compartida (Keep-Alive) y limitador de tasa para Fase 2
+        self._sesion_detalle: Optional[requests.Session] = None
+        self._candado_sesion = threading.Lock()
+        self.limitador_detalle = LimitadorTasaPorHost(FASE2_PETICIONES_POR_SEGUNDO, capacidad=FASE2_MAX_HILOS)
+
+    def _obtener_sesion_detalle(self) -> requests.Session:
+        """
+        Retorna una única sesión HTTP reutilizable entre hilos.
+        El pool del adaptador se dimensiona para que cada hilo mantenga su conexión viva.
+        """
+        with self._candado_sesion:
+            if self._sesion_detalle is None:
+                sesion = requests.Session()
+                adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=max(FASE2_MAX_HILOS, 1))
+                sesion.mount("https://", adaptador)
+                sesion.mount("http://", adaptador)
+                self._sesion_detalle = sesion
+            return self._sesion_detalle
+
     def _capturar_credenciales_playwright(self, p: Playwright, callback_progreso: Callable[[str], None]):
         """
         Lanza un navegador real (Chrome/Chromium) para navegar al sitio,
@@ -109,10 +137,24 @@ class ServicioScraper:
         with sync_playwright() as p:
             self._capturar_credenciales_playwright(p, callback_progreso)
 
-    def ejecutar_scraper_listado(self, callback_progreso: Callable[[str], None], filtros: Optional[Dict] = None, max_paginas: Optional[int] = None) -> List[Dict]:
+    def ejecutar_scraper_listado(self, callback_progreso: Callable[[str], None], filtros: Optional[Dict] = None, max_paginas: Optional[int] = None, paralelo: bool = False, max_hilos: Optional[int] = None) -> List[Dict]:
         """
         Fase 1: Descarga masiva de listados.
+        Acumula todas las páginas de 'iterar_paginas_listado' y las deduplica por código.
+        """
+        todas_las_compras = []
+        for items in self.iterar_paginas_listado(callback_progreso, filtros, max_paginas, paralelo, max_hilos):
+            todas_las_compras.extend(items)
+            
+        # Deduplicación de seguridad (por código ID)
+        unicas = {c.get('codigo', c.get('id')): c for c in todas_las_compras}
+        return list(unicas.values())
+
+    def iterar_paginas_listado(self, callback_progreso: Callable[[str], None], filtros: Optional[Dict] = None, max_paginas: Optional[int] = None, paralelo: bool = False, max_hilos: Optional[int] = None) -> Iterator[List[Dict]]:
+        """
+        Fase 1 en streaming: entrega los items de cada página, en orden, apenas se descargan.
         Utiliza 'requests' con los tokens capturados para iterar páginas rápidamente.
+        Con 'paralelo=True' las páginas 2..N se descargan con un pool de hilos (ver _iterar_listado_paralelo).
         """
         logger.info(f"INICIANDO FASE 1. Filtros activos: {filtros}")
         
@@ -121,14 +163,66 @@ class ServicioScraper:
             with sync_playwright() as p:
                 self._capturar_credenciales_playwright(p, callback_progreso)
         
-        todas_las_compras = []
-        pagina_actual = 1
-        total_paginas_estimado = 1
-        
         # Sesión HTTP persistente para reutilizar conexión TCP (Keep-Alive)
         sesion_http = requests.Session()
         sesion_http.headers.update(self.headers_sesion)
 
+        if paralelo:
+            yield from self._iterar_listado_paralelo(sesion_http, callback_progreso, filtros, max_paginas, max_hilos)
+        else:
+            # Una página por delante: la siguiente se descarga mientras se guarda y puntúa la actual
+            yield from self._precargar_paginas(self._iterar_listado_secuencial(sesion_http, callback_progreso, filtros, max_paginas))
+
+    def _precargar_paginas(self, paginas: Iterator[List[Dict]]) -> Iterator[List[Dict]]:
+        """
+        Recorre 'paginas' en un hilo propio y entrega sus items en orden, con a lo sumo una
+        página descargada a la espera. Si el consumidor se detiene, el hilo termina tras la
+        página en curso.
+        """
+        cola: queue.Queue = queue.Queue(maxsize=1)
+        detener = threading.Event()
+        fin = object()
+
+        def encolar(elemento) -> bool:
+            while not detener.is_set():
+                try:
+                    cola.put(elemento, timeout=0.2)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def productor():
+            try:
+                for items in paginas:
+                    if not encolar(items):
+                        break
+            except Exception as e:
+                encolar(e)
+                return
+            finally:
+                paginas.close()
+            encolar(fin)
+
+        hilo = threading.Thread(target=productor, name="listado-precarga", daemon=True)
+        hilo.start()
+        try:
+            while True:
+                elemento = cola.get()
+                if elemento is fin:
+                    break
+                if isinstance(elemento, Exception):
+                    raise elemento
+                yield elemento
+        finally:
+            detener.set()
+            hilo.join()
+
+    def _iterar_listado_secuencial(self, sesion_http: requests.Session, callback_progreso: Callable[[str], None], filtros: Optional[Dict], max_paginas: Optional[int]) -> Iterator[List[Dict]]:
+        """Recorre las páginas una a una con una pausa de cortesía entre peticiones."""
+        pagina_actual = 1
+        total_paginas_estimado = 1
+
         try:
             while True:
                 # Condiciones de salida
@@ -136,7 +230,7 @@ class ServicioScraper:
                     break
                 if total_paginas_estimado > 0 and pagina_actual > total_paginas_estimado: 
                     break
-                if pagina_actual > 600: # Límite de seguridad
+                if pagina_actual > LISTADO_MAX_PAGINAS: # Límite de seguridad
                     break 
 
                 if callback_progreso: 
@@ -165,7 +259,7 @@ class ServicioScraper:
                 if not items: 
                     break
 
-                todas_las_compras.extend(items)
+                yield items
                 pagina_actual += 1
                 
                 # Pausa de cortesía para no saturar el servidor
@@ -173,18 +267,92 @@ class ServicioScraper:
 
         except Exception as e:
             logger.error(f"Excepción durante scraping de listado: {e}")
-            # Retornamos lo que hayamos capturado hasta el error
-            
-        # Deduplicación de seguridad (por código ID)
-        unicas = {c.get('codigo', c.get('id')): c for c in todas_las_compras}
-        return list(unicas.values())
+            # Las páginas ya entregadas se conservan; simplemente se corta el flujo
+
+    def _pedir_pagina_listado(self, sesion_http: requests.Session, pagina: int, filtros: Optional[Dict], limitador: LimitadorTasa) -> Optional[Dict]:
+        """
+        Descarga una página del listado respetando el limitador de tasa.
+        Reintenta ante errores de red, 429 o 5xx; retorna None si la página no se pudo obtener.
+        """
+        url = constructor_url.construir_url_api_listado(pagina, filtros)
+        for intento in range(1, MAX_REINTENTOS + 1):
+            limitador.adquirir()
+            try:
+                resp = sesion_http.get(url, timeout=15)
+            except requests.RequestException as e:
+                logger.warning(f"Página {pagina}: error de red ({e}), intento {intento}/{MAX_REINTENTOS}")
+                time.sleep(intento)
+                continue
+
+            if resp.status_code == 200:
+                return resp.json()
+            if resp.status_code == 429 or resp.status_code >= 500:
+                logger.warning(f"Página {pagina}: HTTP {resp.status_code}, intento {intento}/{MAX_REINTENTOS}")
+                time.sleep(intento)
+                continue
+
+            logger.warning(f"Error HTTP {resp.status_code} leyendo página {pagina}")
+            return None
+        return None
+
+    def _iterar_listado_paralelo(self, sesion_http: requests.Session, callback_progreso: Callable[[str], None], filtros: Optional[Dict], max_paginas: Optional[int], max_hilos: Optional[int] = None) -> Iterator[List[Dict]]:
+        """
+        Modo 'listado paralelo': la página 1 entrega 'pageCount'; las páginas restantes se
+        descargan con un pool de N hilos detrás de un token bucket y se entregan en orden.
+        Igual que el modo secuencial, se detiene en la primera página fallida o vacía.
+        """
+        hilos = max(int(max_hilos or LISTADO_MAX_HILOS), 1)
+        sesion_http.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=hilos))
+        limitador = LimitadorTasa(LISTADO_PETICIONES_POR_SEGUNDO, capacidad=hilos)
 
-    def extraer_detalle_api(self, _, codigo_ca: str, callback_progreso: Callable[[str], None] = None) -> Optional[Dict]:
+        try:
+            if callback_progreso:
+                callback_progreso("Descargando página 1...")
+            datos_json = self._pedir_pagina_listado(sesion_http, 1, filtros, limitador)
+            if not datos_json:
+                return
+
+            total_paginas = manejador_api.extraer_metadata_paginacion(datos_json).get('total_paginas', 0)
+            items = manejador_api.extraer_resultados_lista(datos_json)
+            if total_paginas == 0 or not items:
+                return
+            yield items
+
+            ultima = min(total_paginas, LISTADO_MAX_PAGINAS)
+            if max_paginas:
+                ultima = min(ultima, max_paginas)
+
+            with ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="listado") as pool:
+                en_vuelo = {}
+                siguiente = 2
+                for pagina in range(2, ultima + 1):
+                    # Ventana acotada de páginas en vuelo (prefetch)
+                    while siguiente <= ultima and len(en_vuelo) < hilos * 2:
+                        en_vuelo[siguiente] = pool.submit(self._pedir_pagina_listado, sesion_http, siguiente, filtros, limitador)
+                        siguiente += 1
+
+                    datos_json = en_vuelo.pop(pagina).result()
+                    items = manejador_api.extraer_resultados_lista(datos_json) if datos_json else []
+                    if not items:
+                        for futuro in en_vuelo.values():
+                            futuro.cancel()
+                        break
+
+                    yield items
+                    if callback_progreso:
+                        callback_progreso(f"Descargada página {pagina} de {ultima}...")
+
+        except Exception as e:
+            logger.error(f"Excepción durante scraping de listado paralelo: {e}")
+            # Las páginas ya entregadas se conservan; simplemente se corta el flujo
+
+    def extraer_detalle_api(self, _, codigo_ca: str, callback_progreso: Callable[[str], None] = None) -> Optional[LicitacionDetalleSchema]:
         url_api = constructor_url.construir_url_api_ficha(codigo_ca)
         
         try:
             headers = self.headers_sesion or HEADERS_API
-            resp = requests.get(url_api, headers=headers, timeout=10)
+            self.limitador_detalle.adquirir(url_api)
+            resp = self._obtener_sesion_detalle().get(url_api, headers=headers, timeout=10)
 
             if resp.status_code != 200:
                 return None
@@ -196,4 +364,36 @@ class ServicioScraper:
         if datos and datos.get('success') == 'OK' and datos.get('payload'):
             return manejador_api.normalizar_datos_ficha(datos['payload'])
             
-        return None
\ No newline at end of file
+        return None
+
+    def extraer_detalles_concurrente(self, codigos: Iterable[str], max_hilos: Optional[int] = None) -> Iterator[Tuple[str, Optional[LicitacionDetalleSchema]]]:
+        """
+        Fase 2 concurrente: descarga el detalle de varias fichas con un pool acotado de hilos.
+        Entrega cada resultado (codigo, detalle) apenas llega, sin esperar al resto del lote.
+        El ritmo global lo controla el limitador de tasa por host.
+        """
+        hilos = max(int(max_hilos or FASE2_MAX_HILOS), 1)
+        pendientes_codigos = iter(codigos)
+        en_vuelo = {}
+
+        with ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="fase2") as pool:
+            # Ventana acotada: nunca más de 2x hilos tareas en memoria
+            def _rellenar():
+                while len(en_vuelo) < hilos * 2:
+                    codigo = next(pendientes_codigos, None)
+                    if codigo is None:
+                        return
+                    en_vuelo[pool.submit(self.extraer_detalle_api, None, codigo)] = codigo
+
+            _rellenar()
+            while en_vuelo:
+                listos, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                for futuro in listos:
+                    codigo = en_vuelo.pop(futuro)
+                    try:
+                        resultado = futuro.result()
+                    except Exception as e:
+                        logger.error(f"Error descargando detalle {codigo}: {e}")
+                        resultado = None
+                    yield codigo, resultado
+                _rellenar()
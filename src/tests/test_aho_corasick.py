@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitarios para el autómata Aho–Corasick y su uso en el masking de MotorPuntajes.
+"""
+import random
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from src.logic.aho_corasick import AutomataAhoCorasick
+from src.logic.score_engine import MotorPuntajes
+
+
+def _motor_con_keywords(keywords):
+    db = MagicMock()
+    db.obtener_todas_palabras_clave.return_value = [
+        SimpleNamespace(keyword=k, puntos_nombre=pn, puntos_descripcion=pd, puntos_productos=pp)
+        for k, pn, pd, pp in keywords
+    ]
+    db.obtener_reglas_organismos.return_value = []
+    db.obtener_todos_organismos.return_value = []
+    return MotorPuntajes(db)
+
+
+def test_automata_encuentra_ocurrencias_solapadas():
+    automata = AutomataAhoCorasick(["he", "she", "his", "hers", "e"])
+    encontrados = sorted(automata.buscar("ushers"))
+    assert encontrados == [(1, 1), (2, 0), (2, 3), (3, 4)]
+    assert automata.ocurrencias("aaa") == {}
+
+
+def test_masking_respeta_frase_mas_larga_primero():
+    motor = _motor_con_keywords([
+        ("ferretería", 5, 0, 0),
+        ("materiales de ferretería", 10, 0, 0),
+    ])
+    puntos, detalle = motor._evaluar_con_masking("compra de materiales de ferreteria y ferreteria menor", "p_nom", "Título")
+    assert puntos == 15
+    assert detalle == ["KW Título: 'materiales de ferretería' (+10)", "KW Título: 'ferretería' (+5)"]
+
+    puntos, _ = motor._evaluar_con_masking("materiales de ferreteria", "p_nom", "Título")
+    assert puntos == 10
+
+
+def test_masking_automata_equivale_al_recorrido_clasico():
+    """Textos y keywords aleatorios sobre un alfabeto chico: ambos caminos deben coincidir siempre."""
+    azar = random.Random(1234)
+    alfabeto = "ab c"
+    for _ in range(200):
+        keywords = {}
+        for _ in range(azar.randint(1, 8)):
+            kw = "".join(azar.choice(alfabeto) for _ in range(azar.randint(1, 4))).strip()
+            if kw:
+                keywords[kw] = (kw, azar.choice([0, 1, 3, -2]), azar.choice([0, 2]), 1)
+        # Dos keywords distintas con el mismo texto normalizado
+        if "ab" in keywords:
+            keywords["AB"] = ("AB", 4, 1, 1)
+        motor = _motor_con_keywords(list(keywords.values()))
+
+        for _ in range(10):
+            texto = "".join(azar.choice(alfabeto) for _ in range(azar.randint(0, 30)))
+            for campo in ("p_nom", "p_desc", "p_prod"):
+                assert motor._evaluar_con_masking(texto, campo, "X") == \
+                    motor._evaluar_con_masking_secuencial(texto, campo, "X"), (texto, keywords, campo)
+
+
+def test_keyword_con_almohadilla_usa_recorrido_clasico():
+    motor = _motor_con_keywords([("item #1", 3, 0, 0), ("item", 1, 0, 0)])
+    assert motor.automatas_palabras_clave["p_nom"] is None
+    assert motor._evaluar_con_masking("item #1 e item", "p_nom", "Título")[0] == 4
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitarios para la carga masiva: Upsert por lotes y motor COPY.
+"""
+import csv
+from unittest.mock import MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from src.db.db_service import DbService, COLUMNAS_STAGING
+from src.logic.etl_service import ServicioEtl
+
+
+def _compras(n):
+    return [{"codigo": f"CA-{i}", "nombre": f"Compra {i}", "organismo": "Muni"} for i in range(n)]
+
+
+def test_sentencia_upsert_devuelve_marca_de_insercion():
+    sql = str(DbService(MagicMock())._sentencia_upsert_licitaciones().compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (codigo_ca) DO UPDATE" in sql
+    assert "RETURNING (xmax = 0)" in sql
+
+
+def test_upsert_por_lotes_reporta_insertados_y_actualizados():
+    sesion = MagicMock()
+    lotes = []
+
+    def ejecutar(_stmt, lote):
+        lotes.append(lote)
+        # Las filas con índice par ya existían (actualizadas)
+        resultado = MagicMock()
+        resultado.scalars.return_value.all.return_value = [int(r["codigo_ca"][3:]) % 2 == 1 for r in lote]
+        return resultado
+
+    sesion.connection.return_value.execute.side_effect = ejecutar
+    sesion.__enter__.return_value = sesion
+    servicio = DbService(lambda: sesion)
+    servicio._preparar_mapa_organismos = MagicMock(return_value={"Muni": 1})
+
+    # 'CA-3' duplicado: se descarta antes de enviar
+    totales = servicio.insertar_o_actualizar_masivo(_compras(7) + _compras(4)[3:], tamano_lote=3)
+
+    assert [len(l) for l in lotes] == [3, 3, 1]
+    assert lotes[0][0]["organismo_id"] == 1
+    assert totales == {"insertados": 3, "actualizados": 4}
+    assert sesion.commit.call_count >= 3
+
+
+def test_copy_serializa_csv_en_orden_de_columnas():
+    compras = [
+        {"codigo": "CA-1", "nombre": 'Compra "A", urgente', "organismo": " Muni ", "monto_disponible_CLP": 1500.0},
+        {"nombre": "Sin código"},
+        {"codigo": "CA-2", "nombre": "Compra B", "organismo": None},
+    ]
+    filas = list(csv.reader(DbService(MagicMock())._serializar_para_copy(compras)))
+
+    assert len(filas) == 2
+    assert len(filas[0]) == len(COLUMNAS_STAGING)
+    fila = dict(zip(COLUMNAS_STAGING, filas[0]))
+    assert [fila["orden"], fila["codigo_ca"], fila["nombre"], fila["monto_clp"]] == ["0", "CA-1", 'Compra "A", urgente', "1500.0"]
+    assert fila["nombre_norm"] == 'compra "a", urgente'
+    assert fila["organismo_nombre"] == "Muni"
+    # Los nulos viajan como campo vacío (NULL en COPY csv)
+    assert filas[1][0] == "2" and filas[1][4] == "" and filas[1][-1] == "No Especificado"
+
+
+def test_etl_elige_motor_de_ingesta():
+    db_service = MagicMock()
+    etl = ServicioEtl(db_service, MagicMock(), MagicMock(), motor_ingesta="copy")
+    etl._guardar_listado([{"codigo": "CA-1"}])
+    etl._guardar_listado([{"codigo": "CA-2"}], motor_ingesta="upsert")
+
+    db_service.insertar_o_actualizar_masivo_copy.assert_called_once_with([{"codigo": "CA-1"}])
+    db_service.insertar_o_actualizar_masivo.assert_called_once_with([{"codigo": "CA-2"}])
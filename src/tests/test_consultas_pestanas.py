@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitarios para las consultas de las pestañas: feed de cambios, proyecciones y paginación.
+"""
+from datetime import datetime
+
+from src.db.db_models import CaLicitacion, CaOrganismo, CaSector, EstadoCa, codigo_estado
+from src.db.db_proyecciones import LicitacionResumen
+
+
+def _crear_licitaciones(db_session, cantidad=3):
+    db_session.add_all([
+        CaLicitacion(codigo_ca=f"CA-{i}", nombre=f"Compra {i}", puntuacion_final=20, estado_ca_texto="Publicada")
+        for i in range(cantidad)
+    ])
+    db_session.commit()
+    return [ca.ca_id for ca in db_session.query(CaLicitacion).order_by(CaLicitacion.ca_id)]
+
+
+def test_acciones_de_usuario_notifican_ca_id(db_service, db_session):
+    ca_id, otro_id, _ = _crear_licitaciones(db_session)
+    recibidos = []
+    desuscribir = db_service.suscribir_cambios(recibidos.append)
+
+    db_service.gestionar_favorito(ca_id, True)
+    db_service.gestionar_ofertada(otro_id, True)
+    db_service.ocultar_licitacion(ca_id, True)
+    db_service.guardar_nota_usuario(otro_id, "Revisar bases")
+    assert recibidos == [[ca_id], [otro_id], [ca_id], [otro_id]]
+
+    desuscribir()
+    db_service.gestionar_favorito(ca_id, False)
+    assert len(recibidos) == 4
+
+
+def test_suscriptor_con_error_no_interrumpe_la_accion(db_service, db_session):
+    ca_id, _, _ = _crear_licitaciones(db_session)
+    recibidos = []
+
+    def fallar(ca_ids):
+        raise RuntimeError("GUI cerrada")
+
+    db_service.suscribir_cambios(fallar)
+    db_service.suscribir_cambios(recibidos.append)
+    db_service.gestionar_favorito(ca_id, True)
+
+    assert recibidos == [[ca_id]]
+    assert [lic.ca_id for lic in db_service.obtener_licitaciones_seguimiento()] == [ca_id]
+
+
+def test_pestanas_por_ids_reflejan_la_pertenencia_actual(db_service, db_session):
+    favorita, ofertada, candidata = _crear_licitaciones(db_session)
+    db_service.gestionar_favorito(favorita, True)
+    db_service.gestionar_ofertada(ofertada, True)
+
+    pestanas = db_service.obtener_pestanas_por_ids([favorita, ofertada, candidata], umbral_minimo=5)
+
+    assert [lic.ca_id for lic in pestanas["candidatas"]] == [candidata]
+    assert [lic.ca_id for lic in pestanas["seguimiento"]] == [favorita]
+    assert [lic.ca_id for lic in pestanas["ofertadas"]] == [ofertada]
+    # Solo las licitaciones pedidas
+    assert db_service.obtener_pestanas_por_ids([favorita])["candidatas"] == []
+
+
+def test_resumenes_proyectan_las_columnas_de_la_tabla(db_service, db_session):
+    sector = CaSector(nombre="Salud")
+    db_session.add(CaOrganismo(nombre="Hospital Regional", sector=sector))
+    db_session.commit()
+    organismo_id = db_session.query(CaOrganismo).one().organismo_id
+    db_session.add_all([
+        CaLicitacion(codigo_ca="CA-1", nombre="Camión", descripcion="Texto largo", puntuacion_final=30,
+                     puntaje_detalle=["Título: camion (+30)"], estado_ca_texto="Publicada", organismo_id=organismo_id),
+        CaLicitacion(codigo_ca="CA-2", nombre="Papel", puntuacion_final=8, estado_ca_texto="Publicada"),
+    ])
+    db_session.commit()
+    ids = [ca.ca_id for ca in db_session.query(CaLicitacion).order_by(CaLicitacion.ca_id)]
+    db_service.guardar_nota_usuario(ids[1], "Cotizar")
+
+    candidatas = db_service.obtener_resumen_candidatas(umbral_minimo=5)
+
+    assert all(isinstance(r, LicitacionResumen) for r in candidatas)
+    assert [r.ca_id for r in candidatas] == [ca.ca_id for ca in db_service.obtener_candidatas_filtradas(umbral_minimo=5)]
+    assert (candidatas[0].organismo_nombre, candidatas[0].puntaje_detalle) == ("Hospital Regional", ["Título: camion (+30)"])
+    assert (candidatas[1].organismo_nombre, candidatas[1].notas) == (None, "Cotizar")
+    assert not hasattr(candidatas[0], "descripcion")
+
+
+def _paginar(consulta, limite):
+    filas, ultima = [], None
+    while True:
+        pagina = consulta(limite=limite, despues_de=ultima)
+        filas.extend(pagina)
+        if len(pagina) < limite:
+            return filas
+        ultima = pagina[-1]
+
+
+def test_paginacion_keyset_recorre_todas_las_filas_una_vez(db_service, db_session):
+    db_session.add_all([
+        CaLicitacion(codigo_ca=f"CA-{i}", nombre=f"Compra {i}", puntuacion_final=10 + i % 4, estado_ca_texto="Publicada",
+                     fecha_cierre=None if i % 5 == 0 else datetime(2026, 5, 1 + i % 3))
+        for i in range(23)
+    ])
+    db_session.commit()
+    ids = [ca.ca_id for ca in db_session.query(CaLicitacion)]
+    for ca_id in ids[:13]:
+        db_service.gestionar_favorito(ca_id, True)
+
+    for consulta in (lambda **p: db_service.obtener_resumen_candidatas(umbral_minimo=5, **p), db_service.obtener_resumen_seguimiento):
+        completa = [r.ca_id for r in consulta()]
+        for limite in (1, 3, 4, 50):
+            assert [r.ca_id for r in _paginar(consulta, limite)] == completa
+    # Empates de puntaje y cierres NULL al final
+    seguimiento = db_service.obtener_resumen_seguimiento()
+    assert [r.fecha_cierre is None for r in seguimiento][-3:] == [True, True, True]
+
+
+def test_filtros_de_la_tabla_se_aplican_en_sql(db_service, db_session):
+    from datetime import date
+    sector = CaSector(nombre="Salud")
+    db_session.add(CaOrganismo(nombre="Municipalidad de Ñuñoa", sector=sector))
+    db_session.commit()
+    organismo_id = db_session.query(CaOrganismo).one().organismo_id
+    db_session.add_all([
+        CaLicitacion(codigo_ca="1000-1-COT25", nombre="Camión aljibe", puntuacion_final=30, estado_ca_texto="Publicada",
+                     monto_clp=5_000_000, fecha_publicacion=date(2026, 3, 1), fecha_cierre=datetime(2026, 3, 10, 18, 0)),
+        CaLicitacion(codigo_ca="1000-2-COT25", nombre="Papel 100% reciclado", puntuacion_final=20, estado_ca_texto="Publicada - Segundo llamado",
+                     estado_convocatoria=2, monto_clp=90_000, fecha_publicacion=date(2026, 3, 5), organismo_id=organismo_id),
+        CaLicitacion(codigo_ca="1000-3-COT25", nombre="Tolva", puntuacion_final=10, estado_ca_texto="Publicada",
+                     fecha_publicacion=date(2026, 3, 8), fecha_cierre=datetime(2026, 3, 11, 9, 0)),
+    ])
+    db_session.commit()
+
+    def codigos(texto="", **filtros):
+        return [r.codigo_ca[5] for r in db_service.obtener_resumen_candidatas(umbral_minimo=5, filtros=filtros, texto=texto)]
+
+    assert codigos() == ["1", "2", "3"]
+    # SQLite solo compara sin mayúsculas en ASCII; PostgreSQL (ILIKE) también en acentos y ñ
+    assert codigos("CAMIón") == ["1"]
+    assert codigos("MUNICIPALIDAD DE Ñ") == ["2"]  # Nombre del organismo
+    assert codigos("-3-") == ["3"]            # Código
+    assert codigos("100%") == ["2"]           # Comodines escapados
+    assert codigos(monto=100_000) == ["1"]
+    assert codigos(**{"2do_llamado": True}) == ["2"]
+    assert codigos(selected_states=["Publicada"]) == ["1", "3"]
+    assert codigos(pub_from=date(2026, 3, 5), pub_to=date(2026, 3, 7)) == ["2"]
+    assert codigos(close_from=date(2026, 3, 10), close_to=date(2026, 3, 10)) == ["1"]
+
+
+def test_estado_codigo_se_deriva_del_texto(db_service, db_session):
+    textos = ["Publicada", "Publicada - Segundo llamado", "CERRADA", "OC Emitida", None]
+    assert [codigo_estado(t) for t in textos] == [EstadoCa.PUBLICADA, EstadoCa.SEGUNDO_LLAMADO, EstadoCa.CERRADA, EstadoCa.OTRO, None]
+
+    ca_id, = _crear_licitaciones(db_session, cantidad=1)
+    licitacion = db_session.get(CaLicitacion, ca_id)
+    assert licitacion.estado_codigo == EstadoCa.PUBLICADA
+    licitacion.fecha_cierre = datetime(2020, 1, 1)
+    db_session.commit()
+
+    assert db_service.cerrar_licitaciones_vencidas_localmente() == 1
+    licitacion = db_session.get(CaLicitacion, ca_id)
+    assert (licitacion.estado_ca_texto, licitacion.estado_codigo) == ("Cerrada", EstadoCa.CERRADA)
+    assert db_service.obtener_resumen_candidatas(umbral_minimo=5) == []
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitarios para la Fase 2 concurrente (pool de hilos + limitador de tasa).
+"""
+import time
+import threading
+from unittest.mock import MagicMock
+
+from sqlalchemy import select
+
+from src.db.db_models import CaLicitacion
+from src.logic.schemas import LicitacionDetalleSchema
+from src.logic.etl_service import ServicioEtl
+from src.scraper.rate_limiter import LimitadorTasa
+from src.scraper.scraper_service import ServicioScraper
+
+
+def test_limitador_respeta_tasa():
+    """Con 20 peticiones/seg y ráfaga 1, 5 fichas deben tomar al menos ~0.2 segundos."""
+    limitador = LimitadorTasa(tasa=20, capacidad=1)
+    inicio = time.monotonic()
+    for _ in range(5):
+        limitador.adquirir()
+    assert time.monotonic() - inicio >= 0.18
+
+
+def test_extraccion_concurrente_entrega_todos_los_codigos():
+    """Todos los códigos deben volver exactamente una vez, usando más de un hilo."""
+    scraper = ServicioScraper()
+    hilos_usados = set()
+
+    def detalle_falso(_, codigo):
+        hilos_usados.add(threading.get_ident())
+        time.sleep(0.01)
+        return LicitacionDetalleSchema(descripcion=f"Detalle {codigo}")
+
+    scraper.extraer_detalle_api = detalle_falso
+    codigos = [f"CA-{i}" for i in range(30)]
+
+    resultados = dict(scraper.extraer_detalles_concurrente(codigos, max_hilos=4))
+
+    assert set(resultados) == set(codigos)
+    assert resultados["CA-7"].descripcion == "Detalle CA-7"
+    assert len(hilos_usados) > 1
+
+
+def test_procesar_detalle_lote_puntua_y_guarda_en_bloque():
+    """Cada ficha descargada se puntúa (Fase 1 + Fase 2) y se guarda en bloque; las fallidas se omiten."""
+    db_service = MagicMock()
+    motor = MagicMock()
+    motor.calcular_puntaje_fase_1.return_value = (10, ["KW Título"])
+    motor.calcular_puntaje_fase_2.return_value = (5, ["KW Desc."])
+
+    scraper = MagicMock()
+    scraper.extraer_detalles_concurrente.return_value = iter([
+        ("CA-1", LicitacionDetalleSchema(descripcion="ok", estado="Publicada")),
+        ("CA-2", None),
+    ])
+
+    etl = ServicioEtl(db_service, scraper, motor)
+    candidatas = [
+        {"codigo": "CA-1", "nombre": "Compra 1", "estado_ca_texto": "Publicada", "organismo_nombre": "Muni"},
+        {"codigo": "CA-2", "nombre": "Compra 2", "estado_ca_texto": "Publicada", "organismo_nombre": "Muni"},
+    ]
+    etl._procesar_detalle_lote(candidatas, lambda m: None, lambda p: None)
+
+    db_service.actualizar_fase_2_detalle.assert_not_called()
+    db_service.actualizar_fase_2_detalle_en_lote.assert_called_once()
+    (lote,) = db_service.actualizar_fase_2_detalle_en_lote.call_args.args
+    assert len(lote) == 1
+    codigo, datos, puntaje, detalle = lote[0]
+    assert codigo == "CA-1"
+    assert datos["descripcion"] == "ok"
+    assert puntaje == 15
+    assert detalle == ["KW Título", "KW Desc."]
+
+
+def test_actualizar_fase_2_en_lote_respeta_estado_existente(db_service, db_session):
+    """El UPDATE masivo escribe el detalle y solo pisa estado/convocatoria si la ficha los trae."""
+    db_session.add_all([
+        CaLicitacion(codigo_ca="CA-1", nombre="Compra 1", estado_ca_texto="Publicada", estado_convocatoria=1, puntuacion_final=0),
+        CaLicitacion(codigo_ca="CA-2", nombre="Compra 2", estado_ca_texto="Publicada", estado_convocatoria=1, puntuacion_final=0),
+    ])
+    db_session.commit()
+
+    db_service.actualizar_fase_2_detalle_en_lote([
+        ("CA-1", {"descripcion": "Detalle 1", "productos_solicitados": [{"nombre": "Papel"}], "estado": "Cerrada", "estado_convocatoria": 2}, 12, ["KW"]),
+        ("CA-2", {"descripcion": "Detalle 2", "productos_solicitados": [], "estado": None, "estado_convocatoria": None}, 3, []),
+    ], tamano_commit=1)
+
+    db_session.expire_all()
+    ca1 = db_session.scalars(select(CaLicitacion).filter_by(codigo_ca="CA-1")).one()
+    ca2 = db_session.scalars(select(CaLicitacion).filter_by(codigo_ca="CA-2")).one()
+    assert (ca1.descripcion, ca1.estado_ca_texto, ca1.estado_convocatoria, ca1.puntuacion_final) == ("Detalle 1", "Cerrada", 2, 12)
+    assert ca1.productos_solicitados == [{"nombre": "Papel"}]
+    assert (ca2.descripcion, ca2.estado_ca_texto, ca2.estado_convocatoria, ca2.puntuacion_final) == ("Detalle 2", "Publicada", 1, 3)
+
+
+def test_importar_lista_manual_guarda_en_bloque_y_asigna_destino():
+    db_service = MagicMock()
+    db_service.obtener_ids_por_codigo.return_value = {"CA-1": 7}
+    motor = MagicMock()
+    motor.calcular_puntaje_fase_1.return_value = (1, [])
+    motor.calcular_puntaje_fase_2.return_value = (2, [])
+    scraper = MagicMock(spec=["extraer_detalles_concurrente"])
+    scraper.extraer_detalles_concurrente.return_value = iter([
+        ("CA-1", LicitacionDetalleSchema(descripcion=None, organismo_nombre="Hospital")),
+        ("CA-2", None),
+    ])
+
+    etl = ServicioEtl(db_service, scraper, motor)
+    importados = etl.importar_lista_manual([" ca-1", "CA-1", "ca-2 ", ""], "seguimiento")
+
+    assert importados == 1
+    scraper.extraer_detalles_concurrente.assert_called_once_with(["CA-1", "CA-2"])
+    (registros,) = db_service.insertar_o_actualizar_masivo.call_args.args
+    assert registros[0]["organismo"] == "Hospital"
+    assert registros[0]["nombre"] == "Sin Nombre (Manual)"
+    (detalles,) = db_service.actualizar_fase_2_detalle_en_lote.call_args.args
+    assert [(d[0], d[2]) for d in detalles] == [("CA-1", 3)]
+    db_service.gestionar_favorito.assert_called_once_with(7, True)
@@ -4,7 +4,7 @@ Tests unitarios para la Fase 3: Limpieza Automática (Housekeeping).
 """
 
 from datetime import datetime, timedelta
-from src.db.db_models import CaLicitacion, CaSeguimiento
+from src.db.db_models import CaLicitacion, CaLicitacionHistorico, CaSeguimiento, EstadoCa
 
 def test_limpieza_automatica_logica(db_service, db_session):
     """
@@ -86,4 +86,27 @@ def test_limpieza_automatica_logica(db_service, db_session):
     assert db_session.get(CaLicitacion, id_borrar) is None, "El CASO 1 (Basura) debería haber sido borrado."
     assert db_session.get(CaLicitacion, id_reciente) is not None, "El CASO 2 (Reciente) no debió borrarse."
     assert db_session.get(CaLicitacion, id_publicada) is not None, "El CASO 3 (Publicada) no debió borrarse."
-    assert db_session.get(CaLicitacion, id_favorita) is not None, "El CASO 4 (Favorita) debió estar protegido."
\ No newline at end of file
+    assert db_session.get(CaLicitacion, id_favorita) is not None, "El CASO 4 (Favorita) debió estar protegido."
+
+
+def test_limpieza_archiva_por_lotes(db_service, db_session):
+    """Las licitaciones retiradas quedan en ca_licitacion_historico, junto con sus datos."""
+    hace_40_dias = datetime.now() - timedelta(days=40)
+    db_session.add_all([
+        CaLicitacion(codigo_ca=f"CA-{i}", nombre=f"Antigua {i}", estado_ca_texto="Cerrada",
+                     fecha_cierre=hace_40_dias, puntuacion_final=i, monto_clp=1000.0 * i)
+        for i in range(5)
+    ])
+    db_session.commit()
+    ids = [ca.ca_id for ca in db_session.query(CaLicitacion).order_by(CaLicitacion.ca_id)]
+    db_session.add(CaSeguimiento(ca_id=ids[0], es_oculta=True, notas="No aplica"))
+    db_session.commit()
+
+    assert db_service.limpiar_registros_antiguos(dias_retencion=30, tamano_lote=2) == 5
+
+    assert db_session.query(CaLicitacion).count() == 0
+    assert db_session.query(CaSeguimiento).count() == 0
+    archivadas = db_session.query(CaLicitacionHistorico).order_by(CaLicitacionHistorico.ca_id).all()
+    assert [a.ca_id for a in archivadas] == ids
+    assert (archivadas[3].codigo_ca, archivadas[3].monto_clp, archivadas[3].estado_codigo) == ("CA-3", 3000.0, EstadoCa.CERRADA)
+    assert all(a.fecha_archivado is not None for a in archivadas)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitarios para el modo 'listado paralelo' de la Fase 1.
+"""
+import time
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+from src.scraper.scraper_service import ServicioScraper
+
+
+class RespuestaFalsa:
+    def __init__(self, status_code, datos=None):
+        self.status_code = status_code
+        self._datos = datos
+
+    def json(self):
+        return self._datos
+
+
+class SesionFalsa:
+    """Simula la API de listado: 'total' páginas con 2 items cada una."""
+
+    def __init__(self, total, fallar_en=None):
+        self.headers = {}
+        self.total = total
+        self.fallar_en = fallar_en
+        self.paginas_pedidas = []
+
+    def mount(self, *_):
+        pass
+
+    def get(self, url, timeout=None):
+        pagina = int(parse_qs(urlsplit(url).query)["page_number"][0])
+        self.paginas_pedidas.append(pagina)
+        # Las páginas pares tardan más para forzar respuestas fuera de orden
+        time.sleep(0.02 if pagina % 2 == 0 else 0.0)
+        if pagina == self.fallar_en:
+            return RespuestaFalsa(404)
+        items = [{"codigo": f"P{pagina}-{i}"} for i in range(2)]
+        return RespuestaFalsa(200, {"payload": {"resultados": items, "pageCount": self.total, "resultCount": self.total * 2}})
+
+
+def _scraper_con_sesion(sesion):
+    scraper = ServicioScraper()
+    scraper.headers_sesion = {"authorization": "token"}
+    return scraper, patch("src.scraper.scraper_service.requests.Session", return_value=sesion)
+
+
+def test_listado_paralelo_une_paginas_en_orden():
+    scraper, parche = _scraper_con_sesion(SesionFalsa(total=7))
+    with parche:
+        compras = scraper.ejecutar_scraper_listado(None, {"date_from": "2025-01-01"}, max_paginas=0, paralelo=True, max_hilos=3)
+
+    codigos = [c["codigo"] for c in compras]
+    esperado = [f"P{p}-{i}" for p in range(1, 8) for i in range(2)]
+    assert codigos == esperado
+
+
+def test_listado_paralelo_respeta_max_paginas_y_corta_en_falla():
+    scraper, parche = _scraper_con_sesion(SesionFalsa(total=10, fallar_en=4))
+    with parche:
+        compras = scraper.ejecutar_scraper_listado(None, None, max_paginas=8, paralelo=True, max_hilos=4)
+
+    # Igual que el modo secuencial: se detiene en la primera página fallida
+    assert [c["codigo"] for c in compras] == [f"P{p}-{i}" for p in range(1, 4) for i in range(2)]
+
+
+def test_listado_secuencial_precarga_la_pagina_siguiente():
+    sesion = SesionFalsa(total=3)
+    scraper, parche = _scraper_con_sesion(sesion)
+    with parche, patch("src.scraper.scraper_service.time"):
+        paginas = scraper.iterar_paginas_listado(None, None, max_paginas=0)
+        primera = next(paginas)
+
+        # Mientras el consumidor procesa la página 1, la 2 ya se está descargando
+        limite = time.monotonic() + 2
+        while 2 not in sesion.paginas_pedidas and time.monotonic() < limite:
+            time.sleep(0.01)
+        assert 2 in sesion.paginas_pedidas
+
+        resto = list(paginas)
+
+    codigos = [c["codigo"] for pagina in [primera] + resto for c in pagina]
+    assert codigos == [f"P{p}-{i}" for p in range(1, 4) for i in range(2)]
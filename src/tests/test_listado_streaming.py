@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitarios para el pipeline en streaming de la Fase 1 (micro-lotes de páginas).
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.logic.etl_service import ServicioEtl
+from src.utils.exceptions import ErrorCargaBD
+
+
+def _pagina(n, tam=2):
+    return [{"codigo": f"P{n}-{i}", "nombre": f"Compra {n}-{i}"} for i in range(tam)]
+
+
+def test_streaming_guarda_y_puntua_por_micro_lote():
+    db_service = MagicMock()
+    db_service.iterar_datos_para_recalculo_puntajes.side_effect = lambda **_: iter([])
+    etl = ServicioEtl(db_service, MagicMock(), MagicMock())
+
+    # La página 2 repite un código de la página 1: debe deduplicarse dentro del lote
+    paginas = [_pagina(1), _pagina(1, tam=1) + _pagina(2, tam=1), _pagina(3), _pagina(4), _pagina(5)]
+
+    with patch("src.logic.etl_service.LISTADO_PAGINAS_POR_LOTE", 2):
+        total = etl._cargar_listado_en_streaming(iter(paginas), lambda m: None)
+
+    lotes = [c.args[0] for c in db_service.insertar_o_actualizar_masivo.call_args_list]
+    assert [len(l) for l in lotes] == [3, 4, 2]
+    assert total == 9
+
+    filtros = [c.kwargs["codigos"] for c in db_service.iterar_datos_para_recalculo_puntajes.call_args_list]
+    assert filtros[0] == ["P1-0", "P1-1", "P2-0"]
+    assert len(filtros) == 3
+    etl.score_engine.recargar_reglas_memoria.assert_called_once()
+
+
+def test_streaming_conserva_lotes_previos_ante_fallo():
+    db_service = MagicMock()
+    db_service.iterar_datos_para_recalculo_puntajes.side_effect = lambda **_: iter([])
+    db_service.insertar_o_actualizar_masivo.side_effect = [None, RuntimeError("conexión perdida")]
+    etl = ServicioEtl(db_service, MagicMock(), MagicMock())
+
+    with patch("src.logic.etl_service.LISTADO_PAGINAS_POR_LOTE", 1):
+        with pytest.raises(ErrorCargaBD):
+            etl._cargar_listado_en_streaming(iter([_pagina(1), _pagina(2), _pagina(3)]), lambda m: None)
+
+    # El primer lote alcanzó a guardarse y puntuarse antes del fallo
+    assert db_service.insertar_o_actualizar_masivo.call_count == 2
+    assert db_service.iterar_datos_para_recalculo_puntajes.call_count == 1
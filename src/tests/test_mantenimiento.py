@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitarios para el mantenimiento por lotes reanudable (ServicioMantenimiento).
+"""
+from datetime import datetime, timedelta
+
+from src.db.db_models import CaLicitacion, CaLicitacionHistorico, CaMantenimientoCheckpoint, EstadoCa
+from src.logic.mantenimiento_service import ServicioMantenimiento, TAREA_ARCHIVAR_ANTIGUAS, TAREA_CERRAR_VENCIDAS
+
+
+def _poblar(db_session):
+    hace_40_dias = datetime.now() - timedelta(days=40)
+    ayer = datetime.now() - timedelta(days=1)
+    db_session.add_all(
+        [CaLicitacion(codigo_ca=f"VIEJA-{i}", nombre="Vieja", estado_ca_texto="Cerrada", fecha_cierre=hace_40_dias) for i in range(7)]
+        + [CaLicitacion(codigo_ca=f"VENCIDA-{i}", nombre="Vencida", estado_ca_texto="Publicada", fecha_cierre=ayer) for i in range(2)]
+    )
+    db_session.commit()
+
+
+def test_mantenimiento_se_detiene_y_retoma_desde_el_checkpoint(db_service, db_session):
+    _poblar(db_session)
+    mensajes = []
+    servicio = ServicioMantenimiento(db_service, tamano_lote=3)
+
+    def detener_tras_dos_lotes(mensaje):
+        mensajes.append(mensaje)
+        if len(mensajes) == 2:
+            servicio.detener()  # Como si la aplicación se cerrara a mitad de camino
+
+    assert servicio.ejecutar(callback_texto=detener_tras_dos_lotes) == {TAREA_CERRAR_VENCIDAS: 2, TAREA_ARCHIVAR_ANTIGUAS: 3}
+    assert mensajes == ["Mantenimiento: 2 licitaciones cerradas...", "Mantenimiento: 3 licitaciones archivadas..."]
+    checkpoint = db_session.get(CaMantenimientoCheckpoint, TAREA_ARCHIVAR_ANTIGUAS)
+    assert (checkpoint.procesados, db_session.query(CaLicitacionHistorico).count()) == (3, 3)
+    assert db_session.get(CaMantenimientoCheckpoint, TAREA_CERRAR_VENCIDAS) is None
+
+    # Nueva ejecución (otra instancia): retoma el archivado y lo termina
+    assert ServicioMantenimiento(db_service, tamano_lote=3).ejecutar() == {TAREA_CERRAR_VENCIDAS: 0, TAREA_ARCHIVAR_ANTIGUAS: 7}
+    assert db_session.query(CaMantenimientoCheckpoint).count() == 0
+    assert db_session.query(CaLicitacionHistorico).count() == 7
+    restantes = db_session.query(CaLicitacion).all()
+    assert {(ca.codigo_ca[:7], ca.estado_codigo) for ca in restantes} == {("VENCIDA", EstadoCa.CERRADA)}
+
+
+def test_lote_guarda_checkpoint_en_la_misma_transaccion(db_service, db_session):
+    _poblar(db_session)
+    fecha_limite = datetime.now()
+    ids = [ca.ca_id for ca in db_session.query(CaLicitacion).order_by(CaLicitacion.ca_id)]
+    recibidos = []
+    db_service.suscribir_cambios(recibidos.append)
+
+    ultimo_id, afectados = db_service.cerrar_vencidas_lote(fecha_limite, tamano_lote=1, tarea="prueba", procesados=5)
+
+    assert (ultimo_id, afectados) == (ids[7], 1)
+    assert db_service.obtener_checkpoint_mantenimiento("prueba")[::2] == (ids[7], 6)
+    assert recibidos == [[ids[7]]]  # Las pestañas se parchan con el feed de cambios
+    assert db_service.cerrar_vencidas_lote(fecha_limite, ultimo_id=ids[8]) == (None, 0)
+
+
+def test_mantenimiento_publica_cambios_una_vez_por_tarea(db_service, db_session):
+    _poblar(db_session)
+    recibidos = []
+    db_service.suscribir_cambios(recibidos.append)
+
+    ServicioMantenimiento(db_service, tamano_lote=2).ejecutar()
+
+    # Varios lotes por tarea, pero un solo aviso a la GUI por cada una
+    vencidas, antiguas = recibidos
+    assert (len(vencidas), len(antiguas)) == (2, 7)
+    assert vencidas == sorted(vencidas) and antiguas == sorted(antiguas)
+
+
+def test_detener_antes_de_ejecutar_no_procesa_lotes(db_service, db_session):
+    _poblar(db_session)
+    servicio = ServicioMantenimiento(db_service, tamano_lote=3)
+    servicio.detener()  # La ventana se cerró antes de que el hilo del pool arrancara
+
+    assert servicio.ejecutar() == {}
+    assert db_session.query(CaLicitacionHistorico).count() == 0
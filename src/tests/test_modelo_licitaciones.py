@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitarios para el modelo virtual de las pestañas de licitaciones.
+"""
+from datetime import date, datetime
+
+from PySide6.QtCore import Qt
+
+from src.db.db_proyecciones import LicitacionResumen
+from src.gui.gui_models import ModeloLicitaciones, ModeloProxyLicitacion, BRUSH_SCORE_MEDIO
+
+
+def _licitacion(ca_id, puntaje=20, nota="", **cambios):
+    datos = dict(
+        ca_id=ca_id, codigo_ca=f"CA-{ca_id}", nombre=f"Compra {ca_id}",
+        puntuacion_final=puntaje, puntaje_detalle=["Título: camión (+20)"],
+        estado_ca_texto="Publicada", estado_convocatoria=1,
+        fecha_publicacion=datetime(2026, 3, 2), fecha_cierre=datetime(2026, 3, 9, 15, 30),
+        fecha_cierre_segundo_llamado=None, monto_clp=1250000,
+        organismo_nombre="Hospital", notas=nota,
+    )
+    datos.update(cambios)
+    return LicitacionResumen(**datos)
+
+
+def test_modelo_entrega_los_roles_de_la_tabla():
+    modelo = ModeloLicitaciones()
+    modelo.establecer_datos([_licitacion(7, nota="Llamar")])
+
+    assert (modelo.rowCount(), modelo.columnCount()) == (1, 10)
+    dato = lambda col, rol=Qt.DisplayRole: modelo.data(modelo.index(0, col), rol)
+    assert dato(0) == 20 and dato(0, Qt.UserRole + 1) == 7
+    assert dato(0, Qt.BackgroundRole) == BRUSH_SCORE_MEDIO
+    assert dato(0, Qt.ToolTipRole) == "Título: camión (+20)"
+    assert dato(4, Qt.UserRole) == 1 and dato(4, Qt.UserRole + 2) == "Publicada"
+    assert (dato(5), dato(6), dato(7)) == ("02-03", "09-03 15:30", "-")
+    assert dato(8) == "$1.250.000" and dato(8, Qt.UserRole) == 1250000.0
+    assert dato(9) == "📝" and dato(9, Qt.UserRole) == "Llamar"
+    assert modelo.headerData(2, Qt.Horizontal) == "Nombre"
+
+
+def test_parchar_reemplaza_solo_las_filas_afectadas():
+    modelo = ModeloLicitaciones()
+    modelo.establecer_datos([_licitacion(i) for i in range(5)])
+
+    # La 1 cambia de puntaje, la 3 sale de la pestaña
+    modelo.parchar([1, 3], [_licitacion(1, puntaje=-5)])
+
+    ids = [modelo.data(modelo.index(fila, 0), Qt.UserRole + 1) for fila in range(modelo.rowCount())]
+    assert ids == [0, 2, 4, 1]
+    assert modelo.data(modelo.index(3, 0)) == -5
+
+
+def _visibles(proxy):
+    return [proxy.data(proxy.index(fila, 0), Qt.UserRole + 1) for fila in range(proxy.rowCount())]
+
+
+def test_proxy_filtra_con_claves_precalculadas_y_sigue_los_cambios():
+    modelo = ModeloLicitaciones()
+    licitaciones = [_licitacion(i, puntaje=i % 3) for i in range(6)]
+    licitaciones[4].organismo_nombre = "Municipalidad de ÑUÑOA"
+    licitaciones[5].fecha_publicacion = datetime(2026, 4, 1)
+    modelo.establecer_datos(licitaciones)
+    proxy = ModeloProxyLicitacion()
+    proxy.setSourceModel(modelo)
+
+    proxy.establecer_parametros_filtro("ñuñoa", 0, True, False, [], None, None, None, None)
+    assert _visibles(proxy) == [4]
+
+    proxy.establecer_parametros_filtro("", 0, False, False, [], date(2026, 3, 15), None, None, None)
+    assert _visibles(proxy) == [5]
+
+    # Datos nuevos con los mismos filtros: el índice se recalcula por versión del modelo
+    modelo.parchar([5], [_licitacion(9, puntaje=2), _licitacion(5, puntaje=0)])
+    assert _visibles(proxy) == []
+    proxy.establecer_parametros_filtro("ca-9", 0, False, False, [], None, None, None, None)
+    assert _visibles(proxy) == [9]
+
+
+def test_modelo_pide_paginas_al_hacer_scroll():
+    pedidas = []
+    modelo = ModeloLicitaciones()
+    primera = [_licitacion(i) for i in range(3)]
+    modelo.establecer_datos(primera, solicitar_pagina=pedidas.append, tamano_pagina=3)
+
+    assert modelo.canFetchMore()
+    modelo.fetchMore()
+    assert pedidas == [primera[-1]] and not modelo.canFetchMore()
+
+    # La fila 3 ya llegó por un refresco parcial: no se duplica
+    modelo.parchar([], [_licitacion(3)])
+    modelo.agregar_pagina(primera[-1], [_licitacion(3), _licitacion(4)])
+    assert [f.ca_id for f in modelo.filas] == [0, 1, 2, 3, 4]
+    assert not modelo.canFetchMore()  # Página incompleta: no hay más
+
+
+def test_modelo_descarta_paginas_de_una_carga_anterior():
+    pedidas = []
+    modelo = ModeloLicitaciones()
+    modelo.establecer_datos([_licitacion(i) for i in range(2)], solicitar_pagina=pedidas.append, tamano_pagina=2)
+    modelo.fetchMore()
+
+    modelo.establecer_datos([_licitacion(9)])
+    modelo.agregar_pagina(pedidas[0], [_licitacion(5), _licitacion(6)])
+    assert [f.ca_id for f in modelo.filas] == [9]
+    assert not modelo.canFetchMore()
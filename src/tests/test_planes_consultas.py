@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Tests de planes de ejecución (EXPLAIN QUERY PLAN) de las consultas de pestañas y mantenimiento.
+
+Se captura el SQL real que emite DbService y se verifica que SQLite use los
+índices compuestos/parciales en vez de recorrer la tabla completa.
+"""
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import event
+
+from src.db.db_models import CaLicitacion
+
+
+@contextmanager
+def _capturar_sql(engine):
+    sentencias = []
+
+    def capturar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capturar)
+    try:
+        yield sentencias
+    finally:
+        event.remove(engine, "before_cursor_execute", capturar)
+
+
+def _plan(db_session, sentencia):
+    statement, parameters = sentencia
+    filas = db_session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+    return "\n".join(fila[-1] for fila in filas)
+
+
+def _planes(db_session, engine, accion):
+    with _capturar_sql(engine) as sentencias:
+        accion()
+    return [_plan(db_session, s) for s in sentencias]
+
+
+def _recorre_tabla(plan):
+    """SCAN sin índice = lectura completa de ca_licitacion (recorrer un índice parcial sí es aceptable)."""
+    return "SCAN ca_licitacion" in plan.splitlines()
+
+
+def _poblar(db_session):
+    db_session.add_all([
+        CaLicitacion(
+            codigo_ca=f"CA-{i}", nombre=f"Compra {i}", puntuacion_final=i % 30,
+            estado_ca_texto="Publicada" if i % 2 else "Cerrada",
+            fecha_publicacion=datetime(2026, 3, 1 + i % 20), fecha_cierre=datetime(2026, 4, 1 + i % 20),
+        )
+        for i in range(60)
+    ])
+    db_session.commit()
+    db_session.connection().exec_driver_sql("ANALYZE")
+
+
+def test_candidatas_usan_indice_parcial_y_anti_join(db_service, db_session, engine):
+    _poblar(db_session)
+    primera = db_service.obtener_resumen_candidatas(5, limite=10)
+
+    for plan in _planes(db_session, engine, lambda: (
+        db_service.obtener_resumen_candidatas(5, limite=10),
+        db_service.obtener_resumen_candidatas(5, limite=10, despues_de=primera[-1]),
+    )):
+        assert "USING INDEX ix_ca_licitacion_abiertas_puntaje" in plan
+        # NOT EXISTS correlacionado: una búsqueda por clave primaria por fila, sin lista NOT IN
+        assert "CORRELATED SCALAR SUBQUERY" in plan
+        assert "SEARCH ca_seguimiento USING INTEGER PRIMARY KEY" in plan
+        assert "LIST SUBQUERY" not in plan
+        # El índice ya entrega el orden de la pestaña
+        assert "TEMP B-TREE" not in plan
+
+
+def test_mantenimiento_no_recorre_la_tabla_completa(db_service, db_session, engine):
+    _poblar(db_session)
+
+    plan_rango, = _planes(db_session, engine, db_service.obtener_rango_fechas_candidatas_activas)
+    assert not _recorre_tabla(plan_rango)
+
+    for plan in _planes(db_session, engine, lambda: db_service.cerrar_licitaciones_vencidas_localmente(tamano_lote=5)):
+        assert not _recorre_tabla(plan)
+
+    # Mantenimiento por lotes: cada lote avanza por clave primaria (keyset), sin recorrer la tabla
+    planes_limpieza = _planes(db_session, engine, lambda: db_service.limpiar_registros_antiguos(dias_retencion=-400, tamano_lote=10))
+    assert len(planes_limpieza) > 4
+    for plan in planes_limpieza:
+        assert not _recorre_tabla(plan)
+        assert "USING INTEGER PRIMARY KEY" in plan
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitarios para el motor de puntajes por columnas (calcular_puntajes_lote).
+"""
+import random
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from src.db.db_models import CaLicitacion
+from src.logic.etl_service import ServicioEtl
+from src.logic.score_engine import MotorPuntajes
+from src.utils.normalizacion import normalizar_texto
+
+PALABRAS = ["camion", "camión", "aljibe", "tolva", "ferretería", "materiales", "de", "papel", "neumático", "aro"]
+
+
+def _motor(rnd, con_gato=False):
+    keywords = ["camión", "camion aljibe", "ferreteria", "materiales de ferretería", "papel", "neumatico", "de papel"]
+    if con_gato:
+        keywords.append("a#b")
+    palabras_clave = [
+        {"keyword": kw, "norm": normalizar_texto(kw), "p_nom": rnd.choice([0, 5, -3]),
+         "p_desc": rnd.choice([0, 2]), "p_prod": rnd.choice([0, 4])}
+        for kw in keywords
+    ]
+    palabras_clave.sort(key=lambda x: len(x["norm"]), reverse=True)
+    return MotorPuntajes(None, reglas={
+        "palabras_clave": palabras_clave,
+        "reglas_prioritarias": {1: 15, 2: -30},
+        "reglas_no_deseadas": {3: -100},
+        "mapa_nombre_id_organismo": {"municipalidad": 1, "hospital": 2, "ejercito": 3},
+    })
+
+
+def _texto(rnd):
+    return " ".join(rnd.choice(PALABRAS) for _ in range(rnd.randint(0, 8)))
+
+
+def _fila(rnd, ca_id):
+    nombre = _texto(rnd)
+    descripcion = rnd.choice([None, _texto(rnd)])
+    productos = rnd.choice([None, [], [{"nombre": _texto(rnd), "descripcion": _texto(rnd)}]])
+    fila = {
+        "ca_id": ca_id, "codigo_ca": f"CA-{ca_id}", "nombre": nombre,
+        "estado_ca_texto": rnd.choice(["Publicada", "Segundo llamado", None]),
+        "organismo_id": rnd.choice([None, 1, 2, 3, 4]),
+        "organismo_nombre": rnd.choice(["", "Municipalidad de Arica", "Hospital", "Ejército de Chile"]),
+        "descripcion": descripcion, "productos_solicitados": productos,
+        "puntuacion_final_actual": rnd.choice([0, 5]),
+    }
+    # La mitad de las filas trae los textos ya normalizados (como desde la BD)
+    if rnd.random() < 0.5:
+        fila.update(nombre_norm=normalizar_texto(nombre), descripcion_norm=None, productos_norm=None)
+    return fila
+
+
+def test_lote_equivale_a_fila_a_fila():
+    rnd = random.Random(7)
+    for con_gato in (False, True):
+        motor = _motor(rnd, con_gato)
+        filas = [_fila(rnd, i) for i in range(300)]
+
+        puntajes, detalles = motor.calcular_puntajes_lote(pd.DataFrame(filas))
+
+        esperado = [motor.calcular_puntaje_total(f) for f in filas]
+        assert list(puntajes) == [p for p, _ in esperado]
+        assert list(detalles) == [d for _, d in esperado]
+        assert motor.puntuar_particion_lote(filas) == motor.puntuar_particion(filas)
+
+
+def test_lote_conserva_indice_y_acepta_vacios():
+    motor = _motor(random.Random(1))
+    df = pd.DataFrame([{"ca_id": 1, "nombre": "", "estado_ca_texto": None, "organismo_id": None, "organismo_nombre": ""}], index=[42])
+    puntajes, detalles = motor.calcular_puntajes_lote(df)
+    assert list(puntajes.index) == [42]
+    assert detalles[42] == ["Error: Sin nombre"]
+    assert motor.puntuar_particion_lote([]) == []
+
+
+def test_recalculo_vectorizado_guarda_los_mismos_cambios(db_service, db_session):
+    rnd = random.Random(3)
+    db_session.add_all([
+        CaLicitacion(codigo_ca=f"CA-{i}", nombre=_texto(rnd), descripcion=rnd.choice([None, _texto(rnd)]), puntuacion_final=0)
+        for i in range(40)
+    ])
+    db_session.commit()
+    motor = _motor(rnd)
+
+    guardados = {}
+    for vectorizado in (False, True):
+        servicio = MagicMock(wraps=db_service)
+        ServicioEtl(servicio, MagicMock(), motor)._transformar_puntajes_fase_1(None, None, recargar_reglas=False, vectorizado=vectorizado)
+        guardados[vectorizado] = [c for llamada in servicio.actualizar_puntajes_en_lote.call_args_list for c in llamada.args[0]]
+        db_session.rollback()
+        db_session.query(CaLicitacion).update({"puntuacion_final": 0, "huella_reglas": None, "huella_entrada": None})
+        db_session.commit()
+
+    assert guardados[True] == guardados[False]
+    assert guardados[True]
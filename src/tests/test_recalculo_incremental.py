@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitarios para el recálculo incremental (solo licitaciones afectadas por un cambio de reglas).
+"""
+from types import SimpleNamespace
+from unittest.mock import ANY, MagicMock, patch
+
+from src.db.db_models import CaLicitacion, CaOrganismo, CaSector
+from src.logic.etl_service import ServicioEtl
+from src.logic.score_engine import MotorPuntajes
+
+
+def _motor_falso(puntaje):
+    """Motor simulado: puntaje fijo, pero con el Dirty Checking real de 'puntuar_particion'."""
+    motor = MagicMock()
+    motor.huella_reglas = "reglas"
+    motor.calcular_puntaje_total.return_value = puntaje
+    for metodo in ("puntuar_particion", "_filtrar_por_huellas", "_requiere_guardado"):
+        getattr(motor, metodo).side_effect = lambda *args, _m=getattr(MotorPuntajes, metodo): _m(motor, *args)
+    return motor
+
+
+def _poblar(db_session):
+    sector = CaSector(nombre="General")
+    muni = CaOrganismo(nombre="Municipalidad", sector=sector)
+    hospital = CaOrganismo(nombre="Hospital", sector=sector)
+    db_session.add_all([
+        CaLicitacion(codigo_ca="T-1", nombre="Compra de CAMIÓN  Aljibe", organismo=muni, puntuacion_final=0),
+        CaLicitacion(codigo_ca="D-1", nombre="Servicio", descripcion="Arriendo de camion tolva", organismo=muni, puntuacion_final=0),
+        CaLicitacion(codigo_ca="P-1", nombre="Repuestos", productos_solicitados=[{"nombre": "Neumático camión"}], organismo=muni, puntuacion_final=0),
+        CaLicitacion(codigo_ca="O-1", nombre="Insumos médicos", organismo=hospital, puntuacion_final=0),
+        CaLicitacion(codigo_ca="X-1", nombre="Papelería 50% off_", organismo=muni, puntuacion_final=0),
+    ])
+    db_session.commit()
+    return hospital.organismo_id
+
+
+def test_filtro_por_terminos_es_tolerante_a_tildes_y_espacios(db_service, db_session):
+    _poblar(db_session)
+
+    filas = db_service.obtener_datos_para_recalculo_puntajes(terminos=["camión aljibe"])
+    assert {f["codigo_ca"] for f in filas} == {"T-1"}
+
+    # El filtro compara contra las columnas normalizadas: calza con título, descripción y productos
+    codigos = {f["codigo_ca"] for f in db_service.obtener_datos_para_recalculo_puntajes(terminos=["Camion"])}
+    assert codigos == {"T-1", "D-1", "P-1"}
+
+    # '%' y '_' de la keyword se escapan (no actúan como comodines)
+    assert {f["codigo_ca"] for f in db_service.obtener_datos_para_recalculo_puntajes(terminos=["50% off_"])} == {"X-1"}
+    assert db_service.obtener_datos_para_recalculo_puntajes(terminos=["5_"]) == []
+
+
+def test_filtro_por_organismo_y_delta_vacio(db_service, db_session):
+    hospital_id = _poblar(db_session)
+
+    filas = db_service.obtener_datos_para_recalculo_puntajes(terminos=[], organismo_ids=[hospital_id])
+    assert [f["codigo_ca"] for f in filas] == ["O-1"]
+    assert db_service.obtener_datos_para_recalculo_puntajes(terminos=[], organismo_ids=[]) == []
+
+
+def test_recalculo_incremental_solo_repuntua_afectadas():
+    db_service = MagicMock()
+    db_service.contar_datos_para_recalculo_puntajes.return_value = 1
+    db_service.iterar_datos_para_recalculo_puntajes.return_value = iter([[
+        {"ca_id": 1, "codigo_ca": "T-1", "nombre": "camion", "estado_ca_texto": "Publicada", "organismo_nombre": "Muni",
+         "descripcion": None, "productos_solicitados": None, "puntuacion_final_actual": 0},
+    ]])
+    motor = _motor_falso((5, ["KW Título: 'camion' (+5)"]))
+
+    etl = ServicioEtl(db_service, MagicMock(), motor)
+    etl.ejecutar_recalculo_incremental(terminos=["camion"], organismo_ids=[3])
+
+    kwargs = db_service.iterar_datos_para_recalculo_puntajes.call_args.kwargs
+    assert kwargs["terminos"] == ["camion"] and kwargs["organismo_ids"] == [3]
+    motor.recargar_reglas_memoria.assert_called_once()
+    db_service.actualizar_puntajes_en_lote.assert_called_once_with([(1, 5, ["KW Título: 'camion' (+5)"], ANY)], huella_reglas="reglas")
+
+
+def test_recalculo_en_streaming_guarda_por_lotes_acotados(db_service, db_session):
+    """Las filas llegan por particiones y los cambios se guardan en lotes de TAMANO_LOTE_RECALCULO."""
+    db_session.add_all([CaLicitacion(codigo_ca=f"CA-{i}", nombre=f"Compra {i}", puntuacion_final=i % 2) for i in range(7)])
+    db_session.commit()
+
+    particiones = list(db_service.iterar_datos_para_recalculo_puntajes(tamano_particion=3))
+    assert [len(p) for p in particiones] == [3, 3, 1]
+    assert db_service.contar_datos_para_recalculo_puntajes() == 7
+
+    bd_falsa = MagicMock()
+    bd_falsa.contar_datos_para_recalculo_puntajes.return_value = 7
+    bd_falsa.iterar_datos_para_recalculo_puntajes.return_value = iter(particiones)
+    motor = _motor_falso((1, []))
+
+    with patch("src.logic.etl_service.TAMANO_LOTE_RECALCULO", 2):
+        ServicioEtl(bd_falsa, MagicMock(), motor)._transformar_puntajes_fase_1(None, None)
+
+    # Sin huellas previas se guardan las 7 filas (para sellarlas): cada partición llena el lote de 2
+    lotes = [c.args[0] for c in bd_falsa.actualizar_puntajes_en_lote.call_args_list]
+    assert [len(l) for l in lotes] == [3, 3, 1]
+
+
+def test_recalculo_multiproceso_equivale_al_de_un_proceso():
+    """Con varios procesos, cada uno con su copia de las reglas, el resultado es el mismo."""
+    bd = MagicMock()
+    bd.obtener_todas_palabras_clave.return_value = [
+        SimpleNamespace(keyword="camión", puntos_nombre=5, puntos_descripcion=2, puntos_productos=1),
+        SimpleNamespace(keyword="camión tolva", puntos_nombre=8, puntos_descripcion=0, puntos_productos=0),
+    ]
+    bd.obtener_reglas_organismos.return_value = [SimpleNamespace(organismo_id=1, tipo="prioritario", puntos=3)]
+    bd.obtener_todos_organismos.return_value = [SimpleNamespace(nombre="Municipalidad", organismo_id=1)]
+    motor = MotorPuntajes(bd)
+
+    filas = [
+        {"ca_id": i, "codigo_ca": f"CA-{i}", "nombre": ["Camión tolva", "camion", "papel"][i % 3],
+         "estado_ca_texto": "Publicada", "organismo_nombre": ["Municipalidad", "Otro"][i % 2],
+         "descripcion": "arriendo de camión" if i % 4 == 0 else None, "productos_solicitados": None,
+         "puntuacion_final_actual": 0}
+        for i in range(40)
+    ]
+    particiones = [filas[i:i + 7] for i in range(0, len(filas), 7)]
+
+    resultados = {}
+    for procesos in (1, 2):
+        bd_falsa = MagicMock()
+        bd_falsa.contar_datos_para_recalculo_puntajes.return_value = len(filas)
+        bd_falsa.iterar_datos_para_recalculo_puntajes.return_value = iter(particiones)
+        with patch("src.logic.etl_service.TAMANO_LOTE_RECALCULO", 10):
+            ServicioEtl(bd_falsa, MagicMock(), motor)._transformar_puntajes_fase_1(None, None, recargar_reglas=False, procesos=procesos)
+        resultados[procesos] = sorted(t for c in bd_falsa.actualizar_puntajes_en_lote.call_args_list for t in c.args[0])
+
+    assert resultados[1] == resultados[2]
+    # Sin huellas previas se guardan todas, incluso las que siguen en 0 (quedan selladas)
+    assert len(resultados[1]) == 40
+    assert resultados[1][0][:3] == (0, 13, ["Org. Prioritario (+3)", "KW Título: 'camión tolva' (+8)", "KW Desc.: 'camión' (+2)"])
+
+
+def test_recalculo_omite_filas_con_huellas_vigentes(db_service, db_session):
+    """Tras un recálculo, repetirlo no guarda nada; cambiar datos o reglas repuntúa solo lo necesario."""
+    hospital_id = _poblar(db_session)
+    bd = MagicMock()
+    bd.obtener_todas_palabras_clave.return_value = [SimpleNamespace(keyword="camión", puntos_nombre=5, puntos_descripcion=2, puntos_productos=1)]
+    bd.obtener_reglas_organismos.return_value = []
+    bd.obtener_todos_organismos.return_value = []
+    motor = MotorPuntajes(bd)
+
+    def recalcular():
+        servicio = MagicMock(wraps=db_service)
+        ServicioEtl(servicio, MagicMock(), motor)._transformar_puntajes_fase_1(None, None, recargar_reglas=False)
+        return sorted(c[0] for llamada in servicio.actualizar_puntajes_en_lote.call_args_list for c in llamada.args[0])
+
+    assert len(recalcular()) == 5
+    assert recalcular() == []
+
+    ca = db_session.query(CaLicitacion).filter_by(codigo_ca="O-1").one()
+    ca_id = ca.ca_id
+    ca.estado_ca_texto = "Segundo llamado"
+    db_session.commit()
+    assert recalcular() == [ca_id]
+
+    bd.obtener_reglas_organismos.return_value = [SimpleNamespace(organismo_id=hospital_id, tipo="prioritario", puntos=1)]
+    motor.recargar_reglas_memoria()
+    assert len(recalcular()) == 5
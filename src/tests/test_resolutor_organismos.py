@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitarios para la resolución de organismos del motor de puntajes.
+"""
+import random
+
+from src.logic.score_engine import MotorPuntajes, ResolutorOrganismos
+
+
+def _resolver_lineal(mapa, org_norm):
+    """Algoritmo original: exacto y, si no, la primera clave contenida en el nombre."""
+    org_id = mapa.get(org_norm)
+    if not org_id:
+        for clave, oid in mapa.items():
+            if clave in org_norm:
+                return oid
+    return org_id
+
+
+def test_resolutor_equivale_al_recorrido_lineal():
+    rnd = random.Random(12)
+    silabas = ["muni", "hospital", "de", "san", "regional", "salud", "ilustre", "la"]
+    mapa = {}
+    for oid in range(1, 60):
+        mapa[" ".join(rnd.choice(silabas) for _ in range(rnd.randint(1, 3)))] = oid
+    resolutor = ResolutorOrganismos(mapa)
+
+    for _ in range(400):
+        nombre = " ".join(rnd.choice(silabas + ["otro"]) for _ in range(rnd.randint(0, 5)))
+        assert resolutor.resolver(nombre) == _resolver_lineal(mapa, nombre), nombre
+        # Segunda consulta: desde la memoria
+        assert resolutor.resolver(nombre) == _resolver_lineal(mapa, nombre)
+
+
+def test_resolutor_respeta_orden_del_mapa_y_clave_vacia():
+    mapa = {"hospital": 1, "hospital regional": 2}
+    assert ResolutorOrganismos(mapa).resolver("gran hospital regional sur") == 1
+    assert ResolutorOrganismos({"zzz": 1, "": 9}).resolver("cualquiera") == 9
+    assert ResolutorOrganismos(mapa).resolver("") is None
+
+
+def test_fase_1_usa_organismo_id_resuelto_en_la_ingesta():
+    motor = MotorPuntajes(None, reglas={
+        "palabras_clave": [],
+        "reglas_prioritarias": {7: 20},
+        "reglas_no_deseadas": {},
+        "mapa_nombre_id_organismo": {"hospital": 3},
+    })
+    # Con organismo_id no se consulta el nombre (que apuntaría a otro organismo)
+    assert motor.calcular_puntaje_fase_1({"nombre": "Compra", "organismo_comprador": "Hospital", "organismo_id": 7}) == (20, ["Org. Prioritario (+20)"])
+    motor.reglas_prioritarias[3] = 4
+    assert motor.calcular_puntaje_fase_1({"nombre": "Compra", "organismo_comprador": "Gran Hospital"})[0] == 4
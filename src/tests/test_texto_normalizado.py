@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Tests unitarios para las columnas de texto normalizado (nombre_norm, descripcion_norm, productos_norm).
+"""
+from unittest.mock import MagicMock
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from src.db.db_models import CaLicitacion
+from src.db.db_service import DbService
+from src.logic.score_engine import MotorPuntajes
+from src.utils.normalizacion import normalizar_productos
+
+
+REGLAS = {
+    "palabras_clave": [
+        {"keyword": "Camión", "norm": "camion", "p_nom": 10, "p_desc": 5, "p_prod": 3},
+        {"keyword": "Neumático", "norm": "neumatico", "p_nom": 0, "p_desc": 0, "p_prod": 7},
+    ],
+    "reglas_prioritarias": {},
+    "reglas_no_deseadas": {},
+    "mapa_nombre_id_organismo": {},
+}
+
+
+def test_normalizar_productos_acepta_lista_o_json():
+    productos = [{"nombre": "Neumático", "descripcion": "Para  CAMIÓN"}, "basura", {"nombre": "Aceite"}]
+    assert normalizar_productos(productos) == "neumatico para camion | aceite"
+    assert normalizar_productos('[{"nombre": "Aceite"}]') == "aceite"
+    assert normalizar_productos("no es json") == ""
+    assert normalizar_productos(None) == ""
+
+
+def test_orm_mantiene_columnas_normalizadas():
+    ca = CaLicitacion(codigo_ca="CA-1", nombre="  Compra de CAMIÓN ", productos_solicitados=[{"nombre": "Neumático"}])
+    assert ca.nombre_norm == "compra de camion"
+    assert ca.productos_norm == "neumatico"
+    assert ca.descripcion_norm is None
+
+    ca.descripcion = "Arriendo Tolva"
+    assert ca.descripcion_norm == "arriendo tolva"
+
+
+def test_upsert_guarda_nombre_normalizado():
+    stmt = DbService(MagicMock())._sentencia_upsert_licitaciones()
+    assert "nombre_norm" in str(stmt.compile(dialect=postgresql.dialect()))
+
+    sesion = MagicMock()
+    sesion.__enter__.return_value = sesion
+    servicio = DbService(lambda: sesion)
+    servicio._preparar_mapa_organismos = MagicMock(return_value={})
+    servicio.insertar_o_actualizar_masivo([{"codigo": "CA-1", "nombre": "Compra de CAMIÓN"}])
+
+    (_, lote), _ = sesion.connection.return_value.execute.call_args
+    assert lote[0]["nombre_norm"] == "compra de camion"
+
+
+def test_fase_2_en_lote_guarda_textos_normalizados(db_service, db_session):
+    db_session.add(CaLicitacion(codigo_ca="CA-1", nombre="Compra", puntuacion_final=0))
+    db_session.commit()
+
+    db_service.actualizar_fase_2_detalle_en_lote([
+        ("CA-1", {"descripcion": "Arriendo de CAMIÓN", "productos_solicitados": [{"nombre": "Neumático", "descripcion": "Aro 22"}]}, 0, []),
+    ])
+
+    db_session.expire_all()
+    ca = db_session.scalars(select(CaLicitacion)).one()
+    assert (ca.descripcion_norm, ca.productos_norm) == ("arriendo de camion", "neumatico aro 22")
+
+
+def test_recalculo_lee_columnas_normalizadas_con_el_mismo_puntaje(db_service, db_session):
+    db_session.add(CaLicitacion(
+        codigo_ca="CA-1", nombre="Compra de CAMIÓN", descripcion="Arriendo de camión tolva",
+        productos_solicitados=[{"nombre": "Neumático camión"}], puntuacion_final=0,
+    ))
+    db_session.commit()
+
+    (fila,) = db_service.obtener_datos_para_recalculo_puntajes()
+    # Con las formas normalizadas presentes, los textos crudos no se leen
+    assert fila["descripcion"] is None and fila["productos_solicitados"] is None
+    assert fila["productos_norm"] == "neumatico camion"
+
+    motor = MotorPuntajes(None, reglas=REGLAS)
+    crudo = dict(fila, nombre_norm=None, descripcion_norm=None, productos_norm=None,
+                 descripcion="Arriendo de camión tolva", productos_solicitados=[{"nombre": "Neumático camión"}])
+    assert motor.calcular_puntaje_total(fila) == motor.calcular_puntaje_total(crudo)
+    assert motor.calcular_puntaje_total(fila)[0] == 10 + 5 + 7 + 3
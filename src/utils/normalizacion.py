@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Normalización de Texto.
+
+Funciones puras compartidas por el motor de puntajes y la capa de datos,
+para que ambos comparen textos exactamente con la misma regla.
+"""
+import json
+import unicodedata
+from typing import Any
+
+
+def normalizar_texto(texto: Any) -> str:
+    """Minúsculas, sin tildes (NFD sin marcas) y con espacios colapsados."""
+    if not texto:
+        return ""
+
+    texto_str = str(texto)
+    s = ''.join(c for c in unicodedata.normalize('NFD', texto_str.lower()) if unicodedata.category(c) != 'Mn')
+    return " ".join(s.split())
+
+
+def normalizar_productos(productos: Any) -> str:
+    """
+    Texto normalizado de la lista de productos de una ficha: "nombre descripcion"
+    de cada producto, normalizado y unido con " | ". Acepta la lista o su JSON.
+    """
+    if isinstance(productos, str):
+        try:
+            productos = json.loads(productos)
+        except ValueError:
+            return ""
+    if not isinstance(productos, list):
+        return ""
+
+    partes = []
+    for producto in productos:
+        if isinstance(producto, dict):
+            nombre = producto.get("nombre") or ""
+            descripcion = producto.get("descripcion") or ""
+            partes.append(normalizar_texto(f"{nombre} {descripcion}"))
+    return " | ".join(partes)